@@ -2,6 +2,12 @@
 ASGI config for app project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+It only serves the exam progress stream, e.g. with
+``uvicorn app.asgi:application``; every other path answers 404 and is
+served by the WSGI application. Django 3.2 runs every view of an ASGI
+application on one thread and iterates streaming responses on the event
+loop, so the rest of the API stays on a WSGI server with several
+workers. Route ``/api/exam/pack/<id>/progress/`` here.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
@@ -9,8 +15,28 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# Imported after Django is set up, as it loads models
+from exam.sse import (  # noqa: E402
+    PROGRESS_PATH,
+    progress_app,
+)
+
+
+async def application(scope, receive, send):
+    """Stream exam progress; the rest of the API is served over WSGI"""
+    if scope['type'] != 'http':
+        raise ValueError(
+            f'Only HTTP connections are served, not {scope["type"]}.'
+        )
+    if PROGRESS_PATH.match(scope['path']):
+        await progress_app(scope, receive, send)
+        return
+
+    await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
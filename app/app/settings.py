@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,12 +39,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'drf_spectacular',
     'core',
     'user',
     'question',
+    'exam',
 ]
 
 MIDDLEWARE = [
@@ -91,6 +94,40 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Every process must share the cache: API workers and the job worker
+# invalidate question lists, token lookups and exam packs through it.
+# The default file-based cache is shared by every process that mounts
+# CACHE_LOCATION and costs no database round trip. Local-memory caches
+# only suit a single process; the core.W001 system check warns about
+# them. Point CACHE_BACKEND and CACHE_LOCATION at memcached where
+# available.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'assessment-tool-cache'),
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 3000)),
+        },
+    }
+}
+
+QUESTION_CACHE_TIMEOUT = int(os.environ.get('QUESTION_CACHE_TIMEOUT', 300))
+
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_CACHE_TIMEOUT', 60))
+
+PACK_CACHE_TIMEOUT = int(os.environ.get('PACK_CACHE_TIMEOUT', 3600))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -138,8 +175,77 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('LOGIN_IP_RATE', '300/min'),
+        'login_account': os.environ.get('LOGIN_ACCOUNT_RATE', '10/min'),
+    },
 }
 
+# Cursor pagination for list endpoints
+
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 100))
+
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 1000))
+
+# Write-behind buffer for answer autosaves. Buffered answers stay in the
+# process that received them, so either route each attempt to a single
+# process or set AUTOSAVE_WRITE_THROUGH=1 to write them immediately.
+
+AUTOSAVE_INTERVAL = float(os.environ.get('AUTOSAVE_INTERVAL', 2))
+
+AUTOSAVE_MAX_PENDING = int(os.environ.get('AUTOSAVE_MAX_PENDING', 5000))
+
+AUTOSAVE_WRITE_THROUGH = os.environ.get('AUTOSAVE_WRITE_THROUGH') == '1'
+
+# Background job queue
+
+JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', 2))
+
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1))
+
+JOB_RETRY_BACKOFF = float(os.environ.get('JOB_RETRY_BACKOFF', 10))
+
+JOB_MAX_BACKOFF = float(os.environ.get('JOB_MAX_BACKOFF', 3600))
+
+JOB_STALE_AFTER = float(os.environ.get('JOB_STALE_AFTER', 3600))
+
+# Live exam progress streams
+
+PROGRESS_MIN_INTERVAL = float(os.environ.get('PROGRESS_MIN_INTERVAL', 1))
+
+PROGRESS_HEARTBEAT = float(os.environ.get('PROGRESS_HEARTBEAT', 15))
+
+# Admission control for password logins
+
+LOGIN_MAX_CONCURRENT = int(
+    os.environ.get('LOGIN_MAX_CONCURRENT', os.cpu_count() or 1)
+)
+
+LOGIN_MAX_WAITING = int(os.environ.get('LOGIN_MAX_WAITING', 32))
+
+LOGIN_QUEUE_TIMEOUT = float(os.environ.get('LOGIN_QUEUE_TIMEOUT', 5))
+
+# Processes hashing passwords during bulk user provisioning
+
+PROVISION_HASH_PROCESSES = int(
+    os.environ.get('PROVISION_HASH_PROCESSES', os.cpu_count() or 1)
+)
+
+# Seconds a stored Idempotency-Key response is replayed
+
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 86400))
+
+# Seconds after which an unfinished Idempotency-Key request is presumed
+# dead and a retry may run it again; keep it above the request timeout
+
+IDEMPOTENCY_LEASE = int(os.environ.get('IDEMPOTENCY_LEASE', 60))
+
+# Changelists over at least this many rows show estimated counts
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(
+    os.environ.get('ADMIN_ESTIMATED_COUNT_THRESHOLD', 10000)
+)
+
 SPECTACULAR_SETTINGS ={
     'COMPONENT_SPLIT_REQUEST': True,
 }
\ No newline at end of file
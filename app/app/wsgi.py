@@ -2,6 +2,8 @@
 WSGI config for app project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+It serves the whole API except the exam progress stream, which is only
+routed by the ASGI application.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
@@ -9,8 +11,14 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import StaticFilesHandler
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_wsgi_application()
+
+# Serve static files in development, as runserver does
+if settings.DEBUG:
+    application = StaticFilesHandler(application)
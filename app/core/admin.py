@@ -3,9 +3,14 @@ Django admin customization
 """
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import (
+    Exists,
+    OuterRef,
+)
 from django.utils.translation import gettext_lazy as _
 
 from core import models
+from core.paginator import EstimatedCountPaginator
 
 
 class UserAdmin(BaseUserAdmin):
@@ -47,7 +52,92 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class JobAdmin(admin.ModelAdmin):
+    """Define the admin pages for background jobs"""
+    ordering = ['-id']
+    list_display = ['id', 'name', 'status', 'attempts', 'run_at']
+    list_filter = ['status']
+    readonly_fields = ['started_at', 'finished_at', 'result', 'error']
+
+
+class ChoiceInUseFilter(admin.SimpleListFilter):
+    """Filter choices on whether a question offers or expects them"""
+    title = _('in use')
+    parameter_name = 'in_use'
+
+    def lookups(self, request, model_admin):
+        return [('yes', _('Yes')), ('no', _('No'))]
+
+    def queryset(self, request, queryset):
+        # Both lookups walk the choice foreign key indexes
+        in_use = Exists(
+            models.Question.choices.through.objects.filter(
+                choice_id=OuterRef('pk'),
+            )
+        ) | Exists(models.Question.objects.filter(answer_id=OuterRef('pk')))
+        if self.value() == 'yes':
+            return queryset.filter(in_use)
+        if self.value() == 'no':
+            return queryset.filter(~in_use)
+        return queryset
+
+
+class QuestionAdmin(admin.ModelAdmin):
+    """Define the admin pages for questions"""
+    ordering = ['-id']
+    list_display = ['id', 'question', 'answer', 'choice_list']
+    list_select_related = ['answer']
+    list_filter = ['exam_packs']
+    search_fields = ['^question']
+    autocomplete_fields = ['answer', 'choices']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('choices')
+
+    @admin.display(description=_('Choices'))
+    def choice_list(self, question):
+        return ', '.join(choice.choice for choice in question.choices.all())
+
+
+class ChoiceAdmin(admin.ModelAdmin):
+    """Define the admin pages for choices"""
+    ordering = ['-id']
+    list_display = ['id', 'choice']
+    list_filter = [ChoiceInUseFilter]
+    search_fields = ['^choice']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class ExamineeAnswerAdmin(admin.ModelAdmin):
+    """Define the admin pages for examinee answers"""
+    ordering = ['-id']
+    list_display = [
+        'id',
+        'attempt',
+        'question',
+        'choice',
+        'issubmitted',
+        'iscorrect',
+    ]
+    list_select_related = [
+        'attempt__examinee',
+        'attempt__exam_pack',
+        'question',
+        'choice',
+    ]
+    list_filter = ['attempt__exam_pack']
+    search_fields = ['^attempt__examinee__email']
+    raw_id_fields = ['attempt', 'question']
+    autocomplete_fields = ['choice']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Question)
-admin.site.register(models.Choice)
-admin.site.register(models.Examinee_Answer)
+admin.site.register(models.Question, QuestionAdmin)
+admin.site.register(models.Choice, ChoiceAdmin)
+admin.site.register(models.Examinee_Answer, ExamineeAnswerAdmin)
+admin.site.register(models.Job, JobAdmin)
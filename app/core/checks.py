@@ -0,0 +1,38 @@
+"""
+System checks for the deployment settings
+"""
+from django.conf import settings
+from django.core.checks import (
+    Tags,
+    Warning,
+    register,
+)
+
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn about a default cache that other processes cannot see"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [
+            Warning(
+                f'{backend} is local to each process.',
+                hint=(
+                    'This only works with a single process. Cache '
+                    'invalidations made by one worker, the job worker or '
+                    'a management command do not reach the others, so '
+                    'question lists, revoked tokens and exam packs can be '
+                    'served stale until they expire. Set CACHE_BACKEND to '
+                    'a shared backend such as the file-based cache or '
+                    'memcached when running several processes.'
+                ),
+                obj='CACHES',
+                id='core.W001',
+            )
+        ]
+    return []
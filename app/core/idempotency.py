@@ -0,0 +1,156 @@
+"""
+Replay of write requests retried with an Idempotency-Key header
+"""
+import functools
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (
+    IntegrityError,
+    transaction,
+)
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import IdempotencyKey
+
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(request):
+    """Return a digest identifying the method, path and body of request"""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.get_full_path().encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def expired_before():
+    """Return the creation time before which stored keys are expired"""
+    return timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def _take_over(record):
+    """
+    Claim an abandoned in-progress record, returning whether it worked.
+
+    A request that has not finished within `IDEMPOTENCY_LEASE` seconds
+    is presumed dead, e.g. its worker was killed, and a retry may run
+    again. The update only matches while the record is unchanged, so
+    only one retry takes it over.
+    """
+    now = timezone.now()
+    lease_start = now - timedelta(seconds=settings.IDEMPOTENCY_LEASE)
+    if record.status_code is not None or record.Created_Date >= lease_start:
+        return False
+    taken = IdempotencyKey.objects.filter(
+        id=record.id,
+        status_code__isnull=True,
+        Created_Date=record.Created_Date,
+    ).update(Created_Date=now)
+    record.Created_Date = now
+    return taken == 1
+
+
+def _claim(user, key, digest):
+    """Return a new in-progress record, or the stored one for the key"""
+    record = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if record is not None:
+        if record.Created_Date >= expired_before():
+            if record.fingerprint == digest and _take_over(record):
+                return record, True
+            return record, False
+        record.delete()
+
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                user=user,
+                key=key,
+                fingerprint=digest,
+            ), True
+    except IntegrityError:
+        # A concurrent request with the same key won the race
+        return IdempotencyKey.objects.get(user=user, key=key), False
+
+
+def _error(detail, code):
+    """Return an error response for a misused key"""
+    return Response({'detail': detail}, status=code)
+
+
+def idempotent(view_method):
+    """
+    Make a POST view method safe to retry with an Idempotency-Key.
+
+    The first response for a key is stored and replayed to retries from
+    the same user without running the view again. Responses are not
+    stored when the view raises or fails with a server error, so those
+    requests can be retried. A retry that finds the first request still
+    in progress gets 409, until `IDEMPOTENCY_LEASE` seconds have passed
+    and it may run the view itself.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        user = request.user
+        if not key or request.method != 'POST' or not user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(
+                f'{HEADER} must be at most {MAX_KEY_LENGTH} characters.',
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        digest = fingerprint(request)
+        record, created = _claim(user, key, digest)
+        if not created:
+            if record.fingerprint != digest:
+                return _error(
+                    f'{HEADER} was already used for a different request.',
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if record.status_code is None:
+                return _error(
+                    f'A request with this {HEADER} is in progress.',
+                    status.HTTP_409_CONFLICT,
+                )
+            response = Response(record.data, status=record.status_code)
+            response[REPLAYED_HEADER] = 'true'
+            return response
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            record.delete()
+        else:
+            record.status_code = response.status_code
+            record.data = response.data
+            record.save(update_fields=['status_code', 'data'])
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys(batch_size=1000):
+    """Delete expired keys in batches and return how many were deleted"""
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(
+                Created_Date__lt=expired_before(),
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
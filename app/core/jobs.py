@@ -0,0 +1,138 @@
+"""
+Database-backed background job queue
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def job(name=None, max_attempts=3):
+    """Register a function as a job that workers can run"""
+    def register(func):
+        func.job_name = name or f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts
+        _registry[func.job_name] = func
+        return func
+    return register
+
+
+def autodiscover():
+    """Import the jobs module of every installed app"""
+    autodiscover_modules('jobs')
+
+
+def get_job(name):
+    """Return the registered function for a job name"""
+    if name not in _registry:
+        autodiscover()
+    return _registry[name]
+
+
+def enqueue(func, delay=0, **payload):
+    """
+    Queue a registered job to run with payload as keyword arguments.
+
+    The job becomes visible to workers when the current transaction
+    commits. Payload values must be JSON serializable.
+    """
+    return Job.objects.create(
+        name=func.job_name,
+        payload=payload,
+        max_attempts=func.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(limit=1):
+    """
+    Mark up to limit due jobs as running and return their ids.
+
+    Rows are locked with SKIP LOCKED, so concurrent workers never claim
+    the same job and never wait for each other.
+    """
+    if limit <= 0:
+        return []
+
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True).filter(
+                status=Job.QUEUED,
+                run_at__lte=now,
+            ).order_by('run_at', 'id').values_list('id', flat=True)[:limit]
+        )
+        Job.objects.filter(id__in=ids).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            started_at=now,
+        )
+    return ids
+
+
+def backoff(attempts):
+    """Return the delay in seconds before retrying after attempts"""
+    return min(
+        settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.JOB_MAX_BACKOFF,
+    )
+
+
+def run(job_id):
+    """
+    Run a claimed job and record its outcome.
+
+    Failed jobs are queued again with exponential backoff until they
+    reach max_attempts. Returns the job's new status.
+    """
+    instance = Job.objects.get(id=job_id)
+    try:
+        result = get_job(instance.name)(**instance.payload)
+    except Exception:
+        logger.exception('Job %s (%s) failed', instance.id, instance.name)
+        instance.error = traceback.format_exc()
+        if instance.attempts < instance.max_attempts:
+            instance.status = Job.QUEUED
+            instance.run_at = timezone.now() + timedelta(
+                seconds=backoff(instance.attempts),
+            )
+        else:
+            instance.status = Job.FAILED
+            instance.finished_at = timezone.now()
+    else:
+        instance.status = Job.DONE
+        instance.result = result
+        instance.error = ''
+        instance.finished_at = timezone.now()
+
+    instance.save(update_fields=[
+        'status', 'result', 'error', 'run_at', 'finished_at',
+    ])
+    return instance.status
+
+
+def requeue_stale(timeout):
+    """Queue again jobs whose worker died while running them"""
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.RUNNING,
+        started_at__lt=now - timedelta(seconds=timeout),
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED,
+        error='Worker stopped while running the job.',
+        finished_at=now,
+    )
+    return stale.update(status=Job.QUEUED, run_at=now)
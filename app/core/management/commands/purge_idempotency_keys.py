@@ -0,0 +1,22 @@
+"""
+Django command to delete expired idempotency keys
+"""
+from django.core.management.base import BaseCommand
+
+from core.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    """Django command to purge stored Idempotency-Key responses."""
+
+    help = 'Delete idempotency keys older than IDEMPOTENCY_KEY_TTL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        deleted = purge_expired_keys(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired idempotency keys.'
+        ))
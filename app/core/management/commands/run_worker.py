@@ -0,0 +1,118 @@
+"""
+Django command to run background jobs from the database queue
+"""
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _init_process():
+    """Set up Django in a freshly spawned pool process"""
+    django.setup()
+
+
+def _run(job_id):
+    """Run a job inside a pool process"""
+    # Spawned processes import this module before Django is set up
+    from core import jobs
+
+    try:
+        return jobs.run(job_id)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """Django command to process queued jobs."""
+
+    help = 'Run queued background jobs with a pool of processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.JOB_WORKER_PROCESSES,
+            help='Pool size; 0 runs jobs in this process.',
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help='Seconds to wait when the queue is empty.',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no job is due.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        from core import jobs
+
+        self.jobs = jobs
+        jobs.autodiscover()
+        self.processed = 0
+        if options['processes'] <= 0:
+            self.run_inline(options)
+        else:
+            self.run_pool(options)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {self.processed} jobs.'
+        ))
+
+    def idle(self, options):
+        """Wait for new jobs, or return True to stop"""
+        if options['burst']:
+            return True
+        self.jobs.requeue_stale(settings.JOB_STALE_AFTER)
+        time.sleep(options['poll'])
+        return False
+
+    def run_inline(self, options):
+        """Run jobs one at a time in this process"""
+        while True:
+            claimed = self.jobs.claim()
+            if not claimed:
+                if self.idle(options):
+                    return
+                continue
+            self.jobs.run(claimed[0])
+            self.processed += 1
+
+    def run_pool(self, options):
+        """Keep the process pool busy with claimed jobs"""
+        size = options['processes']
+        running = set()
+        # Spawned processes do not share the parent's database sockets
+        pool = ProcessPoolExecutor(
+            size,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_process,
+        )
+        with pool:
+            while True:
+                claimed = self.jobs.claim(size - len(running))
+                running.update(pool.submit(_run, job_id) for job_id in claimed)
+                if running:
+                    done, running = wait(
+                        running,
+                        timeout=options['poll'],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        if future.exception() is not None:
+                            self.stderr.write(str(future.exception()))
+                    self.processed += len(done)
+                elif self.idle(options):
+                    return
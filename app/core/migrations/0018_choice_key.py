@@ -0,0 +1,62 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:08
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def populate_choice_keys(apps, schema_editor):
+    """Fill in choice keys, merging choices that share one"""
+    Choice = apps.get_model('core', 'Choice')
+    Question = apps.get_model('core', 'Question')
+    Through = Question.choices.through
+
+    keepers = {}
+    duplicates = {}
+    for choice in Choice.objects.order_by('id').iterator():
+        key = normalize(choice.choice)
+        if key in keepers:
+            duplicates[choice.id] = keepers[key]
+            continue
+        keepers[key] = choice.id
+        Choice.objects.filter(id=choice.id).update(key=key)
+
+    for duplicate_id, keeper_id in duplicates.items():
+        Question.objects.filter(answer_id=duplicate_id).update(
+            answer_id=keeper_id
+        )
+        linked = Through.objects.filter(
+            choice_id=keeper_id
+        ).values('question_id')
+        Through.objects.filter(
+            choice_id=duplicate_id,
+            question_id__in=linked,
+        ).delete()
+        Through.objects.filter(choice_id=duplicate_id).update(
+            choice_id=keeper_id
+        )
+
+    Choice.objects.filter(id__in=list(duplicates)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_alter_user_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='choice',
+            name='key',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(
+            populate_choice_keys,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_choice_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='choice',
+            name='key',
+            field=models.CharField(editable=False, max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_alter_choice_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamPack',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('content', models.BinaryField()),
+                ('content_encoding', models.CharField(blank=True, editable=False, max_length=20)),
+                ('etag', models.CharField(editable=False, max_length=64)),
+                ('Created_Date', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('questions', models.ManyToManyField(related_name='exam_packs', to='core.Question')),
+            ],
+        ),
+    ]
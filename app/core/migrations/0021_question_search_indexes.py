@@ -0,0 +1,48 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:02
+
+from django.db import migrations
+
+
+INDEXES = [
+    (
+        'core_question_question_trgm',
+        'USING gin (question gin_trgm_ops)',
+    ),
+    (
+        'core_question_question_fts',
+        "USING gin (to_tsvector('english'::regconfig, "
+        "COALESCE(question, '')))",
+    ),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create the PostgreSQL search indexes without locking writes"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, definition in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON core_question {definition}'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0020_exampack'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
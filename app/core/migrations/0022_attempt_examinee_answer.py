@@ -0,0 +1,75 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def delete_unattributed_answers(apps, schema_editor):
+    """Answers saved before attempts existed cannot be attributed"""
+    Examinee_Answer = apps.get_model('core', 'Examinee_Answer')
+    Examinee_Answer.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_question_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('issubmitted', models.BooleanField(default=False)),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('Created_Date', models.DateTimeField(auto_now_add=True)),
+                ('Modified_Date', models.DateTimeField(auto_now=True)),
+                ('exam_pack', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='core.exampack')),
+                ('examinee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['exam_pack', 'examinee'], name='attempt_pack_examinee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['examinee', '-Created_Date'], name='attempt_examinee_created_idx'),
+        ),
+        migrations.RunPython(
+            delete_unattributed_answers,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddField(
+            model_name='examinee_answer',
+            name='attempt',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='core.attempt'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='examinee_answer',
+            name='choice',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.choice'),
+        ),
+        migrations.AlterField(
+            model_name='examinee_answer',
+            name='examinee_answer',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='examinee_answer',
+            name='question',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.question'),
+        ),
+        migrations.AddIndex(
+            model_name='examinee_answer',
+            index=models.Index(fields=['question', 'choice'], name='answer_question_choice_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='examinee_answer',
+            constraint=models.UniqueConstraint(fields=('attempt', 'question'), name='unique_attempt_question'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 3.2.25 on 2026-10-18 05:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_attempt_examinee_answer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('difficulty', models.FloatField(null=True)),
+                ('discrimination', models.FloatField(null=True)),
+                ('Computed_Date', models.DateTimeField(auto_now=True)),
+                ('exam_pack', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_statistics', to='core.exampack')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_statistics', to='core.question')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ChoiceStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('frequency', models.FloatField(default=0)),
+                ('choice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.choice')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='choices', to='core.itemstatistic')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='itemstatistic',
+            constraint=models.UniqueConstraint(fields=('exam_pack', 'question'), name='unique_pack_question_statistic'),
+        ),
+        migrations.AddConstraint(
+            model_name='choicestatistic',
+            constraint=models.UniqueConstraint(fields=('item', 'choice'), name='unique_item_choice_statistic'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:40
+
+from django.db import migrations, models
+
+
+INDEXES = [
+    models.Index(fields=['role', '-id'], name='user_role_id_idx'),
+    models.Index(fields=['Created_Date'], name='user_created_idx'),
+    models.Index(
+        fields=['role', 'Created_Date'],
+        name='user_role_created_idx',
+    ),
+]
+
+# Case-insensitive prefix filters compile to UPPER(column::text) LIKE,
+# which btree indexes only serve with the pattern operator class.
+PREFIX_INDEXES = [
+    ('core_user_email_prefix', 'email'),
+    ('core_user_firstname_prefix', 'firstname'),
+    ('core_user_lastname_prefix', 'lastname'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    """Create the user listing indexes, without locking writes on PostgreSQL"""
+    User = apps.get_model('core', 'User')
+    if schema_editor.connection.vendor != 'postgresql':
+        for index in INDEXES:
+            schema_editor.add_index(User, index)
+        return
+    for index in INDEXES:
+        schema_editor.add_index(User, index, concurrently=True)
+    for name, column in PREFIX_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON core_user ((UPPER({column}::text)) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    if schema_editor.connection.vendor != 'postgresql':
+        for index in INDEXES:
+            schema_editor.remove_index(User, index)
+        return
+    for index in INDEXES:
+        schema_editor.remove_index(User, index, concurrently=True)
+    for name, _ in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0025_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='user', index=index)
+                for index in INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+        ),
+    ]
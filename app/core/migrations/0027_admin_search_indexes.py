@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:15
+
+from django.db import migrations
+
+
+# Admin prefix searches compile to UPPER(column::text) LIKE, which
+# btree indexes only serve with the pattern operator class.
+PREFIX_INDEXES = [
+    ('core_question_question_prefix', 'core_question', 'question'),
+    ('core_choice_choice_prefix', 'core_choice', 'choice'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    """Create the admin search indexes, without locking writes"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in PREFIX_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON {table} ((UPPER({column}::text)) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0026_user_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,7 +1,15 @@
 """
 Database models
 """
-from django.db import models
+import unicodedata
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    connections,
+    models,
+)
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -60,6 +68,16 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['role', '-id'], name='user_role_id_idx'),
+            models.Index(fields=['Created_Date'], name='user_created_idx'),
+            models.Index(
+                fields=['role', 'Created_Date'],
+                name='user_role_created_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -73,20 +91,289 @@ class Question(models.Model):
         return self.question
 
 
+class ChoiceManager(models.Manager):
+    """Manager for choices"""
+
+    def resolve(self, texts):
+        """
+        Return a mapping of each text to its Choice, creating missing ones.
+
+        Missing choices are inserted in one statement that skips keys
+        created concurrently, then every key is read back in a second
+        one, so the round trips do not grow with the number of texts.
+
+        On PostgreSQL the read locks the choices FOR KEY SHARE, so the
+        orphan pruner cannot delete them before the caller's transaction
+        links them. Choices it deleted in the meantime are created again.
+        """
+        keys = {text: self.model.normalize(text) for text in texts}
+        if not keys:
+            return {}
+
+        texts_by_key = {}
+        for text, key in keys.items():
+            texts_by_key.setdefault(key, text)
+
+        by_key = {}
+        missing = texts_by_key
+        while missing:
+            self.bulk_create(
+                [self.model(choice=text, key=key)
+                 for key, text in missing.items()],
+                ignore_conflicts=True,
+            )
+            by_key.update(
+                (choice.key, choice) for choice in self._share_keys(missing)
+            )
+            missing = {
+                key: text
+                for key, text in missing.items()
+                if key not in by_key
+            }
+
+        return {text: by_key[key] for text, key in keys.items()}
+
+    def _share_keys(self, keys):
+        """Return the choices with `keys`, locked against deletion"""
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            return self.filter(key__in=keys)
+
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        return self.raw(
+            f'SELECT * FROM {table} WHERE "key" = ANY(%s) FOR KEY SHARE',
+            [list(keys)],
+        )
+
+
 class Choice(models.Model):
     choice = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True, editable=False)
+
+    objects = ChoiceManager()
+
+    @staticmethod
+    def normalize(text):
+        """Return the lookup key for a choice text"""
+        return ' '.join(unicodedata.normalize('NFC', text).split())
+
+    def save(self, *args, **kwargs):
+        self.key = self.normalize(self.choice)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.choice
 
 
+class ExamPack(models.Model):
+    """Immutable, pre-serialized selection of questions for an exam"""
+    GZIP = 'gzip'
+
+    name = models.CharField(max_length=255)
+    questions = models.ManyToManyField(Question, related_name='exam_packs')
+    content = models.BinaryField(editable=False)
+    content_encoding = models.CharField(
+        max_length=20,
+        blank=True,
+        editable=False,
+    )
+    etag = models.CharField(max_length=64, editable=False)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        editable=False,
+    )
+    Created_Date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Attempt(models.Model):
+    """An examinee's sitting of an exam pack"""
+    examinee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='attempts',
+    )
+    exam_pack = models.ForeignKey(
+        ExamPack,
+        on_delete=models.CASCADE,
+        related_name='attempts',
+    )
+    issubmitted = models.BooleanField(default=False)
+    score = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    Created_Date = models.DateTimeField(auto_now_add=True)
+    Modified_Date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['exam_pack', 'examinee'],
+                name='attempt_pack_examinee_idx',
+            ),
+            models.Index(
+                fields=['examinee', '-Created_Date'],
+                name='attempt_examinee_created_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.examinee} - {self.exam_pack}'
+
+
 class Examinee_Answer(models.Model):
-    examinee_answer = models.CharField(max_length=255)
-    question = models.OneToOneField(Question, on_delete=models.CASCADE)
+    examinee_answer = models.CharField(max_length=255, blank=True)
+    attempt = models.ForeignKey(
+        Attempt,
+        on_delete=models.CASCADE,
+        related_name='answers',
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    choice = models.ForeignKey(
+        Choice,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
     issubmitted = models.BooleanField(default=False)
     iscorrect = models.BooleanField(default=False)
     isbookmarked = models.BooleanField(default=False)
-    # examinee = models.ForeignKey(Examinee, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['attempt', 'question'],
+                name='unique_attempt_question',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['question', 'choice'],
+                name='answer_question_choice_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.examinee_answer
+
+
+class ItemStatistic(models.Model):
+    """Item analysis of a question within an exam pack"""
+    exam_pack = models.ForeignKey(
+        ExamPack,
+        on_delete=models.CASCADE,
+        related_name='item_statistics',
+    )
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name='item_statistics',
+    )
+    responses = models.PositiveIntegerField(default=0)
+    difficulty = models.FloatField(null=True)
+    discrimination = models.FloatField(null=True)
+    Computed_Date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['exam_pack', 'question'],
+                name='unique_pack_question_statistic',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.exam_pack} - {self.question}'
+
+
+class ChoiceStatistic(models.Model):
+    """How often a choice was picked for an item"""
+    item = models.ForeignKey(
+        ItemStatistic,
+        on_delete=models.CASCADE,
+        related_name='choices',
+    )
+    choice = models.ForeignKey(Choice, on_delete=models.CASCADE)
+    count = models.PositiveIntegerField(default=0)
+    frequency = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['item', 'choice'],
+                name='unique_item_choice_statistic',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.item} - {self.choice}'
+
+
+class Job(models.Model):
+    """Background job stored in the database queue"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    Created_Date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'run_at'],
+                name='job_status_run_at_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.status})'
+
+
+class IdempotencyKey(models.Model):
+    """Stored outcome of a write request made with an Idempotency-Key"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    data = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    Created_Date = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key'],
+                name='unique_user_idempotency_key',
+            ),
+        ]
+
+    def __str__(self):
+        return self.key
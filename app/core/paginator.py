@@ -0,0 +1,71 @@
+"""
+Paginators for changelists over large tables
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def plan_rows(plan):
+    """Return the planner's row estimate from EXPLAIN (FORMAT JSON) output"""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset):
+    """
+    Return the planner's row estimate for a queryset.
+
+    For an unfiltered queryset PostgreSQL keeps the estimate in
+    pg_class.reltuples, refreshed by VACUUM and ANALYZE, so reading it
+    costs nothing however large the table is. Filtered querysets are
+    estimated with EXPLAIN, which plans the query without running it.
+    Returns None on other databases and for tables that have not been
+    analyzed yet.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if queryset.query.where:
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            return plan_rows(cursor.fetchone()[0])
+
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using estimated counts for large result sets.
+
+    Results estimated below ADMIN_ESTIMATED_COUNT_THRESHOLD rows are
+    still counted exactly, where COUNT(*) is cheap and page numbers
+    should be right.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if (
+            estimate is not None
+            and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+        ):
+            return estimate
+        return super().count
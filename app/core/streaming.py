@@ -0,0 +1,54 @@
+"""
+Encoding of streamed CSV and JSON lines downloads
+"""
+import zlib
+
+
+BUFFER_SIZE = 64 * 1024
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def encode(lines, compress=False):
+    """Encode lines to bytes in buffered blocks, gzipping on the fly"""
+    compressor = None
+    if compress:
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            block = b''.join(buffer)
+            buffer = []
+            size = 0
+            if compressor is not None:
+                block = compressor.compress(block)
+            if block:
+                yield block
+
+    block = b''.join(buffer)
+    if compressor is not None:
+        block = compressor.compress(block) + compressor.flush()
+    if block:
+        yield block
+
+
+def download_filename(name, file_format, compress=False):
+    """Return the file name for a download of the given format"""
+    filename = f'{name}.{file_format}'
+    if compress:
+        filename += '.gz'
+    return filename
+
+
+def content_type(file_format, compress=False):
+    """Return the content type for a download of the given format"""
+    if compress:
+        return 'application/gzip'
+    return CONTENT_TYPES[file_format]
@@ -1,11 +1,23 @@
 """
 Test for Django Admin modifications
 """
-from django.test import TestCase
+import json
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import Client
 
+from core import paginator
+from core.models import (
+    Question,
+    Choice,
+    Attempt,
+    ExamPack,
+    Examinee_Answer,
+)
+
 
 class AdminSitetests(TestCase):
     """Tests for Django Admin"""
@@ -47,3 +59,215 @@ class AdminSitetests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, 200)
+
+
+class QuestionBankAdminTests(TestCase):
+    """Tests for the question bank admin pages"""
+
+    def setUp(self):
+        self.client = Client()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123',
+        )
+        self.client.force_login(self.admin_user)
+        self.yes = Choice.objects.create(choice='Yes')
+        self.no = Choice.objects.create(choice='No')
+        self.unused = Choice.objects.create(choice='Unused choice')
+        self.question = Question.objects.create(
+            question='Is the sky blue?',
+            answer=self.yes,
+        )
+        self.question.choices.add(self.yes, self.no)
+        self.pack = ExamPack.objects.create(name='Quiz')
+        self.pack.questions.add(self.question)
+        attempt = Attempt.objects.create(
+            examinee=self.admin_user,
+            exam_pack=self.pack,
+        )
+        self.answer = Examinee_Answer.objects.create(
+            attempt=attempt,
+            question=self.question,
+            choice=self.yes,
+        )
+
+    def test_question_list(self):
+        """Questions are listed with their choices"""
+        url = reverse('admin:core_question_changelist')
+        res = self.client.get(url)
+
+        self.assertContains(res, self.question.question)
+        self.assertContains(res, 'Yes, No')
+
+    def test_question_list_queries_do_not_grow(self):
+        """Listing questions does not query per row"""
+        url = reverse('admin:core_question_changelist')
+        self.client.get(url)
+        with self.assertNumQueries(6):
+            self.client.get(url)
+
+        for i in range(3):
+            question = Question.objects.create(
+                question=f'Question {i}?',
+                answer=self.no,
+            )
+            question.choices.add(self.yes, self.no)
+        with self.assertNumQueries(6):
+            self.client.get(url)
+
+    def test_question_search(self):
+        """Questions are searched by prefix"""
+        url = reverse('admin:core_question_changelist')
+        res = self.client.get(url, {'q': 'is'})
+
+        self.assertContains(res, self.question.question)
+
+    def test_question_filter_by_pack(self):
+        """Questions are filtered by the exam packs using them"""
+        other = Question.objects.create(question='Unpacked?', answer=self.no)
+        url = reverse('admin:core_question_changelist')
+        res = self.client.get(url, {'exam_packs__id__exact': self.pack.id})
+
+        self.assertContains(res, self.question.question)
+        self.assertNotContains(res, other.question)
+
+    def test_choice_filter_in_use(self):
+        """Choices are filtered on whether a question uses them"""
+        url = reverse('admin:core_choice_changelist')
+
+        unused = self.client.get(url, {'in_use': 'no'})
+        used = self.client.get(url, {'in_use': 'yes'})
+
+        self.assertEqual(
+            list(unused.context['cl'].result_list),
+            [self.unused],
+        )
+        self.assertEqual(
+            set(used.context['cl'].result_list),
+            {self.yes, self.no},
+        )
+
+    def test_edit_question_page_omits_unrelated_choices(self):
+        """The question form only renders its selected choices"""
+        url = reverse('admin:core_question_change', args=[self.question.id])
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, 'admin-autocomplete')
+        self.assertNotContains(res, self.unused.choice)
+
+    def test_choice_autocomplete(self):
+        """Choices are looked up by prefix for autocomplete widgets"""
+        url = reverse('admin:autocomplete')
+        res = self.client.get(url, {
+            'term': 'un',
+            'app_label': 'core',
+            'model_name': 'question',
+            'field_name': 'choices',
+        })
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [result['text'] for result in res.json()['results']],
+            [self.unused.choice],
+        )
+
+    def test_answer_list(self):
+        """Examinee answers are listed and searched by examinee email"""
+        url = reverse('admin:core_examinee_answer_changelist')
+        res = self.client.get(url, {'q': 'admin@'})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, self.question.question)
+
+    def test_answer_filter_by_pack(self):
+        """Examinee answers are filtered by the exam pack of the attempt"""
+        url = reverse('admin:core_examinee_answer_changelist')
+        other = ExamPack.objects.create(name='Other')
+
+        res = self.client.get(url, {'attempt__exam_pack__id__exact': other.id})
+        self.assertEqual(list(res.context['cl'].result_list), [])
+
+        res = self.client.get(
+            url,
+            {'attempt__exam_pack__id__exact': self.pack.id},
+        )
+        self.assertEqual(list(res.context['cl'].result_list), [self.answer])
+
+    def test_edit_answer_page(self):
+        """The answer form uses raw id widgets for its relations"""
+        url = reverse(
+            'admin:core_examinee_answer_change',
+            args=[self.answer.id],
+        )
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, 'vForeignKeyRawIdAdminField')
+
+
+@override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=100)
+class EstimatedCountPaginatorTests(TestCase):
+    """Tests for the estimated count paginator"""
+
+    def setUp(self):
+        Choice.objects.bulk_create([
+            Choice(choice=f'Choice {i}', key=f'Choice {i}')
+            for i in range(3)
+        ])
+
+    def test_estimated_count_skipped_outside_postgres(self):
+        """Only PostgreSQL tables report an estimate"""
+        self.assertIsNone(paginator.estimated_count(Choice.objects.all()))
+
+    @patch('core.paginator.estimated_count', return_value=50000)
+    def test_large_table_uses_estimate(self, mock_estimate):
+        """Large tables are not counted exactly"""
+        pages = paginator.EstimatedCountPaginator(
+            Choice.objects.order_by('id'),
+            10,
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(pages.count, 50000)
+
+    @patch('core.paginator.estimated_count', return_value=50)
+    def test_small_table_counted_exactly(self, mock_estimate):
+        """Estimates below the threshold fall back to COUNT(*)"""
+        pages = paginator.EstimatedCountPaginator(
+            Choice.objects.order_by('id'),
+            10,
+        )
+
+        self.assertEqual(pages.count, 3)
+
+    def test_estimate_skipped_outside_postgres_when_filtered(self):
+        """Test filtered querysets are counted exactly without a planner"""
+        queryset = Choice.objects.filter(
+            choice__startswith='Choice 1',
+        ).order_by('id')
+
+        self.assertIsNone(paginator.estimated_count(queryset))
+        self.assertEqual(
+            paginator.EstimatedCountPaginator(queryset, 10).count,
+            1,
+        )
+
+    @patch('core.paginator.estimated_count', return_value=20000)
+    def test_large_filtered_result_uses_estimate(self, mock_estimate):
+        """Test filtered results estimated above the threshold skip COUNT"""
+        queryset = Choice.objects.filter(
+            choice__startswith='Choice',
+        ).order_by('id')
+        pages = paginator.EstimatedCountPaginator(queryset, 10)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(pages.count, 20000)
+        mock_estimate.assert_called_once_with(queryset)
+
+    def test_plan_rows(self):
+        """Test the row estimate is read from a JSON query plan"""
+        plan = [{'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': 52000}}]
+
+        self.assertEqual(paginator.plan_rows(plan), 52000)
+        self.assertEqual(paginator.plan_rows(json.dumps(plan)), 52000)
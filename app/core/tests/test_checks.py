@@ -0,0 +1,35 @@
+"""
+Tests for the deployment system checks
+"""
+from django.test import (
+    SimpleTestCase,
+    override_settings,
+)
+
+from core.checks import check_shared_cache
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """Test the shared cache check"""
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    })
+    def test_process_local_cache_warned(self):
+        """Test a per-process cache is allowed with a warning"""
+        messages = check_shared_cache(None)
+
+        self.assertEqual([message.id for message in messages], ['core.W001'])
+        self.assertFalse(messages[0].is_serious())
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/tmp/cache',
+        }
+    })
+    def test_shared_cache_accepted(self):
+        """Test a shared cache passes the check"""
+        self.assertEqual(check_shared_cache(None), [])
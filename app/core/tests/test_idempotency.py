@@ -0,0 +1,167 @@
+"""
+Tests for Idempotency-Key handling
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    IdempotencyKey,
+)
+
+
+QUESTION_URL = reverse('question:question-list')
+
+PAYLOAD = {
+    'question': 'Sample question',
+    'answer': {'choice': 'Yes'},
+    'choices': [{'choice': 'Yes'}, {'choice': 'No'}],
+}
+
+
+class IdempotencyTests(TestCase):
+    """Test retried writes are replayed"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, payload=PAYLOAD, key='key-1'):
+        """Create a question with an Idempotency-Key"""
+        return self.client.post(
+            QUESTION_URL,
+            payload,
+            format='json',
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_is_replayed(self):
+        """Test a retried create returns the first response"""
+        first = self.post()
+
+        with self.assertNumQueries(1):
+            second = self.post()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_without_key(self):
+        """Test requests without a key are not deduplicated"""
+        self.client.post(QUESTION_URL, PAYLOAD, format='json')
+        self.client.post(QUESTION_URL, PAYLOAD, format='json')
+
+        self.assertEqual(Question.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_keys_are_per_user(self):
+        """Test users do not see each other's responses"""
+        self.post()
+        other = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client.force_authenticate(other)
+
+        res = self.post()
+
+        self.assertNotIn('Idempotent-Replayed', res)
+        self.assertEqual(Question.objects.count(), 2)
+
+    def test_key_reused_for_other_request(self):
+        """Test a key cannot be reused with a different body"""
+        self.post()
+
+        res = self.post({**PAYLOAD, 'question': 'Other question'})
+
+        self.assertEqual(res.status_code, 422)
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_request_in_progress(self):
+        """Test concurrent retries are told to wait"""
+        self.post()
+        IdempotencyKey.objects.update(status_code=None, data=None)
+
+        res = self.post()
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_abandoned_request_taken_over(self):
+        """Test a retry runs again once the in-progress lease expires"""
+        self.post()
+        Question.objects.all().delete()
+        IdempotencyKey.objects.update(
+            status_code=None,
+            data=None,
+            Created_Date=timezone.now() - timedelta(minutes=5),
+        )
+
+        with self.settings(IDEMPOTENCY_LEASE=60):
+            res = self.post()
+            retry = self.post()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', res)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_abandoned_request_kept_for_other_body(self):
+        """Test an expired lease is not taken over by a different request"""
+        self.post()
+        IdempotencyKey.objects.update(
+            status_code=None,
+            data=None,
+            Created_Date=timezone.now() - timedelta(minutes=5),
+        )
+
+        res = self.post({**PAYLOAD, 'question': 'Other question'})
+
+        self.assertEqual(res.status_code, 422)
+
+    def test_failed_request_can_be_retried(self):
+        """Test invalid requests do not keep the key"""
+        res = self.post({'question': 'Missing answer'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.post()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_expired_keys(self):
+        """Test expired keys are not replayed and can be purged"""
+        self.post()
+        IdempotencyKey.objects.update(
+            Created_Date=timezone.now() - timedelta(days=2),
+        )
+
+        self.post()
+
+        self.assertEqual(Question.objects.count(), 2)
+        self.post(key='key-2')
+        IdempotencyKey.objects.filter(key='key-2').update(
+            Created_Date=timezone.now() - timedelta(days=2),
+        )
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn('Deleted 1 expired', out.getvalue())
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list('key', flat=True)),
+            ['key-1'],
+        )
@@ -0,0 +1,108 @@
+"""
+Tests for the database job queue
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+
+calls = []
+
+
+@jobs.job(name='tests.record')
+def record(value):
+    """Remember the value it was called with"""
+    calls.append(value)
+    return {'value': value}
+
+
+@jobs.job(name='tests.explode', max_attempts=2)
+def explode():
+    """Always fail"""
+    raise RuntimeError('Boom')
+
+
+@override_settings(JOB_RETRY_BACKOFF=10, JOB_MAX_BACKOFF=15)
+class JobQueueTests(TestCase):
+    """Test queueing and running background jobs"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Test a queued job is claimed once and records its result"""
+        job = jobs.enqueue(record, value=3)
+
+        self.assertEqual(jobs.claim(5), [job.id])
+        self.assertEqual(jobs.claim(5), [])
+        self.assertEqual(jobs.run(job.id), Job.DONE)
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [3])
+        self.assertEqual(job.result, {'value': 3})
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_delayed_job_not_claimed(self):
+        """Test jobs are only claimed once they are due"""
+        jobs.enqueue(record, delay=60, value=1)
+
+        self.assertEqual(jobs.claim(), [])
+
+    def test_retry_with_backoff(self):
+        """Test failed jobs are retried later, then marked failed"""
+        job = jobs.enqueue(explode)
+        before = timezone.now()
+
+        jobs.claim()
+        with self.assertLogs('core.jobs', 'ERROR'):
+            self.assertEqual(jobs.run(job.id), Job.QUEUED)
+
+        job.refresh_from_db()
+        self.assertIn('Boom', job.error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=10))
+        self.assertEqual(jobs.claim(), [])
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        jobs.claim()
+        with self.assertLogs('core.jobs', 'ERROR'):
+            self.assertEqual(jobs.run(job.id), Job.FAILED)
+
+    def test_backoff_is_capped(self):
+        """Test retry delays grow exponentially up to the maximum"""
+        self.assertEqual(
+            [jobs.backoff(attempts) for attempts in [1, 2, 3]],
+            [10, 15, 15],
+        )
+
+    def test_requeue_stale(self):
+        """Test jobs left running by a dead worker are queued again"""
+        job = jobs.enqueue(record, value=1)
+        jobs.claim()
+        Job.objects.filter(id=job.id).update(
+            started_at=timezone.now() - timedelta(hours=2),
+        )
+
+        self.assertEqual(jobs.requeue_stale(3600), 1)
+        self.assertEqual(jobs.claim(), [job.id])
+
+    def test_worker_command(self):
+        """Test the worker runs due jobs until the queue is empty"""
+        for value in range(3):
+            jobs.enqueue(record, value=value)
+        out = StringIO()
+
+        call_command('run_worker', processes=0, burst=True, stdout=out)
+
+        self.assertEqual(sorted(calls), [0, 1, 2])
+        self.assertIn('Processed 3 jobs', out.getvalue())
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
@@ -0,0 +1,39 @@
+"""
+Tests for streamed download encoding
+"""
+import gzip
+
+from django.test import SimpleTestCase
+
+from core import streaming
+
+
+class EncodeTests(SimpleTestCase):
+    """Test lines are encoded in buffered blocks"""
+
+    def lines(self):
+        return (f'line {i}\n' for i in range(20000))
+
+    def test_blocks_are_buffered(self):
+        """Test lines are joined into blocks of at least the buffer size"""
+        blocks = list(streaming.encode(self.lines()))
+
+        self.assertGreater(len(blocks), 1)
+        self.assertTrue(
+            all(len(block) >= streaming.BUFFER_SIZE for block in blocks[:-1])
+        )
+        self.assertEqual(b''.join(blocks).decode(), ''.join(self.lines()))
+
+    def test_gzip(self):
+        """Test compressed output is a single gzip stream"""
+        data = b''.join(streaming.encode(self.lines(), compress=True))
+
+        self.assertEqual(gzip.decompress(data).decode(), ''.join(self.lines()))
+        self.assertEqual(
+            streaming.content_type('csv', True),
+            'application/gzip',
+        )
+        self.assertEqual(
+            streaming.download_filename('roster', 'csv', True),
+            'roster.csv.gz',
+        )
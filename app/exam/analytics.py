@@ -0,0 +1,174 @@
+"""
+Vectorized item analysis of exam answers
+"""
+from itertools import islice
+
+import numpy as np
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models.functions import Coalesce
+
+from core.models import (
+    Attempt,
+    Examinee_Answer,
+    ItemStatistic,
+    ChoiceStatistic,
+)
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _positions(sorted_ids, ids):
+    """Return the index of each id in `sorted_ids`, or -1 if it is absent"""
+    positions = np.searchsorted(sorted_ids, ids)
+    found = positions < len(sorted_ids)
+    found[found] = sorted_ids[positions[found]] == ids[found]
+    return np.where(found, positions, -1)
+
+
+def response_matrix(pack, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Load the submitted answers of a pack into NumPy arrays.
+
+    Returns the question ids, a (attempts x questions) matrix of item
+    scores and a matching matrix of chosen choice ids, where 0 means the
+    question was not answered. Answers are streamed in chunks, each
+    converted to an array by NumPy in one call, and scattered into the
+    matrices without a Python loop per answer.
+    Answers of attempts submitted after the attempt ids were read are
+    left out, so statistics can be computed during a live exam.
+    """
+    question_ids = np.fromiter(
+        pack.questions.order_by('id').values_list('id', flat=True),
+        dtype=np.int64,
+    )
+    attempt_ids = np.fromiter(
+        Attempt.objects.filter(
+            exam_pack=pack,
+            issubmitted=True,
+        ).order_by('id').values_list('id', flat=True),
+        dtype=np.int64,
+    )
+    shape = (len(attempt_ids), len(question_ids))
+    scores = np.zeros(shape, dtype=np.int8)
+    choices = np.zeros(shape, dtype=np.int64)
+
+    rows = Examinee_Answer.objects.filter(
+        attempt__exam_pack=pack,
+        attempt__issubmitted=True,
+        question__in=pack.questions.all(),
+    ).annotate(
+        # Unanswered is 0 in the matrix, so no row needs fixing up here
+        picked=Coalesce(
+            'choice_id',
+            models.Value(0),
+            output_field=models.BigIntegerField(),
+        ),
+    ).values_list(
+        'attempt_id', 'question_id', 'picked', 'iscorrect',
+    ).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        data = np.array(chunk, dtype=np.int64)
+        i = _positions(attempt_ids, data[:, 0])
+        j = _positions(question_ids, data[:, 1])
+        # Drop answers of attempts submitted after the ids were read
+        known = (i >= 0) & (j >= 0)
+        scores[i[known], j[known]] = data[known, 3]
+        choices[i[known], j[known]] = data[known, 2]
+
+    return question_ids, scores, choices
+
+
+def item_statistics(scores):
+    """
+    Return the difficulty and discrimination of every item.
+
+    Difficulty is the proportion of examinees answering the item
+    correctly (p-value). Discrimination is the point-biserial
+    correlation between the item score and the rest of the test score,
+    NaN where either does not vary.
+    """
+    scores = scores.astype(np.float64)
+    if not len(scores):
+        nan = np.full(scores.shape[1], np.nan)
+        return nan, nan
+
+    difficulty = scores.mean(axis=0)
+    rest = scores.sum(axis=1, keepdims=True) - scores
+    covariance = (scores * rest).mean(axis=0) - difficulty * rest.mean(axis=0)
+    spread = scores.std(axis=0) * rest.std(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discrimination = np.where(spread > 0, covariance / spread, np.nan)
+
+    return difficulty, discrimination
+
+
+def choice_counts(choices):
+    """Return (item index, choice id, count) arrays of picked choices"""
+    items = np.broadcast_to(np.arange(choices.shape[1]), choices.shape)
+    picked = choices > 0
+    pairs = np.stack([items[picked], choices[picked]], axis=1)
+    if not len(pairs):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    pairs, counts = np.unique(pairs, axis=0, return_counts=True)
+    return pairs[:, 0], pairs[:, 1], counts
+
+
+def _float(value):
+    """Return value as a float, or None for NaN"""
+    return None if np.isnan(value) else float(value)
+
+
+def analyze_pack(pack, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compute and store the item statistics of an exam pack.
+
+    Replaces the pack's previous statistics and returns the number of
+    items analyzed.
+    """
+    question_ids, scores, choices = response_matrix(pack, chunk_size)
+    difficulty, discrimination = item_statistics(scores)
+    items, choice_ids, counts = choice_counts(choices)
+    responses = (choices > 0).sum(axis=0)
+
+    with transaction.atomic():
+        ItemStatistic.objects.filter(exam_pack=pack).delete()
+        statistics = ItemStatistic.objects.bulk_create([
+            ItemStatistic(
+                exam_pack=pack,
+                question_id=int(question_id),
+                responses=int(responses[index]),
+                difficulty=_float(difficulty[index]),
+                discrimination=_float(discrimination[index]),
+            )
+            for index, question_id in enumerate(question_ids)
+        ])
+        if statistics and statistics[0].pk is None:
+            by_question = dict(
+                ItemStatistic.objects.filter(
+                    exam_pack=pack,
+                ).values_list('question_id', 'id')
+            )
+            item_ids = [by_question[int(q)] for q in question_ids]
+        else:
+            item_ids = [statistic.pk for statistic in statistics]
+
+        ChoiceStatistic.objects.bulk_create([
+            ChoiceStatistic(
+                item_id=item_ids[item],
+                choice_id=int(choice_id),
+                count=int(count),
+                frequency=float(count / responses[item]),
+            )
+            for item, choice_id, count in zip(items, choice_ids, counts)
+        ], batch_size=1000)
+
+    return len(question_ids)
@@ -0,0 +1,123 @@
+"""
+Bulk storage of examinee answers
+"""
+from django.db import (
+    connection,
+    transaction,
+)
+
+from core.models import Examinee_Answer
+from exam import progress
+from exam.grading import grade_attempt
+
+
+UPSERT_BATCH_SIZE = 500
+ANSWER_FIELDS = ('examinee_answer', 'choice_id', 'isbookmarked',
+                 'issubmitted')
+DEFAULTS = {
+    'examinee_answer': '',
+    'choice_id': None,
+    'isbookmarked': False,
+    'issubmitted': False,
+    'iscorrect': False,
+}
+
+
+def _upsert_sql(fields, rows):
+    """Return the INSERT ... ON CONFLICT DO UPDATE statement for rows"""
+    quote = connection.ops.quote_name
+    columns = ['attempt_id', 'question_id'] + list(DEFAULTS)
+    placeholders = '(%s)' % ', '.join(['%s'] * len(columns))
+    updates = ', '.join(
+        f'{quote(field)} = excluded.{quote(field)}' for field in fields
+    )
+    return (
+        f'INSERT INTO {quote(Examinee_Answer._meta.db_table)} '
+        f'({", ".join(quote(column) for column in columns)}) '
+        f'VALUES {", ".join([placeholders] * rows)} '
+        f'ON CONFLICT ({quote("attempt_id")}, {quote("question_id")}) '
+        f'DO UPDATE SET {updates}'
+    )
+
+
+def upsert_answers(attempt_id, answers, fields):
+    """
+    Insert or update the answers of an attempt in bulk.
+
+    `answers` maps question ids to dicts holding `fields`. Rows that
+    already exist only have `fields` overwritten; new rows take the
+    model defaults for the rest. Each batch is a single statement.
+    """
+    fields = [field for field in ANSWER_FIELDS if field in fields]
+    if not answers or not fields:
+        return 0
+
+    items = sorted(answers.items())
+    with transaction.atomic(savepoint=False):
+        with connection.cursor() as cursor:
+            for start in range(0, len(items), UPSERT_BATCH_SIZE):
+                batch = items[start:start + UPSERT_BATCH_SIZE]
+                params = []
+                for question_id, values in batch:
+                    params.extend([attempt_id, question_id])
+                    params.extend(
+                        values.get(field, default)
+                        for field, default in DEFAULTS.items()
+                    )
+                cursor.execute(_upsert_sql(fields, len(batch)), params)
+
+    return len(items)
+
+
+def answer_values(answer):
+    """Return the column values a validated answer sets"""
+    values = {}
+    if 'choice' in answer:
+        values['choice_id'] = answer['choice']
+        values['examinee_answer'] = answer['examinee_answer']
+    if 'isbookmarked' in answer:
+        values['isbookmarked'] = answer['isbookmarked']
+    return values
+
+
+def write_answers(attempt_id, answers):
+    """
+    Upsert answers mapping question ids to the column values they set.
+
+    Answers are grouped by the fields they carry, so a bookmark that was
+    not sent is left as it is, and each group is written with one bulk
+    upsert.
+    """
+    groups = {}
+    for question_id, values in answers.items():
+        if values:
+            groups.setdefault(frozenset(values), {})[question_id] = values
+
+    with transaction.atomic(savepoint=False):
+        for fields, group in groups.items():
+            upsert_answers(attempt_id, group, fields)
+
+    return sum(len(group) for group in groups.values())
+
+
+def save_submission(attempt, answers, submit=False):
+    """
+    Store a validated bulk submission for an attempt.
+
+    Submitting marks the attempt and all of its answers as submitted and
+    grades the attempt.
+    """
+    with transaction.atomic():
+        write_answers(attempt.id, {
+            answer['question']: answer_values(answer) for answer in answers
+        })
+
+        if submit:
+            attempt.answers.update(issubmitted=True)
+            attempt.issubmitted = True
+            attempt.save(update_fields=['issubmitted', 'Modified_Date'])
+            grade_attempt(attempt)
+
+        progress.changed(attempt.exam_pack_id)
+
+    return len(answers)
@@ -0,0 +1,267 @@
+"""
+Write-behind buffer for answer autosaves
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import (
+    close_old_connections,
+    connection,
+    transaction,
+)
+
+from core.models import (
+    Attempt,
+    Examinee_Answer,
+)
+from exam import progress
+from exam.answers import write_answers
+
+
+logger = logging.getLogger(__name__)
+
+MAX_WRITE_FAILURES = 3
+
+
+class AnswerBuffer:
+    """
+    Coalesce autosaved answers in memory and write them in batches.
+
+    Changes are kept per attempt and question, so toggling a bookmark ten
+    times costs one row write. The buffer is flushed every
+    `AUTOSAVE_INTERVAL` seconds by a background thread, as soon as it
+    holds `AUTOSAVE_MAX_PENDING` answers, and for one attempt when it is
+    submitted. At most one interval of autosaves is lost if the process
+    dies; the submission itself is always written synchronously.
+
+    Buffered answers live in the process that received them, so a submit
+    handled by another process cannot flush them and they are discarded.
+    Route each attempt to one process, or set `AUTOSAVE_WRITE_THROUGH` to
+    write every autosave as it arrives.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._failures = {}
+        self._size = 0
+        self._thread = None
+
+    def __len__(self):
+        return self._size
+
+    def add(self, attempt_id, answers):
+        """Buffer answers mapping question ids to column values"""
+        with self._lock:
+            pending = self._pending.setdefault(attempt_id, {})
+            for question_id, values in answers.items():
+                if question_id not in pending:
+                    pending[question_id] = {}
+                    self._size += 1
+                pending[question_id].update(values)
+            full = self._size >= settings.AUTOSAVE_MAX_PENDING
+
+        if settings.AUTOSAVE_WRITE_THROUGH:
+            self.flush(attempt_id)
+            return
+        self._start()
+        if full:
+            self.flush()
+
+    def _take(self, attempt_id=None):
+        """Remove and return pending answers, for one or all attempts"""
+        with self._lock:
+            if attempt_id is None:
+                pending, self._pending = self._pending, {}
+            elif attempt_id in self._pending:
+                pending = {attempt_id: self._pending.pop(attempt_id)}
+            else:
+                pending = {}
+            self._size -= sum(len(answers) for answers in pending.values())
+        return pending
+
+    def _restore(self, pending):
+        """Put back answers that could not be written"""
+        with self._lock:
+            for attempt_id, answers in pending.items():
+                current = self._pending.setdefault(attempt_id, {})
+                for question_id, values in answers.items():
+                    if question_id not in current:
+                        current[question_id] = values
+                        self._size += 1
+                    else:
+                        current[question_id] = {
+                            **values, **current[question_id],
+                        }
+
+    def _retry(self, failed):
+        """
+        Put back answers whose write failed, dropping repeat offenders.
+
+        An answer that fails `MAX_WRITE_FAILURES` times in a row, such as
+        one for a question deleted while it was buffered, is logged and
+        dropped so it cannot hold up the rest of the buffer.
+        """
+        retry = {}
+        with self._lock:
+            for attempt_id, answers in failed.items():
+                for question_id, values in answers.items():
+                    key = (attempt_id, question_id)
+                    failures = self._failures.get(key, 0) + 1
+                    if failures < MAX_WRITE_FAILURES:
+                        self._failures[key] = failures
+                        retry.setdefault(attempt_id, {})[question_id] = values
+                        continue
+                    self._failures.pop(key, None)
+                    logger.error(
+                        'Dropping autosaved answer for attempt %s, '
+                        'question %s after %s failed writes',
+                        attempt_id,
+                        question_id,
+                        failures,
+                    )
+        self._restore(retry)
+
+    def _forget_failures(self, pending, failed):
+        """Reset failure counts of answers that were written or dropped"""
+        with self._lock:
+            if not self._failures:
+                return
+            for attempt_id, answers in pending.items():
+                for question_id in answers:
+                    if question_id not in failed.get(attempt_id, ()):
+                        self._failures.pop((attempt_id, question_id), None)
+
+    def _write_checked(self, attempt_id, answers):
+        """
+        Write answers and check their foreign keys straight away.
+
+        Foreign keys are deferred to commit, where a violation would fail
+        the whole flush; checking inside the savepoint pins it on the
+        answers that caused it.
+        """
+        written = write_answers(attempt_id, answers)
+        connection.check_constraints(
+            table_names=[Examinee_Answer._meta.db_table],
+        )
+        return written
+
+    def _write(self, attempt_id, answers):
+        """
+        Write one attempt's answers, isolating the ones that fail.
+
+        The attempt is written in one savepoint. If that fails, each
+        answer is retried in a savepoint of its own. Returns the number
+        written and the answers that could not be.
+        """
+        try:
+            with transaction.atomic():
+                return self._write_checked(attempt_id, answers), {}
+        except Exception:
+            logger.warning(
+                'Autosave for attempt %s failed, retrying answers one by one',
+                attempt_id,
+                exc_info=True,
+            )
+
+        written = 0
+        failed = {}
+        for question_id, values in answers.items():
+            try:
+                with transaction.atomic():
+                    written += self._write_checked(
+                        attempt_id,
+                        {question_id: values},
+                    )
+            except Exception:
+                failed[question_id] = values
+        return written, failed
+
+    def flush(self, attempt_id=None):
+        """
+        Write pending answers, for one attempt or all of them.
+
+        Attempts are locked while their answers are written, and answers
+        for attempts that were submitted in the meantime are dropped.
+        Each attempt is written in its own savepoint, so a failing answer
+        only holds back itself. Returns the number of answers written.
+        """
+        pending = self._take(attempt_id)
+        if not pending:
+            return 0
+
+        failed = {}
+        try:
+            with transaction.atomic():
+                open_attempts = dict(
+                    Attempt.objects.select_for_update().filter(
+                        id__in=pending,
+                        issubmitted=False,
+                    ).order_by('id').values_list('id', 'exam_pack_id')
+                )
+                written = 0
+                pack_ids = set()
+                for attempt_id, pack_id in open_attempts.items():
+                    count, failed_answers = self._write(
+                        attempt_id,
+                        pending[attempt_id],
+                    )
+                    written += count
+                    if failed_answers:
+                        failed[attempt_id] = failed_answers
+                    if count:
+                        pack_ids.add(pack_id)
+                for pack_id in sorted(pack_ids):
+                    progress.changed(pack_id)
+        except Exception:
+            self._restore(pending)
+            raise
+
+        dropped = sum(
+            len(answers)
+            for attempt_id, answers in pending.items()
+            if attempt_id not in open_attempts
+        )
+        if dropped:
+            logger.warning(
+                'Discarded %s autosaved answers for submitted or deleted '
+                'attempts',
+                dropped,
+            )
+        self._forget_failures(pending, failed)
+        self._retry(failed)
+        return written
+
+    def _start(self):
+        """Start the background flusher once"""
+        interval = settings.AUTOSAVE_INTERVAL
+        if self._thread is not None or interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(interval,),
+                name='answer-autosave',
+                daemon=True,
+            )
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self, interval):
+        """Flush the buffer every interval seconds"""
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Autosave flush failed')
+            finally:
+                close_old_connections()
+
+
+buffer = AnswerBuffer()
@@ -0,0 +1,83 @@
+"""
+Set-based grading of exam attempts
+"""
+from django.db import transaction
+from django.db.models import (
+    Count,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from core.models import (
+    Question,
+    ExamPack,
+    Attempt,
+    Examinee_Answer,
+)
+
+
+def _count(queryset, field):
+    """Return a subquery counting the rows of queryset grouped by field"""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(field).annotate(
+                count=Count('*')
+            ).values('count'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def grade_attempts(attempts=None):
+    """
+    Grade the submitted attempts in the queryset.
+
+    Answers are compared with `Question.answer` by a single UPDATE, and
+    the attempt scores and totals by another, so no answer or question
+    is loaded into Python. Returns the number of attempts graded.
+    """
+    if attempts is None:
+        attempts = Attempt.objects.all()
+    attempts = attempts.filter(issubmitted=True).values('id')
+
+    with transaction.atomic():
+        Examinee_Answer.objects.filter(attempt__in=attempts).update(
+            iscorrect=Exists(Question.objects.filter(
+                pk=OuterRef('question_id'),
+                answer_id=OuterRef('choice_id'),
+            ))
+        )
+        graded = Attempt.objects.filter(id__in=attempts).update(
+            score=_count(
+                Examinee_Answer.objects.filter(
+                    attempt=OuterRef('pk'),
+                    iscorrect=True,
+                ),
+                'attempt',
+            ),
+            total=_count(
+                ExamPack.questions.through.objects.filter(
+                    exampack=OuterRef('exam_pack'),
+                ),
+                'exampack',
+            ),
+        )
+
+    return graded
+
+
+def grade_attempt(attempt):
+    """Grade one attempt and refresh its score and total"""
+    graded = grade_attempts(Attempt.objects.filter(pk=attempt.pk))
+    attempt.refresh_from_db(fields=['score', 'total'])
+    return graded
+
+
+def grade_pack(pack_id):
+    """Grade every submitted attempt of an exam pack"""
+    return grade_attempts(Attempt.objects.filter(exam_pack_id=pack_id))
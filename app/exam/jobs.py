@@ -0,0 +1,22 @@
+"""
+Background jobs for exams
+"""
+from core.jobs import job
+from core.models import ExamPack
+from exam import (
+    analytics,
+    grading,
+)
+
+
+@job()
+def grade_pack(pack_id):
+    """Grade every submitted attempt of an exam pack"""
+    return {'graded': grading.grade_pack(pack_id)}
+
+
+@job()
+def analyze_pack(pack_id):
+    """Recompute the item statistics of an exam pack"""
+    pack = ExamPack.objects.defer('content').get(id=pack_id)
+    return {'items': analytics.analyze_pack(pack)}
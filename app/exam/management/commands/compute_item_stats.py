@@ -0,0 +1,39 @@
+"""
+Django command to compute item analysis statistics
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import ExamPack
+from exam import analytics
+
+
+class Command(BaseCommand):
+    """Django command to analyze the answers of exam packs."""
+
+    help = 'Compute difficulty, discrimination and distractor statistics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pack',
+            type=int,
+            action='append',
+            dest='packs',
+            help='Only analyze this exam pack (repeatable).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=analytics.DEFAULT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        packs = ExamPack.objects.defer('content').order_by('id')
+        if options['packs']:
+            packs = packs.filter(id__in=options['packs'])
+
+        for pack in packs.iterator():
+            items = analytics.analyze_pack(pack, options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Analyzed {items} items of pack {pack.id}.'
+            ))
@@ -0,0 +1,31 @@
+"""
+Django command to grade submitted exam attempts
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import Attempt
+from exam.grading import grade_attempts
+
+
+class Command(BaseCommand):
+    """Django command to grade attempts in bulk."""
+
+    help = 'Grade submitted attempts, optionally only for some exam packs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pack',
+            type=int,
+            action='append',
+            dest='packs',
+            help='Only grade attempts of this exam pack (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        attempts = Attempt.objects.all()
+        if options['packs']:
+            attempts = attempts.filter(exam_pack_id__in=options['packs'])
+
+        graded = grade_attempts(attempts)
+        self.stdout.write(self.style.SUCCESS(f'Graded {graded} attempts.'))
@@ -0,0 +1,99 @@
+"""
+Building and serving exam packs
+"""
+import gzip
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import (
+    Question,
+    ExamPack,
+)
+from question.serializers import (
+    QUESTION_FIELDS,
+    question_data,
+)
+
+
+def pack_questions(question_ids):
+    """
+    Return the questions to freeze into a pack, in the order given.
+
+    Packs are served to examinees, so the answer is left out.
+    """
+    rows = Question.objects.filter(id__in=question_ids).values(
+        *QUESTION_FIELDS
+    )
+    by_id = {}
+    for question in question_data(rows):
+        del question['answer']
+        by_id[question['id']] = question
+
+    return [by_id[question_id] for question_id in question_ids]
+
+
+def build_pack(name, question_ids, compress=True, user=None):
+    """Freeze the questions into a new pack and return it"""
+    questions = pack_questions(question_ids)
+    content = json.dumps(
+        {'name': name, 'questions': questions},
+        separators=(',', ':'),
+    ).encode('utf-8')
+
+    content_encoding = ''
+    if compress:
+        content = gzip.compress(content, mtime=0)
+        content_encoding = ExamPack.GZIP
+
+    pack = ExamPack.objects.create(
+        name=name,
+        content=content,
+        content_encoding=content_encoding,
+        etag=hashlib.sha256(content).hexdigest(),
+        created_by=user,
+    )
+    pack.questions.set(question_ids)
+
+    return pack
+
+
+def decompress(content):
+    """Return the JSON of a gzipped pack"""
+    return gzip.decompress(content)
+
+
+def pack_cache_key(pack_id):
+    return f'exam:pack:{pack_id}'
+
+
+def get_pack_content(pack_id):
+    """
+    Return (content, content encoding, etag) for a pack, or None.
+
+    Packs never change, so the blob is cached for `PACK_CACHE_TIMEOUT`
+    seconds after the first read. The timeout bounds how long a deleted
+    pack can still be served if the cache delete is lost.
+    """
+    key = pack_cache_key(pack_id)
+    entry = cache.get(key)
+    if entry is None:
+        pack = ExamPack.objects.filter(id=pack_id).values(
+            'content',
+            'content_encoding',
+            'etag',
+        ).first()
+        if pack is None:
+            return None
+        entry = (bytes(pack['content']), pack['content_encoding'],
+                 pack['etag'])
+        cache.set(key, entry, settings.PACK_CACHE_TIMEOUT)
+
+    return entry
+
+
+def forget_pack(pack_id):
+    """Drop a deleted pack from the cache"""
+    cache.delete(pack_cache_key(pack_id))
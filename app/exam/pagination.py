@@ -0,0 +1,18 @@
+"""
+Pagination for the exam API
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class ExamPackCursorPagination(CursorPagination):
+    """
+    Keyset pagination over exam packs, newest first.
+
+    Pages are fetched with `WHERE id < <cursor>` against the primary
+    key index, so deep pages cost the same as the first one.
+    """
+    ordering = '-id'
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
@@ -0,0 +1,199 @@
+"""
+Change feed of exam progress for live dashboards
+"""
+import asyncio
+import logging
+import select
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import (
+    connection,
+    transaction,
+)
+from django.db.models import (
+    Count,
+    Q,
+)
+
+from core.models import (
+    ExamPack,
+    Attempt,
+)
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'exam_progress'
+
+
+def progress_snapshot(pack_id):
+    """Return the answered, bookmarked and submitted counts of a pack"""
+    attempts = list(
+        Attempt.objects.filter(exam_pack_id=pack_id).annotate(
+            answered=Count('answers', filter=Q(answers__choice__isnull=False)),
+            bookmarked=Count('answers', filter=Q(answers__isbookmarked=True)),
+        ).order_by('id').values(
+            'id',
+            'examinee',
+            'issubmitted',
+            'answered',
+            'bookmarked',
+        )
+    )
+    return {
+        'pack': pack_id,
+        'questions': ExamPack.questions.through.objects.filter(
+            exampack_id=pack_id,
+        ).count(),
+        'submitted': sum(attempt['issubmitted'] for attempt in attempts),
+        'attempts': attempts,
+    }
+
+
+class _Channel:
+    """Listeners of one pack and the last snapshot sent to them"""
+
+    def __init__(self):
+        self.version = 0
+        self.listeners = set()
+        self.data = None
+        self.data_version = -1
+        self.lock = asyncio.Lock()
+
+
+class ProgressBroker:
+    """
+    In-process pub/sub of pack changes.
+
+    Publishing only bumps a version and wakes the listeners, so a burst
+    of changes costs one snapshot query, which is shared by every
+    listener of the pack in this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+
+    def publish(self, pack_id):
+        """Wake the listeners of a pack; safe to call from any thread"""
+        with self._lock:
+            channel = self._channels.get(pack_id)
+            if channel is None:
+                return
+            channel.version += 1
+            listeners = list(channel.listeners)
+        for loop, event in listeners:
+            loop.call_soon_threadsafe(event.set)
+
+    async def _snapshot(self, pack_id, channel):
+        """Return the current snapshot, querying at most once per change"""
+        async with channel.lock:
+            version = channel.version
+            if channel.data_version != version:
+                channel.data = await sync_to_async(progress_snapshot)(pack_id)
+                channel.data_version = version
+            return channel.data
+
+    async def listen(self, pack_id):
+        """
+        Yield snapshots of a pack whenever it changes.
+
+        Yields None as a heartbeat when nothing changed for
+        `PROGRESS_HEARTBEAT` seconds, and never more than one snapshot
+        per `PROGRESS_MIN_INTERVAL` seconds.
+        """
+        listener = (asyncio.get_running_loop(), asyncio.Event())
+        listener[1].set()
+        with self._lock:
+            channel = self._channels.get(pack_id)
+            if channel is None:
+                channel = self._channels[pack_id] = _Channel()
+            channel.listeners.add(listener)
+        start_listener()
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        listener[1].wait(),
+                        settings.PROGRESS_HEARTBEAT,
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                listener[1].clear()
+                yield await self._snapshot(pack_id, channel)
+                await asyncio.sleep(settings.PROGRESS_MIN_INTERVAL)
+        finally:
+            with self._lock:
+                channel.listeners.discard(listener)
+                if not channel.listeners:
+                    self._channels.pop(pack_id, None)
+
+
+broker = ProgressBroker()
+
+
+def changed(pack_id):
+    """
+    Announce that the progress of a pack changed.
+
+    On PostgreSQL this sends a NOTIFY, delivered at commit to the
+    listeners of every process. Elsewhere the listeners of this process
+    are woken after commit.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_notify(%s, %s)',
+                [NOTIFY_CHANNEL, str(pack_id)],
+            )
+    else:
+        transaction.on_commit(lambda: broker.publish(pack_id))
+
+
+_listener_lock = threading.Lock()
+_listener = None
+
+
+def start_listener():
+    """Start forwarding PostgreSQL notifications to the broker once"""
+    global _listener
+    if connection.vendor != 'postgresql' or _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = threading.Thread(
+                target=_listen_for_notifications,
+                name='exam-progress-listener',
+                daemon=True,
+            )
+            _listener.start()
+
+
+def _listen_for_notifications():
+    """LISTEN on a dedicated connection and publish what arrives"""
+    import psycopg2
+
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(**connection.get_connection_params())
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+            while True:
+                select.select([conn], [], [], settings.PROGRESS_HEARTBEAT)
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    broker.publish(int(notify.payload))
+        except Exception:
+            logger.exception('Exam progress listener failed, reconnecting')
+            time.sleep(1)
+        finally:
+            if conn is not None:
+                conn.close()
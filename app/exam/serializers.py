@@ -0,0 +1,169 @@
+"""
+Serializers for the exam API
+"""
+from rest_framework import serializers
+
+from core.models import (
+    Question,
+    ExamPack,
+    Attempt,
+    ItemStatistic,
+    ChoiceStatistic,
+)
+
+
+class ExamPackSerializer(serializers.ModelSerializer):
+    """Serializer for exam packs"""
+    questions = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        write_only=True,
+    )
+    compress = serializers.BooleanField(default=True, write_only=True)
+    size = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ExamPack
+        fields = [
+            'id',
+            'name',
+            'questions',
+            'compress',
+            'content_encoding',
+            'etag',
+            'size',
+            'Created_Date',
+        ]
+        read_only_fields = [
+            'id',
+            'content_encoding',
+            'etag',
+            'size',
+            'Created_Date',
+        ]
+
+    def validate_questions(self, value):
+        """Check every question exists, in one query"""
+        value = list(dict.fromkeys(value))
+        found = set(
+            Question.objects.filter(id__in=value).values_list(
+                'id',
+                flat=True,
+            )
+        )
+        missing = [question_id for question_id in value
+                   if question_id not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f'Questions do not exist: {missing}'
+            )
+
+        return value
+
+
+class AttemptSerializer(serializers.ModelSerializer):
+    """Serializer for exam attempts"""
+
+    class Meta:
+        model = Attempt
+        fields = [
+            'id',
+            'exam_pack',
+            'examinee',
+            'issubmitted',
+            'score',
+            'total',
+            'Created_Date',
+        ]
+        read_only_fields = [
+            'id',
+            'examinee',
+            'issubmitted',
+            'score',
+            'total',
+            'Created_Date',
+        ]
+
+
+class AnswerSerializer(serializers.Serializer):
+    """Serializer for one answer in a bulk submission"""
+    question = serializers.IntegerField()
+    choice = serializers.IntegerField(allow_null=True, required=False)
+    isbookmarked = serializers.BooleanField(required=False)
+
+
+class AnswerAutosaveSerializer(serializers.Serializer):
+    """Serializer for autosaving answer changes of an attempt"""
+    answers = AnswerSerializer(many=True)
+
+    def validate_answers(self, value):
+        """Check questions are in the pack and choices belong to them"""
+        attempt = self.context['attempt']
+        question_ids = [answer['question'] for answer in value]
+        if len(set(question_ids)) != len(question_ids):
+            raise serializers.ValidationError(
+                'Each question can only be answered once.'
+            )
+
+        in_pack = set(
+            Question.objects.filter(
+                exam_packs=attempt.exam_pack_id,
+                id__in=question_ids,
+            ).values_list('id', flat=True)
+        )
+        choices = {}
+        for question_id, choice_id, choice in (
+            Question.choices.through.objects.filter(
+                question_id__in=in_pack
+            ).values_list('question_id', 'choice_id', 'choice__choice')
+        ):
+            choices[(question_id, choice_id)] = choice
+
+        errors = []
+        for answer in value:
+            error = {}
+            if answer['question'] not in in_pack:
+                error['question'] = ['Question is not part of this exam.']
+            elif answer.get('choice') is not None:
+                text = choices.get((answer['question'], answer['choice']))
+                if text is None:
+                    error['choice'] = ['Choice is not an option here.']
+                answer['examinee_answer'] = text
+            elif 'choice' in answer:
+                answer['examinee_answer'] = ''
+            errors.append(error)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return value
+
+
+class AnswerSubmissionSerializer(AnswerAutosaveSerializer):
+    """Serializer for submitting the answers of an attempt in bulk"""
+    submit = serializers.BooleanField(default=False)
+
+
+class ChoiceStatisticSerializer(serializers.ModelSerializer):
+    """Serializer for how often a choice was picked"""
+
+    class Meta:
+        model = ChoiceStatistic
+        fields = ['choice', 'count', 'frequency']
+        read_only_fields = fields
+
+
+class ItemStatisticSerializer(serializers.ModelSerializer):
+    """Serializer for the item analysis of a question"""
+    choices = ChoiceStatisticSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ItemStatistic
+        fields = [
+            'question',
+            'responses',
+            'difficulty',
+            'discrimination',
+            'choices',
+            'Computed_Date',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,109 @@
+"""
+Server-sent events endpoint for live exam progress
+"""
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.models import (
+    ExamPack,
+    User,
+)
+from exam.progress import broker
+from user.authentication import CachedTokenAuthentication
+
+
+PROGRESS_PATH = re.compile(r'^/api/exam/pack/(?P<pack_id>\d+)/progress/$')
+
+
+def _token_key(scope):
+    """Return the token from the Authorization header or query string"""
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            keyword, _, key = value.decode('latin-1').partition(' ')
+            if keyword == 'Token':
+                return key.strip()
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    return query.get('token', [''])[0]
+
+
+@sync_to_async
+def _authorize(key, pack_id):
+    """Return an HTTP error status, or None if the proctor may listen"""
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed:
+        return 401
+    if user.role != User.ADMIN:
+        return 403
+    if not ExamPack.objects.filter(id=pack_id).exists():
+        return 404
+    return None
+
+
+async def _send_error(send, code):
+    """Send a bodyless error response"""
+    await send({'type': 'http.response.start', 'status': code, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _stream(pack_id, send):
+    """Send a progress event for every change and heartbeats between"""
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    async for snapshot in broker.listen(pack_id):
+        if snapshot is None:
+            body = b': keep-alive\n\n'
+        else:
+            data = json.dumps(snapshot, cls=DjangoJSONEncoder)
+            body = f'event: progress\ndata: {data}\n\n'.encode()
+        await send({
+            'type': 'http.response.body',
+            'body': body,
+            'more_body': True,
+        })
+
+
+async def _wait_for_disconnect(receive):
+    """Return once the client goes away"""
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def progress_app(scope, receive, send):
+    """
+    ASGI app streaming the progress of a pack to proctors.
+
+    Browsers cannot set headers on EventSource, so the token may also be
+    passed as the `token` query parameter.
+    """
+    pack_id = int(PROGRESS_PATH.match(scope['path'])['pack_id'])
+    if scope['method'] != 'GET':
+        await _send_error(send, 405)
+        return
+    error = await _authorize(_token_key(scope), pack_id)
+    if error:
+        await _send_error(send, error)
+        return
+
+    stream = asyncio.ensure_future(_stream(pack_id, send))
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    await asyncio.wait(
+        [stream, disconnect],
+        return_when=asyncio.FIRST_COMPLETED,
+    )
+    for task in (stream, disconnect):
+        task.cancel()
+    await asyncio.gather(stream, disconnect, return_exceptions=True)
@@ -0,0 +1,188 @@
+"""
+Tests for item analysis statistics
+"""
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+    Attempt,
+    Examinee_Answer,
+    ItemStatistic,
+)
+from exam import (
+    analytics,
+    grading,
+    packs,
+)
+
+
+def statistics_url(pack_id):
+    """Create and return a pack statistics URL"""
+    return reverse('exam:exampack-statistics', args=[pack_id])
+
+
+class ItemAnalysisTests(TestCase):
+    """Test vectorized item analysis"""
+
+    def setUp(self):
+        self.yes = Choice.objects.create(choice='Yes')
+        self.no = Choice.objects.create(choice='No')
+        self.questions = []
+        for i in range(2):
+            question = Question.objects.create(
+                question=f'Question {i}?',
+                answer=self.yes,
+            )
+            question.choices.add(self.yes, self.no)
+            self.questions.append(question)
+        self.pack = packs.build_pack(
+            'Quiz',
+            [question.id for question in self.questions],
+        )
+        for i, picks in enumerate([
+            [self.yes, self.yes],
+            [self.yes, self.no],
+            [self.no, self.no],
+            [self.yes, None],
+        ]):
+            self.create_attempt(f'user{i}@example.com', picks)
+        self.create_attempt('draft@example.com', [self.no], submitted=False)
+        grading.grade_attempts()
+
+    def create_attempt(self, email, picks, submitted=True):
+        """Create an attempt answering the questions with picks"""
+        examinee = get_user_model().objects.create_user(
+            email=email,
+            password='testpass123',
+        )
+        attempt = Attempt.objects.create(
+            examinee=examinee,
+            exam_pack=self.pack,
+            issubmitted=submitted,
+        )
+        # A None pick is stored as an answer without a choice
+        Examinee_Answer.objects.bulk_create([
+            Examinee_Answer(attempt=attempt, question=question, choice=choice)
+            for question, choice in zip(self.questions, picks)
+        ])
+        return attempt
+
+    def test_response_matrix(self):
+        """Test answers are streamed into the response matrix"""
+        question_ids, scores, choices = analytics.response_matrix(
+            self.pack,
+            chunk_size=3,
+        )
+
+        self.assertEqual(
+            list(question_ids),
+            [question.id for question in self.questions],
+        )
+        np.testing.assert_array_equal(scores, [[1, 1], [1, 0], [0, 0], [1, 0]])
+        self.assertEqual(choices[3, 1], 0)
+        self.assertEqual(choices[2, 0], self.no.id)
+
+    def test_response_matrix_ignores_attempts_submitted_meanwhile(self):
+        """Test answers of attempts missing from the id list are dropped"""
+        submitted = list(
+            Attempt.objects.filter(issubmitted=True).order_by('id')
+        )
+        late = [submitted[1].id, submitted[3].id]
+        attempts = Attempt.objects.filter
+
+        def filter_before_submit(*args, **kwargs):
+            return attempts(*args, **kwargs).exclude(id__in=late)
+
+        with patch.object(Attempt.objects, 'filter', filter_before_submit):
+            _, scores, choices = analytics.response_matrix(
+                self.pack,
+                chunk_size=3,
+            )
+
+        np.testing.assert_array_equal(scores, [[1, 1], [0, 0]])
+        np.testing.assert_array_equal(
+            choices,
+            [[self.yes.id, self.yes.id], [self.no.id, self.no.id]],
+        )
+
+    def test_item_statistics(self):
+        """Test difficulty and point-biserial discrimination"""
+        scores = np.array([[1, 1, 0], [1, 0, 0], [0, 0, 0], [1, 0, 1]])
+
+        difficulty, discrimination = analytics.item_statistics(scores)
+
+        np.testing.assert_allclose(difficulty, [0.75, 0.25, 0.25])
+        rest = scores.sum(axis=1) - scores[:, 0]
+        self.assertAlmostEqual(
+            discrimination[0],
+            np.corrcoef(scores[:, 0], rest)[0, 1],
+        )
+
+    def test_constant_item_has_no_discrimination(self):
+        """Test items everyone got right have no discrimination"""
+        difficulty, discrimination = analytics.item_statistics(
+            np.array([[1, 1], [1, 0]]),
+        )
+
+        self.assertEqual(difficulty[0], 1)
+        self.assertTrue(np.isnan(discrimination[0]))
+
+    def test_analyze_pack(self):
+        """Test statistics are stored per question and choice"""
+        items = analytics.analyze_pack(self.pack)
+
+        self.assertEqual(items, 2)
+        first, second = ItemStatistic.objects.order_by('question_id')
+        self.assertEqual(first.responses, 4)
+        self.assertEqual(first.difficulty, 0.75)
+        self.assertAlmostEqual(first.discrimination, 1 / 3)
+        self.assertEqual(second.responses, 3)
+        self.assertEqual(second.difficulty, 0.25)
+        self.assertEqual(
+            dict(second.choices.values_list('choice', 'count')),
+            {self.yes.id: 1, self.no.id: 2},
+        )
+        self.assertAlmostEqual(
+            second.choices.get(choice=self.no).frequency,
+            2 / 3,
+        )
+
+    def test_reanalyze_replaces_statistics(self):
+        """Test computing again does not duplicate statistics"""
+        out = StringIO()
+
+        call_command('compute_item_stats', pack=[self.pack.id], stdout=out)
+        call_command('compute_item_stats', stdout=out)
+
+        self.assertIn('Analyzed 2 items', out.getvalue())
+        self.assertEqual(ItemStatistic.objects.count(), 2)
+
+    def test_statistics_endpoint(self):
+        """Test admins can read the stored statistics"""
+        analytics.analyze_pack(self.pack)
+        admin = get_user_model().objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        res = client.get(statistics_url(self.pack.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(res.data[0]['question'], self.questions[0].id)
+        self.assertEqual(res.data[0]['choices'][0]['choice'], self.yes.id)
+        self.assertEqual(res.data[0]['choices'][0]['count'], 3)
@@ -0,0 +1,248 @@
+"""
+Tests for the exam attempt APIs
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+    Attempt,
+    Examinee_Answer,
+)
+from exam import packs
+
+
+ATTEMPT_URL = reverse('exam:attempt-list')
+
+
+def answers_url(attempt_id):
+    """Create and return an attempt answers URL"""
+    return reverse('exam:attempt-answers', args=[attempt_id])
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_questions(count):
+    """Create and return sample questions with choices Yes and No"""
+    yes = Choice.objects.create(choice='Yes')
+    no = Choice.objects.create(choice='No')
+    questions = []
+    for i in range(count):
+        question = Question.objects.create(
+            question=f'Question {i}?',
+            answer=yes if i % 2 == 0 else no,
+        )
+        question.choices.add(yes, no)
+        questions.append(question)
+    return questions, yes, no
+
+
+class AttemptAPITests(TestCase):
+    """Test exam attempts and bulk answer submission"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.examinee = create_user(
+            email='examinee@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.examinee)
+        self.questions, self.yes, self.no = create_questions(4)
+        self.pack = packs.build_pack(
+            'Quiz',
+            [question.id for question in self.questions[:3]],
+        )
+        self.attempt = Attempt.objects.create(
+            examinee=self.examinee,
+            exam_pack=self.pack,
+        )
+
+    def test_start_attempt(self):
+        """Test examinees can start an attempt"""
+        res = self.client.post(ATTEMPT_URL, {'exam_pack': self.pack.id})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        attempt = Attempt.objects.get(id=res.data['id'])
+        self.assertEqual(attempt.examinee, self.examinee)
+
+    def test_list_own_attempts(self):
+        """Test examinees only see their own attempts"""
+        other = create_user(email='other@example.com', password='pass12345')
+        Attempt.objects.create(examinee=other, exam_pack=self.pack)
+
+        res = self.client.get(ATTEMPT_URL)
+
+        self.assertEqual(
+            [attempt['id'] for attempt in res.data],
+            [self.attempt.id],
+        )
+
+    def test_bulk_submit_answers(self):
+        """Test saving a whole exam's answers in one request"""
+        payload = {'answers': [
+            {'question': self.questions[0].id, 'choice': self.yes.id},
+            {
+                'question': self.questions[1].id,
+                'choice': self.yes.id,
+                'isbookmarked': True,
+            },
+            {'question': self.questions[2].id, 'choice': None},
+        ]}
+
+        res = self.client.post(
+            answers_url(self.attempt.id),
+            payload,
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['saved'], 3)
+        answers = self.attempt.answers.order_by('question_id')
+        self.assertEqual(answers.count(), 3)
+        self.assertEqual(answers[0].choice, self.yes)
+        self.assertEqual(answers[0].examinee_answer, 'Yes')
+        self.assertTrue(answers[1].isbookmarked)
+        self.assertIsNone(answers[2].choice)
+
+    def test_resubmit_updates_answers(self):
+        """Test later submissions upsert the stored answers"""
+        question = self.questions[0]
+        self.client.post(answers_url(self.attempt.id), {'answers': [
+            {'question': question.id, 'choice': self.yes.id,
+             'isbookmarked': True},
+        ]}, format='json')
+
+        payload = {'answers': [
+            {'question': q.id, 'choice': self.no.id}
+            for q in self.questions[:3]
+        ]}
+        with self.assertNumQueries(9):
+            res = self.client.post(
+                answers_url(self.attempt.id),
+                payload,
+                format='json',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.attempt.answers.count(), 3)
+        answer = self.attempt.answers.get(question=question)
+        self.assertEqual(answer.choice, self.no)
+        # The bookmark was not sent, so it is kept
+        self.assertTrue(answer.isbookmarked)
+
+    def test_submit_locks_attempt(self):
+        """Test a submitted attempt cannot be changed"""
+        payload = {
+            'answers': [
+                {'question': self.questions[0].id, 'choice': self.yes.id},
+            ],
+            'submit': True,
+        }
+        res = self.client.post(
+            answers_url(self.attempt.id),
+            payload,
+            format='json',
+        )
+
+        self.assertTrue(res.data['issubmitted'])
+        answer = Examinee_Answer.objects.get(attempt=self.attempt)
+        self.assertTrue(answer.issubmitted)
+        self.assertTrue(answer.iscorrect)
+        self.attempt.refresh_from_db()
+        self.assertEqual((self.attempt.score, self.attempt.total), (1, 3))
+
+        res = self.client.post(
+            answers_url(self.attempt.id),
+            payload,
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reject_question_outside_pack(self):
+        """Test answers must be for questions in the exam"""
+        payload = {'answers': [
+            {'question': self.questions[3].id, 'choice': self.yes.id},
+        ]}
+
+        res = self.client.post(
+            answers_url(self.attempt.id),
+            payload,
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Examinee_Answer.objects.exists())
+
+    def test_reject_foreign_choice(self):
+        """Test answers must pick one of the question's choices"""
+        other = Choice.objects.create(choice='Maybe')
+        payload = {'answers': [
+            {'question': self.questions[0].id, 'choice': other.id},
+        ]}
+
+        res = self.client.post(
+            answers_url(self.attempt.id),
+            payload,
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('choice', res.data['answers'][0])
+
+    def test_cannot_submit_for_others(self):
+        """Test examinees cannot answer someone else's attempt"""
+        other = create_user(email='other@example.com', password='pass12345')
+        self.client.force_authenticate(other)
+
+        res = self.client.post(answers_url(self.attempt.id), {
+            'answers': [],
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_answers(self):
+        """Test listing the answers of an attempt"""
+        Examinee_Answer.objects.create(
+            attempt=self.attempt,
+            question=self.questions[0],
+            choice=self.yes,
+            examinee_answer='Yes',
+        )
+
+        res = self.client.get(answers_url(self.attempt.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['choice'], self.yes.id)
+
+    def test_retried_submission_is_replayed(self):
+        """Test a retried final submission gets the first response"""
+        payload = {
+            'answers': [
+                {'question': self.questions[0].id, 'choice': self.yes.id},
+            ],
+            'submit': True,
+        }
+        responses = [
+            self.client.post(
+                answers_url(self.attempt.id),
+                payload,
+                format='json',
+                HTTP_IDEMPOTENCY_KEY='submit-1',
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(
+            [res.status_code for res in responses],
+            [status.HTTP_200_OK, status.HTTP_200_OK],
+        )
+        self.assertEqual(responses[1].data, responses[0].data)
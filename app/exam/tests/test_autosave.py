@@ -0,0 +1,220 @@
+"""
+Tests for the answer autosave buffer
+"""
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+    Attempt,
+    Examinee_Answer,
+)
+from exam import (
+    autosave,
+    packs,
+)
+from exam.autosave import (
+    AnswerBuffer,
+    buffer,
+)
+
+
+def autosave_url(attempt_id):
+    """Create and return an attempt autosave URL"""
+    return reverse('exam:attempt-autosave', args=[attempt_id])
+
+
+def answers_url(attempt_id):
+    """Create and return an attempt answers URL"""
+    return reverse('exam:attempt-answers', args=[attempt_id])
+
+
+@override_settings(AUTOSAVE_INTERVAL=0, AUTOSAVE_MAX_PENDING=100)
+class AutosaveTests(TestCase):
+    """Test write-behind autosaves"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.examinee = get_user_model().objects.create_user(
+            email='examinee@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.examinee)
+        self.yes = Choice.objects.create(choice='Yes')
+        self.no = Choice.objects.create(choice='No')
+        self.questions = []
+        for i in range(3):
+            question = Question.objects.create(
+                question=f'Question {i}?',
+                answer=self.yes,
+            )
+            question.choices.add(self.yes, self.no)
+            self.questions.append(question)
+        self.pack = packs.build_pack(
+            'Quiz',
+            [question.id for question in self.questions],
+        )
+        self.attempt = Attempt.objects.create(
+            examinee=self.examinee,
+            exam_pack=self.pack,
+        )
+        self.addCleanup(buffer.flush)
+
+    def test_changes_are_coalesced(self):
+        """Test repeated changes to an answer become one row write"""
+        autosaves = AnswerBuffer()
+        question_id = self.questions[0].id
+        for bookmarked in [True, False, True]:
+            autosaves.add(self.attempt.id, {
+                question_id: {'isbookmarked': bookmarked},
+            })
+        autosaves.add(self.attempt.id, {
+            question_id: {'choice_id': self.no.id, 'examinee_answer': 'No'},
+        })
+
+        self.assertEqual(len(autosaves), 1)
+        self.assertFalse(Examinee_Answer.objects.exists())
+
+        self.assertEqual(autosaves.flush(), 1)
+
+        answer = Examinee_Answer.objects.get()
+        self.assertTrue(answer.isbookmarked)
+        self.assertEqual(answer.choice, self.no)
+        self.assertEqual(len(autosaves), 0)
+
+    def test_flush_when_full(self):
+        """Test the buffer is written once it holds enough answers"""
+        autosaves = AnswerBuffer()
+
+        with self.settings(AUTOSAVE_MAX_PENDING=2):
+            autosaves.add(self.attempt.id, {
+                self.questions[0].id: {'isbookmarked': True},
+            })
+            self.assertFalse(Examinee_Answer.objects.exists())
+            autosaves.add(self.attempt.id, {
+                self.questions[1].id: {'isbookmarked': True},
+            })
+
+        self.assertEqual(Examinee_Answer.objects.count(), 2)
+        self.assertEqual(len(autosaves), 0)
+
+    def test_submitted_attempts_not_written(self):
+        """Test late autosaves cannot change a submitted attempt"""
+        autosaves = AnswerBuffer()
+        autosaves.add(self.attempt.id, {
+            self.questions[0].id: {'isbookmarked': True},
+        })
+        Attempt.objects.filter(id=self.attempt.id).update(issubmitted=True)
+
+        self.assertEqual(autosaves.flush(), 0)
+        self.assertFalse(Examinee_Answer.objects.exists())
+
+    def test_failing_answer_does_not_block_others(self):
+        """Test one unwritable answer is retried alone, then dropped"""
+        autosaves = AnswerBuffer()
+        other = Attempt.objects.create(
+            examinee=self.examinee,
+            exam_pack=self.pack,
+        )
+        deleted = Question.objects.create(question='Gone?', answer=self.yes)
+        deleted_id = deleted.id
+        deleted.delete()
+        autosaves.add(self.attempt.id, {
+            self.questions[0].id: {'isbookmarked': True},
+            deleted_id: {'isbookmarked': True},
+        })
+        autosaves.add(other.id, {
+            self.questions[1].id: {'isbookmarked': True},
+        })
+
+        with self.assertLogs('exam.autosave', 'WARNING'):
+            self.assertEqual(autosaves.flush(), 2)
+
+        self.assertEqual(
+            set(Examinee_Answer.objects.values_list(
+                'attempt_id',
+                'question_id',
+            )),
+            {
+                (self.attempt.id, self.questions[0].id),
+                (other.id, self.questions[1].id),
+            },
+        )
+        self.assertEqual(len(autosaves), 1)
+
+        with self.assertLogs('exam.autosave', 'ERROR') as logs:
+            for _ in range(autosave.MAX_WRITE_FAILURES - 1):
+                autosaves.flush()
+
+        self.assertIn(f'question {deleted_id}', logs.output[-1])
+        self.assertEqual(len(autosaves), 0)
+
+    @override_settings(AUTOSAVE_WRITE_THROUGH=True)
+    def test_write_through(self):
+        """Test write-through mode writes autosaves immediately"""
+        autosaves = AnswerBuffer()
+
+        autosaves.add(self.attempt.id, {
+            self.questions[0].id: {'isbookmarked': True},
+        })
+
+        self.assertTrue(Examinee_Answer.objects.get().isbookmarked)
+        self.assertEqual(len(autosaves), 0)
+
+    def test_autosave_endpoint(self):
+        """Test autosaves are accepted and buffered"""
+        payload = {'answers': [
+            {'question': self.questions[0].id, 'isbookmarked': True},
+            {'question': self.questions[1].id, 'choice': self.no.id},
+        ]}
+
+        res = self.client.post(
+            autosave_url(self.attempt.id),
+            payload,
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['buffered'], 2)
+        self.assertFalse(Examinee_Answer.objects.exists())
+
+    def test_submit_flushes_autosaves(self):
+        """Test submitting writes buffered answers first"""
+        self.client.post(autosave_url(self.attempt.id), {'answers': [
+            {'question': self.questions[0].id, 'isbookmarked': True},
+            {'question': self.questions[1].id, 'choice': self.no.id},
+        ]}, format='json')
+
+        res = self.client.post(answers_url(self.attempt.id), {
+            'answers': [
+                {'question': self.questions[1].id, 'choice': self.yes.id},
+            ],
+            'submit': True,
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        answers = self.attempt.answers.order_by('question_id')
+        self.assertEqual(len(answers), 2)
+        self.assertTrue(answers[0].isbookmarked)
+        self.assertEqual(answers[1].choice, self.yes)
+        self.assertTrue(all(answer.issubmitted for answer in answers))
+        self.assertEqual(len(buffer), 0)
+
+    def test_autosave_rejects_invalid_choice(self):
+        """Test autosaves are validated before being buffered"""
+        other = Choice.objects.create(choice='Maybe')
+
+        res = self.client.post(autosave_url(self.attempt.id), {'answers': [
+            {'question': self.questions[0].id, 'choice': other.id},
+        ]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(buffer), 0)
@@ -0,0 +1,178 @@
+"""
+Tests for grading exam attempts
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+    Attempt,
+    Examinee_Answer,
+    Job,
+)
+from exam import (
+    grading,
+    packs,
+)
+
+
+def grade_attempt_url(attempt_id):
+    """Create and return an attempt grading URL"""
+    return reverse('exam:attempt-grade', args=[attempt_id])
+
+
+def grade_pack_url(pack_id):
+    """Create and return a pack grading URL"""
+    return reverse('exam:exampack-grade', args=[pack_id])
+
+
+class GradingTests(TestCase):
+    """Test set-based grading"""
+
+    def setUp(self):
+        self.yes = Choice.objects.create(choice='Yes')
+        self.no = Choice.objects.create(choice='No')
+        self.questions = []
+        for i in range(3):
+            question = Question.objects.create(
+                question=f'Question {i}?',
+                answer=self.yes,
+            )
+            question.choices.add(self.yes, self.no)
+            self.questions.append(question)
+        self.pack = packs.build_pack(
+            'Quiz',
+            [question.id for question in self.questions],
+        )
+        self.attempts = [
+            self.create_attempt(f'user{i}@example.com', picks)
+            for i, picks in enumerate([
+                [self.yes, self.yes, self.no],
+                [self.no, None],
+            ])
+        ]
+
+    def create_attempt(self, email, picks, submitted=True):
+        """Create an attempt answering the questions with picks"""
+        examinee = get_user_model().objects.create_user(
+            email=email,
+            password='testpass123',
+        )
+        attempt = Attempt.objects.create(
+            examinee=examinee,
+            exam_pack=self.pack,
+            issubmitted=submitted,
+        )
+        Examinee_Answer.objects.bulk_create([
+            Examinee_Answer(
+                attempt=attempt,
+                question=question,
+                choice=choice,
+                issubmitted=submitted,
+            )
+            for question, choice in zip(self.questions, picks)
+        ])
+        return attempt
+
+    def test_grade_attempts(self):
+        """Test answers and attempt totals are graded in bulk"""
+        with self.assertNumQueries(4):
+            graded = grading.grade_attempts()
+
+        self.assertEqual(graded, 2)
+        first, second = [
+            Attempt.objects.get(id=attempt.id) for attempt in self.attempts
+        ]
+        self.assertEqual((first.score, first.total), (2, 3))
+        self.assertEqual((second.score, second.total), (0, 3))
+        self.assertEqual(
+            list(first.answers.order_by('question_id').values_list(
+                'iscorrect', flat=True,
+            )),
+            [True, True, False],
+        )
+        self.assertFalse(second.answers.filter(iscorrect=True).exists())
+
+    def test_unsubmitted_attempts_not_graded(self):
+        """Test attempts in progress are left alone"""
+        attempt = self.create_attempt(
+            'draft@example.com',
+            [self.yes],
+            submitted=False,
+        )
+
+        grading.grade_attempts()
+
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.score, 0)
+        self.assertFalse(attempt.answers.get().iscorrect)
+
+    def test_regrade_after_answer_key_change(self):
+        """Test regrading follows the current answer key"""
+        grading.grade_attempts()
+        Question.objects.filter(id=self.questions[2].id).update(
+            answer=self.no,
+        )
+
+        grading.grade_pack(self.pack.id)
+
+        self.attempts[0].refresh_from_db()
+        self.assertEqual(self.attempts[0].score, 3)
+
+    def test_grade_command(self):
+        """Test the grading command"""
+        out = StringIO()
+
+        call_command('grade_attempts', pack=[self.pack.id], stdout=out)
+
+        self.assertIn('Graded 2 attempts', out.getvalue())
+
+    def test_grade_endpoints_admin_only(self):
+        """Test admins grade through the API"""
+        client = APIClient()
+        client.force_authenticate(self.attempts[0].examinee)
+        res = client.post(grade_attempt_url(self.attempts[0].id))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = get_user_model().objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        client.force_authenticate(admin)
+
+        res = client.post(grade_attempt_url(self.attempts[0].id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['score'], 2)
+
+        res = client.post(grade_pack_url(self.pack.id))
+        self.assertEqual(res.data, {'graded': 2})
+
+    def test_grade_pack_in_background(self):
+        """Test pack grading can be queued as a job"""
+        admin = get_user_model().objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        res = client.post(grade_pack_url(self.pack.id) + '?background=1')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Attempt.objects.filter(score__gt=0).count(), 0)
+
+        call_command('run_worker', processes=0, burst=True, stdout=StringIO())
+
+        job = Job.objects.get(id=res.data['job'])
+        self.assertEqual(job.result, {'graded': 2})
+        self.assertEqual(Attempt.objects.filter(score=2).count(), 1)
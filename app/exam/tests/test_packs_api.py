@@ -0,0 +1,248 @@
+"""
+Tests for the exam pack APIs
+"""
+import gzip
+import json
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+    ExamPack,
+)
+from exam import packs
+
+
+PACK_URL = reverse('exam:exampack-list')
+
+
+def detail_url(pack_id):
+    """Create and return an exam pack detail URL"""
+    return reverse('exam:exampack-detail', args=[pack_id])
+
+
+def content_url(pack_id):
+    """Create and return an exam pack content URL"""
+    return reverse('exam:exampack-content', args=[pack_id])
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_questions(count):
+    """Create and return sample questions with two choices each"""
+    questions = []
+    for i in range(count):
+        answer = Choice.objects.create(choice=f'Answer {i}')
+        question = Question.objects.create(
+            question=f'Question {i}?',
+            answer=answer,
+        )
+        question.choices.add(
+            answer,
+            Choice.objects.create(choice=f'Distractor {i}'),
+        )
+        questions.append(question)
+    return questions
+
+
+class ExamPackAPITests(TestCase):
+    """Test freezing and serving exam packs"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.examinee = create_user(
+            email='examinee@example.com',
+            password='testpass123',
+            role='examinee',
+        )
+        self.questions = create_questions(3)
+
+    def create_pack(self, **params):
+        """Create a pack through the API as admin"""
+        payload = {
+            'name': 'Midterm',
+            'questions': [self.questions[2].id, self.questions[0].id],
+        }
+        payload.update(params)
+        self.client.force_authenticate(self.admin)
+        return self.client.post(PACK_URL, payload, format='json')
+
+    def test_create_pack(self):
+        """Test freezing questions into a pack"""
+        res = self.create_pack()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        pack = ExamPack.objects.get(id=res.data['id'])
+        self.assertEqual(pack.content_encoding, 'gzip')
+        self.assertEqual(res.data['etag'], pack.etag)
+        self.assertEqual(pack.questions.count(), 2)
+
+    def test_create_pack_reports_size(self):
+        """Test the created pack reports its size in bytes"""
+        res = self.create_pack()
+
+        pack = ExamPack.objects.get(id=res.data['id'])
+        self.assertEqual(res.data['size'], len(pack.content))
+
+    def test_list_packs_without_content(self):
+        """Test listing packs reads sizes without loading the blobs"""
+        ids = [self.create_pack(name=f'Pack {i}').data['id']
+               for i in range(3)]
+        pack = ExamPack.objects.get(id=ids[-1])
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PACK_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([p['id'] for p in res.data['results']], ids[:0:-1])
+        self.assertEqual(res.data['results'][0]['size'], len(pack.content))
+        self.assertIsNotNone(res.data['next'])
+        select = queries.captured_queries[-1]['sql']
+        self.assertIn('LENGTH("core_exampack"."content")', select)
+        self.assertNotIn('"core_exampack"."content",', select)
+
+    def test_create_pack_unknown_question(self):
+        """Test packs can only contain existing questions"""
+        res = self.create_pack(questions=[self.questions[0].id, 999999])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ExamPack.objects.exists())
+
+    def test_examinee_cannot_create_pack(self):
+        """Test examinees cannot freeze packs"""
+        self.client.force_authenticate(self.examinee)
+
+        res = self.client.post(
+            PACK_URL,
+            {'name': 'Midterm', 'questions': [self.questions[0].id]},
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_examinee_downloads_pack(self):
+        """Test examinees get the frozen questions without answers"""
+        pack_id = self.create_pack().data['id']
+        self.client.force_authenticate(self.examinee)
+
+        res = self.client.get(
+            content_url(pack_id),
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', res['Cache-Control'])
+        data = json.loads(gzip.decompress(res.content))
+        self.assertEqual(data['name'], 'Midterm')
+        self.assertEqual(
+            [q['id'] for q in data['questions']],
+            [self.questions[2].id, self.questions[0].id],
+        )
+        self.assertNotIn('answer', data['questions'][0])
+        self.assertEqual(len(data['questions'][0]['choices']), 2)
+
+    def test_pack_is_frozen(self):
+        """Test later question edits do not change the pack"""
+        pack_id = self.create_pack(compress=False).data['id']
+        Question.objects.filter(id=self.questions[0].id).update(
+            question='Edited?'
+        )
+        self.client.force_authenticate(self.examinee)
+
+        res = self.client.get(content_url(pack_id))
+
+        data = json.loads(res.content)
+        self.assertEqual(data['questions'][1]['question'], 'Question 0?')
+
+    def test_pack_served_from_cache(self):
+        """Test repeated downloads skip the pack query"""
+        pack_id = self.create_pack().data['id']
+        self.client.force_authenticate(self.examinee)
+        self.client.get(content_url(pack_id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(content_url(pack_id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_pack_cached_with_timeout(self):
+        """Test pack blobs expire from the cache"""
+        pack_id = self.create_pack().data['id']
+        self.client.force_authenticate(self.examinee)
+
+        with override_settings(PACK_CACHE_TIMEOUT=5):
+            self.client.get(content_url(pack_id))
+            cached_at = time.time()
+        with patch('time.time', return_value=cached_at + 10):
+            self.assertIsNone(cache.get(packs.pack_cache_key(pack_id)))
+
+    def test_non_numeric_pack_id_not_found(self):
+        """Test a non-numeric pack id returns 404"""
+        self.client.force_authenticate(self.examinee)
+
+        res = self.client.get(f'{PACK_URL}abc/content/')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pack_decompressed_for_plain_clients(self):
+        """Test clients without gzip support get plain JSON"""
+        pack_id = self.create_pack().data['id']
+        self.client.force_authenticate(self.examinee)
+
+        res = self.client.get(content_url(pack_id))
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(res.content)['name'], 'Midterm')
+
+    def test_pack_not_modified(self):
+        """Test a matching If-None-Match returns 304"""
+        pack_id = self.create_pack().data['id']
+        self.client.force_authenticate(self.examinee)
+        etag = self.client.get(content_url(pack_id))['ETag']
+
+        res = self.client.get(content_url(pack_id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_delete_pack(self):
+        """Test deleting a pack stops serving it"""
+        pack_id = self.create_pack().data['id']
+        self.client.get(content_url(pack_id))
+
+        res = self.client.delete(detail_url(pack_id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        res = self.client.get(content_url(pack_id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_packs_cannot_be_updated(self):
+        """Test packs are immutable through the API"""
+        pack_id = self.create_pack().data['id']
+
+        res = self.client.patch(detail_url(pack_id), {'name': 'Final'})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,209 @@
+"""
+Tests for live exam progress
+"""
+import asyncio
+import json
+from unittest.mock import patch
+
+from asgiref.sync import (
+    async_to_sync,
+    sync_to_async,
+)
+from django.contrib.auth import get_user_model
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+    Attempt,
+    Examinee_Answer,
+)
+from exam import (
+    packs,
+    progress,
+)
+from exam.sse import progress_app
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+async def request(path, headers=(), query=b'', app=progress_app):
+    """Run the SSE app until the first body chunk and return messages"""
+    messages = []
+    streamed = asyncio.Event()
+
+    async def receive():
+        await streamed.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+        if message['type'] == 'http.response.body':
+            streamed.set()
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'headers': list(headers),
+        'query_string': query,
+    }
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return messages
+
+
+@override_settings(PROGRESS_MIN_INTERVAL=0, PROGRESS_HEARTBEAT=5)
+class ProgressTests(TestCase):
+    """Test progress snapshots and their change feed"""
+
+    def setUp(self):
+        self.yes = Choice.objects.create(choice='Yes')
+        questions = []
+        for i in range(3):
+            question = Question.objects.create(
+                question=f'Question {i}?',
+                answer=self.yes,
+            )
+            question.choices.add(self.yes)
+            questions.append(question)
+        self.questions = questions
+        self.pack = packs.build_pack('Quiz', [q.id for q in questions])
+        self.examinee = create_user(
+            email='examinee@example.com',
+            password='testpass123',
+        )
+        self.attempt = Attempt.objects.create(
+            examinee=self.examinee,
+            exam_pack=self.pack,
+        )
+        Examinee_Answer.objects.create(
+            attempt=self.attempt,
+            question=questions[0],
+            choice=self.yes,
+        )
+        Examinee_Answer.objects.create(
+            attempt=self.attempt,
+            question=questions[1],
+            isbookmarked=True,
+        )
+        self.path = f'/api/exam/pack/{self.pack.id}/progress/'
+
+    def test_snapshot(self):
+        """Test the snapshot counts answers, bookmarks and submissions"""
+        with self.assertNumQueries(2):
+            snapshot = progress.progress_snapshot(self.pack.id)
+
+        self.assertEqual(snapshot['questions'], 3)
+        self.assertEqual(snapshot['submitted'], 0)
+        self.assertEqual(snapshot['attempts'], [{
+            'id': self.attempt.id,
+            'examinee': self.examinee.id,
+            'issubmitted': False,
+            'answered': 1,
+            'bookmarked': 1,
+        }])
+
+    def test_listeners_share_snapshots(self):
+        """Test one change wakes every listener with one query"""
+        async def listen():
+            first = progress.broker.listen(self.pack.id)
+            second = progress.broker.listen(self.pack.id)
+            initial = [await first.__anext__(), await second.__anext__()]
+            await asyncio.sleep(0)
+            await sync_to_async(
+                Attempt.objects.filter(id=self.attempt.id).update
+            )(issubmitted=True)
+            progress.broker.publish(self.pack.id)
+            updated = [await first.__anext__(), await second.__anext__()]
+            await first.aclose()
+            await second.aclose()
+            return initial, updated
+
+        with self.assertNumQueries(5):
+            initial, updated = async_to_sync(listen)()
+
+        self.assertIs(initial[0], initial[1])
+        self.assertEqual(initial[0]['submitted'], 0)
+        self.assertIs(updated[0], updated[1])
+        self.assertEqual(updated[0]['submitted'], 1)
+
+    def test_submission_publishes_change(self):
+        """Test saving answers announces the pack change after commit"""
+        client = APIClient()
+        client.force_authenticate(self.examinee)
+        url = reverse('exam:attempt-answers', args=[self.attempt.id])
+
+        with patch.object(progress.broker, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                client.post(url, {'answers': [
+                    {'question': self.questions[2].id, 'choice': None},
+                ]}, format='json')
+
+        publish.assert_called_with(self.pack.id)
+
+    def test_stream_progress(self):
+        """Test proctors receive progress as server-sent events"""
+        admin = create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        token = Token.objects.create(user=admin)
+
+        messages = async_to_sync(request)(
+            self.path,
+            query=f'token={token.key}'.encode(),
+        )
+
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/event-stream'),
+            messages[0]['headers'],
+        )
+        event, data = messages[1]['body'].decode().strip().split('\n')
+        self.assertEqual(event, 'event: progress')
+        payload = json.loads(data[len('data: '):])
+        self.assertEqual(payload['attempts'][0]['answered'], 1)
+
+    def test_stream_requires_admin(self):
+        """Test examinees and anonymous users cannot listen"""
+        token = Token.objects.create(user=self.examinee)
+
+        anonymous = async_to_sync(request)(self.path)
+        examinee = async_to_sync(request)(
+            self.path,
+            headers=[(b'authorization', f'Token {token.key}'.encode())],
+        )
+
+        self.assertEqual(anonymous[0]['status'], 401)
+        self.assertEqual(examinee[0]['status'], 403)
+
+    def test_asgi_entrypoint_routes_stream(self):
+        """Test the served ASGI application routes the progress stream"""
+        from app.asgi import application
+
+        messages = async_to_sync(request)(self.path, app=application)
+
+        # Django itself has no URL for the stream and would answer 404
+        self.assertEqual(messages[0]['status'], 401)
+
+    def test_asgi_entrypoint_serves_only_the_stream(self):
+        """Test the rest of the API is left to the WSGI application"""
+        from app.asgi import application
+
+        messages = async_to_sync(request)(
+            reverse('question:question-export-bank'),
+            app=application,
+        )
+
+        self.assertEqual(messages[0]['status'], 404)
@@ -0,0 +1,22 @@
+"""
+URL mappings for the exam API
+"""
+from django.urls import (
+    path,
+    include,
+)
+
+from rest_framework.routers import DefaultRouter
+
+from exam import views
+
+
+router = DefaultRouter()
+router.register('pack', views.ExamPackViewSet)
+router.register('attempt', views.AttemptViewSet)
+
+app_name = 'exam'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
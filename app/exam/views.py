@@ -0,0 +1,283 @@
+"""
+Views for the exam API
+"""
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.functions import Length
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import (
+    mixins,
+    status,
+    viewsets,
+)
+from rest_framework.decorators import action
+from rest_framework.exceptions import (
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.idempotency import idempotent
+from core.jobs import enqueue
+from core.models import (
+    ExamPack,
+    Attempt,
+    ChoiceStatistic,
+    User,
+)
+from exam import (
+    jobs,
+    packs,
+    progress,
+    serializers,
+)
+from exam.answers import (
+    answer_values,
+    save_submission,
+)
+from exam.autosave import buffer
+from exam.grading import (
+    grade_attempt,
+    grade_pack,
+)
+from exam.pagination import ExamPackCursorPagination
+from user.authentication import CachedTokenAuthentication
+from user.permissions import IsAdminUser
+
+
+PACK_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+
+class ExamPackViewSet(mixins.CreateModelMixin,
+                      mixins.ListModelMixin,
+                      mixins.RetrieveModelMixin,
+                      mixins.DestroyModelMixin,
+                      viewsets.GenericViewSet):
+    """View for freezing and serving exam packs"""
+    serializer_class = serializers.ExamPackSerializer
+    queryset = ExamPack.objects.all()
+    lookup_value_regex = r'\d+'
+    pagination_class = ExamPackCursorPagination
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get_queryset(self):
+        """Retrieve exam packs without loading their content"""
+        # LENGTH of a bytea or blob is its size in bytes
+        return self.queryset.defer('content').annotate(
+            size=Length('content'),
+        ).order_by('-id')
+
+    def get_permissions(self):
+        """Let any authenticated user download pack content"""
+        if self.action == 'content':
+            return [IsAuthenticated()]
+
+        return super().get_permissions()
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create once per Idempotency-Key"""
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        """Freeze the selected questions into a new pack"""
+        data = serializer.validated_data
+        pack = packs.build_pack(
+            data['name'],
+            data['questions'],
+            compress=data['compress'],
+            user=self.request.user,
+        )
+        pack.size = len(pack.content)
+        serializer.instance = pack
+
+    def perform_destroy(self, instance):
+        pack_id = instance.id
+        instance.delete()
+        packs.forget_pack(pack_id)
+
+    @action(methods=['GET'], detail=True)
+    def content(self, request, pk=None):
+        """Serve the frozen pack with long-lived cache headers"""
+        entry = packs.get_pack_content(pk)
+        if entry is None:
+            raise Http404
+        content, content_encoding, etag = entry
+        etag = f'"{etag}"'
+
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            accepts = request.META.get('HTTP_ACCEPT_ENCODING', '')
+            if content_encoding and content_encoding not in accepts:
+                content = packs.decompress(content)
+                content_encoding = ''
+            response = HttpResponse(content, content_type='application/json')
+            if content_encoding:
+                response['Content-Encoding'] = content_encoding
+
+        response['ETag'] = etag
+        response['Cache-Control'] = PACK_CACHE_CONTROL
+        patch_vary_headers(response, ['Accept-Encoding'])
+
+        return response
+
+    @action(methods=['POST'], detail=True)
+    def grade(self, request, pk=None):
+        """Grade every submitted attempt of the pack"""
+        pack = self.get_object()
+        if request.query_params.get('background'):
+            job = enqueue(jobs.grade_pack, pack_id=pack.id)
+            return Response({'job': job.id}, status=status.HTTP_202_ACCEPTED)
+
+        graded = grade_pack(pack.id)
+
+        return Response({'graded': graded}, status=status.HTTP_200_OK)
+
+    @action(methods=['GET', 'POST'], detail=True)
+    def statistics(self, request, pk=None):
+        """List the item analysis of the pack, or queue its refresh"""
+        pack = self.get_object()
+        if request.method == 'POST':
+            job = enqueue(jobs.analyze_pack, pack_id=pack.id)
+            return Response({'job': job.id}, status=status.HTTP_202_ACCEPTED)
+
+        items = pack.item_statistics.order_by('question_id').prefetch_related(
+            Prefetch(
+                'choices',
+                ChoiceStatistic.objects.order_by('-count', 'choice_id'),
+            )
+        )
+        serializer = serializers.ItemStatisticSerializer(items, many=True)
+
+        return Response(serializer.data)
+
+
+class AttemptViewSet(mixins.CreateModelMixin,
+                     mixins.ListModelMixin,
+                     mixins.RetrieveModelMixin,
+                     viewsets.GenericViewSet):
+    """View for exam attempts and their answers"""
+    serializer_class = serializers.AttemptSerializer
+    queryset = Attempt.objects.all()
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Retrieve the attempts of the authenticated examinee"""
+        queryset = self.queryset.order_by('-id')
+        if self.request.user.role == User.ADMIN:
+            return queryset
+
+        return queryset.filter(examinee=self.request.user)
+
+    def get_permissions(self):
+        """Only let admins grade attempts"""
+        if self.action == 'grade':
+            return [IsAuthenticated(), IsAdminUser()]
+
+        return super().get_permissions()
+
+    def get_serializer_class(self):
+        """Return the serializer class for request"""
+        if self.action == 'answers':
+            return serializers.AnswerSubmissionSerializer
+        if self.action == 'autosave':
+            return serializers.AnswerAutosaveSerializer
+
+        return self.serializer_class
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create once per Idempotency-Key"""
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        """Start an attempt for the authenticated examinee"""
+        attempt = serializer.save(examinee=self.request.user)
+        progress.changed(attempt.exam_pack_id)
+
+    @action(methods=['GET', 'POST'], detail=True)
+    @idempotent
+    def answers(self, request, pk=None):
+        """List or bulk submit the answers of an attempt"""
+        attempt = self.get_object()
+        if request.method == 'GET':
+            return Response(list(
+                attempt.answers.order_by('question_id').values(
+                    'question',
+                    'choice',
+                    'examinee_answer',
+                    'isbookmarked',
+                    'issubmitted',
+                )
+            ))
+
+        if attempt.examinee_id != request.user.id:
+            raise PermissionDenied('Only the examinee can submit answers.')
+
+        with transaction.atomic():
+            attempt = Attempt.objects.select_for_update().get(id=attempt.id)
+            if attempt.issubmitted:
+                raise ValidationError('This attempt is already submitted.')
+
+            serializer = self.get_serializer(
+                data=request.data,
+                context={'request': request, 'attempt': attempt},
+            )
+            serializer.is_valid(raise_exception=True)
+            if serializer.validated_data['submit']:
+                buffer.flush(attempt.id)
+            saved = save_submission(
+                attempt,
+                serializer.validated_data['answers'],
+                submit=serializer.validated_data['submit'],
+            )
+
+        return Response(
+            {'saved': saved, 'issubmitted': attempt.issubmitted},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(methods=['POST'], detail=True)
+    def grade(self, request, pk=None):
+        """Grade a submitted attempt"""
+        attempt = self.get_object()
+        if not attempt.issubmitted:
+            raise ValidationError('This attempt is not submitted yet.')
+        grade_attempt(attempt)
+        serializer = serializers.AttemptSerializer(attempt)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=['POST'], detail=True)
+    def autosave(self, request, pk=None):
+        """Buffer answer changes to be written in the background"""
+        attempt = self.get_object()
+        if attempt.examinee_id != request.user.id:
+            raise PermissionDenied('Only the examinee can save answers.')
+        if attempt.issubmitted:
+            raise ValidationError('This attempt is already submitted.')
+
+        serializer = self.get_serializer(
+            data=request.data,
+            context={'request': request, 'attempt': attempt},
+        )
+        serializer.is_valid(raise_exception=True)
+        answers = serializer.validated_data['answers']
+        buffer.add(attempt.id, {
+            answer['question']: answer_values(answer) for answer in answers
+        })
+
+        return Response(
+            {'buffered': len(answers)},
+            status=status.HTTP_202_ACCEPTED,
+        )
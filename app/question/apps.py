@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class QuestionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'question'
+
+    def ready(self):
+        from question import signals  # noqa: F401
@@ -0,0 +1,118 @@
+"""
+Versioned response cache for the Question API
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import (
+    HttpResponse,
+    HttpResponseNotModified,
+)
+from django.utils.http import parse_etags
+from rest_framework import status
+
+
+REVISION_KEY = 'question:revision'
+
+
+def get_revision():
+    """Return the current question bank revision"""
+    revision = cache.get(REVISION_KEY)
+    if revision is None:
+        # Start from the clock so a lost counter never reuses old keys
+        cache.add(REVISION_KEY, int(time.time() * 1000), timeout=None)
+        revision = cache.get(REVISION_KEY)
+    return revision
+
+
+def _incr_revision():
+    try:
+        cache.incr(REVISION_KEY)
+    except ValueError:
+        get_revision()
+
+
+def bump_revision():
+    """
+    Invalidate every cached question and choice response.
+
+    The counter is bumped immediately and again once the transaction
+    commits, so a response cached from data read before the commit is
+    not served afterwards.
+    """
+    _incr_revision()
+    transaction.on_commit(_incr_revision)
+
+
+class CachedResponseMixin:
+    """
+    Serve list and detail responses from the cache.
+
+    Rendered bodies are stored under the bank revision, so any write
+    bumps every view onto fresh keys. Responses carry an ETag and a
+    matching If-None-Match is answered with 304 Not Modified.
+    """
+    cache_timeout = settings.QUESTION_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs
+        )
+
+    def get_cache_key(self, request):
+        """Return the cache key for a request at the current revision"""
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return ':'.join([
+            'question',
+            str(get_revision()),
+            self.basename,
+            request.accepted_media_type,
+            path,
+        ])
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return the cached response for a request, rendering on a miss"""
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        response = None
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            response = self.finalize_response(
+                request,
+                response,
+                *args,
+                **kwargs
+            )
+            response.render()
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': '"%s"' % hashlib.md5(response.content).hexdigest(),
+            }
+            cache.set(key, entry, self.cache_timeout)
+
+        if entry['etag'] in parse_etags(
+            request.META.get('HTTP_IF_NONE_MATCH', '')
+        ):
+            response = HttpResponseNotModified()
+        elif response is None:
+            response = HttpResponse(
+                entry['content'],
+                content_type=entry['content_type'],
+            )
+        response['ETag'] = entry['etag']
+        response['Cache-Control'] = 'private, no-cache'
+
+        return response
@@ -0,0 +1,100 @@
+"""
+Streaming question bank export
+"""
+import csv
+import io
+import json
+
+from core.models import Question
+from core.streaming import (
+    content_type,
+    download_filename,
+    encode,
+)
+from question.importer import (
+    FORMATS,
+    join_choices,
+)
+from question.serializers import (
+    QUESTION_FIELDS,
+    question_data,
+)
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_questions(chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield every question in the import format, oldest first.
+
+    Questions are read in keyset chunks of `chunk_size` by id, with one
+    query for the questions and answers and one for the choices of each
+    chunk, so memory use does not grow with the size of the bank.
+    """
+    last_id = 0
+    while True:
+        rows = list(
+            Question.objects.filter(id__gt=last_id).order_by('id').values(
+                *QUESTION_FIELDS
+            )[:chunk_size]
+        )
+        if not rows:
+            return
+
+        last_id = rows[-1]['id']
+        yield from question_data(rows)
+
+
+def jsonl_lines(questions):
+    """Yield questions as JSON lines"""
+    for question in questions:
+        yield json.dumps(question) + '\n'
+
+
+def csv_lines(questions):
+    """Yield questions as CSV lines readable by the importer"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    yield line(['question', 'answer', 'choices'])
+    for question in questions:
+        yield line([
+            question['question'],
+            question['answer']['choice'],
+            join_choices(
+                choice['choice'] for choice in question['choices']
+            ),
+        ])
+
+
+def export_questions(file_format='jsonl', compress=False,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return an iterator of encoded blocks for the whole bank"""
+    if file_format not in FORMATS:
+        raise ValueError(f'Unsupported export format: {file_format}')
+
+    questions = iter_questions(chunk_size=chunk_size)
+    if file_format == 'csv':
+        lines = csv_lines(questions)
+    else:
+        lines = jsonl_lines(questions)
+
+    return encode(lines, compress=compress)
+
+
+def export_filename(file_format, compress=False):
+    """Return the download file name for an export"""
+    return download_filename('questions', file_format, compress)
+
+
+def export_content_type(file_format, compress=False):
+    """Return the content type for an export"""
+    return content_type(file_format, compress)
@@ -0,0 +1,256 @@
+"""
+Bulk question bank import
+"""
+import csv
+import json
+from itertools import islice
+
+from django.db import (
+    connection,
+    transaction,
+    DatabaseError,
+)
+
+from core.models import (
+    Question,
+    Choice,
+)
+from question.cache import bump_revision
+from question.serializers import QuestionImportSerializer
+
+
+DEFAULT_CHUNK_SIZE = 1000
+CSV_CHOICE_SEPARATOR = '|'
+FORMATS = ('csv', 'jsonl')
+
+
+class ImportResult:
+    """Outcome of a question bank import"""
+
+    def __init__(self, max_errors=1000):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, row, errors):
+        """Record a row that could not be imported"""
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def to_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+
+
+def guess_format(filename):
+    """Return the import format implied by a file name"""
+    for file_format in FORMATS:
+        if filename.lower().endswith(f'.{file_format}'):
+            return file_format
+    return None
+
+
+def read_jsonl(stream):
+    """Yield (row number, row) from a JSON lines stream"""
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+
+
+def join_choices(texts):
+    """Return choice texts as a CSV `choices` cell"""
+    return json.dumps(list(texts), ensure_ascii=False)
+
+
+def split_choices(cell):
+    """
+    Return the choice texts in a CSV `choices` cell.
+
+    Exported cells hold a JSON list, so choices may contain `|`.
+    Anything else is read as choices separated by `|`.
+    """
+    if cell.startswith('['):
+        try:
+            texts = json.loads(cell)
+        except ValueError:
+            pass
+        else:
+            if isinstance(texts, list):
+                return texts
+    return [text for text in cell.split(CSV_CHOICE_SEPARATOR) if text]
+
+
+def read_csv(stream):
+    """
+    Yield (row number, row) from a CSV stream.
+
+    Expects `question`, `answer` and `choices` columns, where choices
+    are a JSON list or separated by `|`.
+    """
+    reader = csv.DictReader(stream)
+    for number, record in enumerate(reader, start=2):
+        yield number, {
+            'question': record.get('question'),
+            'answer': {'choice': record.get('answer')},
+            'choices': [
+                {'choice': choice}
+                for choice in split_choices(record.get('choices') or '')
+            ],
+        }
+
+
+def read_rows(stream, file_format):
+    """Yield (row number, row) from a text stream in the given format"""
+    if file_format == 'csv':
+        return _until_unreadable(read_csv(stream))
+    if file_format == 'jsonl':
+        return _until_unreadable(read_jsonl(stream))
+    raise ValueError(f'Unsupported import format: {file_format}')
+
+
+def _until_unreadable(rows):
+    """
+    Yield rows until the stream cannot be decoded or parsed any further.
+
+    The failure is reported as an error on the row after the last one
+    read, so rows already imported stay imported and the caller still
+    gets a result instead of an exception.
+    """
+    number = 0
+    try:
+        for number, row in rows:
+            yield number, row
+    except UnicodeDecodeError:
+        yield number + 1, ValueError('The file is not UTF-8 encoded.')
+    except csv.Error as exc:
+        yield number + 1, ValueError(f'Malformed CSV: {exc}')
+
+
+def _create_questions(rows):
+    """Create the questions in `rows` and return them in order"""
+    questions = [
+        Question(question=row['question'], answer_id=row['answer_id'])
+        for row in rows
+    ]
+    if connection.features.can_return_rows_from_bulk_insert:
+        return Question.objects.bulk_create(questions)
+
+    # Backends that cannot return primary keys from a bulk insert
+    for question in questions:
+        question.save()
+    return questions
+
+
+def _validate_chunk(chunk):
+    """Split a chunk into cleaned rows and (row number, errors) pairs"""
+    rows = []
+    errors = []
+    for number, data in chunk:
+        if isinstance(data, Exception):
+            errors.append((number, {'non_field_errors': [str(data)]}))
+            continue
+        serializer = QuestionImportSerializer(data=data)
+        if not serializer.is_valid():
+            errors.append((number, serializer.errors))
+            continue
+        row = serializer.validated_data
+        # Texts that normalize to the same key resolve to one choice
+        choices = {}
+        for choice in row.get('choices', []):
+            choices.setdefault(Choice.normalize(choice['choice']),
+                               choice['choice'])
+        rows.append({
+            'number': number,
+            'question': row['question'],
+            'answer': row['answer']['choice'],
+            'choices': list(choices.values()),
+        })
+
+    return rows, errors
+
+
+def _store_rows(rows):
+    """Create the questions and choice links for cleaned rows"""
+    texts = set()
+    for row in rows:
+        texts.add(row['answer'])
+        texts.update(row['choices'])
+
+    with transaction.atomic():
+        choice_ids = {
+            text: choice.id
+            for text, choice in Choice.objects.resolve(texts).items()
+        }
+        for row in rows:
+            row['answer_id'] = choice_ids[row['answer']]
+        questions = _create_questions(rows)
+
+        Through = Question.choices.through
+        Through.objects.bulk_create([
+            Through(question_id=question.id, choice_id=choice_ids[text])
+            for question, row in zip(questions, rows)
+            for text in row['choices']
+        ])
+
+    return len(questions)
+
+
+def _store_chunk(rows, result):
+    """
+    Store a chunk of cleaned rows and return the number created.
+
+    The chunk goes in with one transaction. If the database rejects it,
+    the rows are stored one by one instead, each in its own transaction,
+    and only the rejected ones are reported.
+    """
+    try:
+        return _store_rows(rows)
+    except DatabaseError:
+        pass
+
+    created = 0
+    for row in rows:
+        try:
+            created += _store_rows([row])
+        except DatabaseError as exc:
+            result.add_error(row['number'], {'non_field_errors': [str(exc)]})
+    return created
+
+
+def import_questions(rows, chunk_size=DEFAULT_CHUNK_SIZE, max_errors=1000):
+    """
+    Import (row number, row) pairs into the question bank.
+
+    Rows are validated one by one, then stored in chunks of `chunk_size`
+    with one transaction per chunk. Invalid rows, and rows the database
+    rejects, are reported in the result without stopping the import.
+    """
+    result = ImportResult(max_errors=max_errors)
+    pairs = iter(rows)
+
+    while True:
+        chunk = list(islice(pairs, chunk_size))
+        if not chunk:
+            break
+        cleaned, errors = _validate_chunk(chunk)
+        for number, row_errors in errors:
+            result.add_error(number, row_errors)
+        if not cleaned:
+            continue
+
+        result.created += _store_chunk(cleaned, result)
+
+    # Bulk inserts do not send model signals
+    if result.created:
+        bump_revision()
+
+    return result
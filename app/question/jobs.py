@@ -0,0 +1,13 @@
+"""
+Background jobs for the question bank
+"""
+from core.jobs import job
+from question import maintenance
+
+
+@job()
+def prune_choices(batch_size=maintenance.DEFAULT_BATCH_SIZE):
+    """Delete choices no question or answer uses"""
+    return {
+        'deleted': maintenance.prune_orphaned_choices(batch_size=batch_size),
+    }
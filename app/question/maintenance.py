@@ -0,0 +1,89 @@
+"""
+Maintenance tasks for the question bank
+"""
+import time
+
+from django.db import transaction
+from django.db.models import (
+    Exists,
+    OuterRef,
+)
+
+from core.models import (
+    Question,
+    Choice,
+    Examinee_Answer,
+    ChoiceStatistic,
+)
+from question.cache import bump_revision
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def orphaned_choices():
+    """
+    Return choices nothing refers to.
+
+    Picked choices are kept: deleting one would null out the choice
+    recorded on every stored answer that picked it. Choices counted in
+    item statistics are kept as well.
+    """
+    return Choice.objects.filter(
+        ~Exists(
+            Question.choices.through.objects.filter(choice_id=OuterRef('pk'))
+        ),
+        ~Exists(Question.objects.filter(answer_id=OuterRef('pk'))),
+        ~Exists(Examinee_Answer.objects.filter(choice_id=OuterRef('pk'))),
+        ~Exists(ChoiceStatistic.objects.filter(choice_id=OuterRef('pk'))),
+    )
+
+
+def prune_orphaned_choices(batch_size=DEFAULT_BATCH_SIZE, max_batches=None,
+                           dry_run=False, pause=0):
+    """
+    Delete unreferenced choices in batches and return how many went.
+
+    Candidates are found with anti-joins walking the id index. Each
+    batch is locked, re-checked and deleted with a single statement in
+    its own short transaction; rows locked by concurrent writers are
+    skipped and picked up by a later run. The bank revision is bumped
+    once per batch.
+    """
+    last_id = 0
+    batches = 0
+    reclaimed = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(
+            orphaned_choices().filter(id__gt=last_id).order_by(
+                'id'
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+        batches += 1
+
+        if dry_run:
+            reclaimed += len(ids)
+            continue
+
+        with transaction.atomic():
+            locked = list(
+                orphaned_choices().filter(id__in=ids).select_for_update(
+                    skip_locked=True
+                ).values_list('id', flat=True)
+            )
+            if locked:
+                # Orphans have no referrers, so there is nothing to
+                # cascade and no per-row signal is needed
+                Choice.objects.filter(id__in=locked)._raw_delete(
+                    Choice.objects.db
+                )
+                bump_revision()
+        reclaimed += len(locked)
+
+        if pause:
+            time.sleep(pause)
+
+    return reclaimed
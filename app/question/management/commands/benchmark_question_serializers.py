@@ -0,0 +1,101 @@
+"""
+Django command to compare the question list serialization paths
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+
+from core.models import (
+    Question,
+    Choice,
+)
+from question import importer
+from question.serializers import (
+    QUESTION_FIELDS,
+    QuestionSerializer,
+    question_data,
+)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark QuestionSerializer against rows."""
+
+    help = (
+        'Time QuestionSerializer and the values() fast path on a '
+        'temporary bank. The sample data is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=10000)
+        parser.add_argument('--choices', type=int, default=4)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        with transaction.atomic():
+            self._create_bank(options['questions'], options['choices'])
+            ids = list(
+                Question.objects.order_by('-id').values_list('id', flat=True)
+                [:options['questions']]
+            )
+
+            serializer_time = self._best_of(options['repeat'], lambda: (
+                QuestionSerializer(
+                    Question.objects.filter(id__in=ids).order_by(
+                        '-id'
+                    ).select_related('answer').prefetch_related(
+                        Prefetch(
+                            'choices',
+                            queryset=Choice.objects.order_by('id'),
+                        )
+                    ),
+                    many=True,
+                ).data
+            ))
+            rows_time = self._best_of(options['repeat'], lambda: (
+                question_data(
+                    Question.objects.filter(id__in=ids).order_by(
+                        '-id'
+                    ).values(*QUESTION_FIELDS)
+                )
+            ))
+
+            transaction.set_rollback(True)
+
+        count = len(ids)
+        self.stdout.write(
+            f'QuestionSerializer: {serializer_time:.3f}s '
+            f'({count / serializer_time:,.0f} questions/s)'
+        )
+        self.stdout.write(
+            f'values() fast path: {rows_time:.3f}s '
+            f'({count / rows_time:,.0f} questions/s)'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Fast path speedup: {serializer_time / rows_time:.1f}x'
+        ))
+
+    def _create_bank(self, questions, choices):
+        rows = (
+            (number, {
+                'question': f'Benchmark question {number}?',
+                'answer': {'choice': f'Benchmark answer {number % 100}'},
+                'choices': [
+                    {'choice': f'Benchmark answer {(number + i) % 100}'}
+                    for i in range(choices)
+                ],
+            })
+            for number in range(questions)
+        )
+        importer.import_questions(rows)
+
+    def _best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,63 @@
+"""
+Django command to export the question bank
+"""
+import sys
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from question import (
+    exporter,
+    importer,
+)
+
+
+class Command(BaseCommand):
+    """Django command to stream the question bank to a file."""
+
+    help = 'Export every question as JSONL or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=importer.FORMATS,
+            default='jsonl',
+            dest='file_format',
+        )
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument(
+            '--output',
+            help='File to write to, defaults to stdout.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=exporter.DEFAULT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        blocks = exporter.export_questions(
+            options['file_format'],
+            compress=options['gzip'],
+            chunk_size=options['chunk_size'],
+        )
+
+        if not options['output']:
+            self._write(sys.stdout.buffer, blocks)
+            return
+
+        try:
+            with open(options['output'], 'wb') as output:
+                self._write(output, blocks)
+        except OSError as exc:
+            raise CommandError(exc)
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported question bank to {options['output']}"
+        ))
+
+    def _write(self, output, blocks):
+        for block in blocks:
+            output.write(block)
@@ -0,0 +1,58 @@
+"""
+Django command to bulk import a question bank
+"""
+import sys
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from question import importer
+
+
+class Command(BaseCommand):
+    """Django command to import questions from a CSV or JSONL file."""
+
+    help = 'Import questions from a CSV or JSONL file ("-" for stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format',
+            choices=importer.FORMATS,
+            dest='file_format',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=importer.DEFAULT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        path = options['path']
+        file_format = options['file_format'] or importer.guess_format(path)
+        if file_format is None:
+            raise CommandError('Could not detect the format, use --format.')
+
+        if path == '-':
+            result = self._import(sys.stdin, file_format, options)
+        else:
+            try:
+                with open(path, encoding='utf-8', newline='') as stream:
+                    result = self._import(stream, file_format, options)
+            except OSError as exc:
+                raise CommandError(exc)
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} questions, {result.failed} failed.'
+        ))
+
+    def _import(self, stream, file_format, options):
+        return importer.import_questions(
+            importer.read_rows(stream, file_format),
+            chunk_size=options['chunk_size'],
+        )
@@ -0,0 +1,56 @@
+"""
+Django command to delete choices no question uses
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from question import maintenance
+
+
+class Command(BaseCommand):
+    """Django command to garbage collect orphaned choices."""
+
+    help = 'Delete choices that are not used by any question.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=maintenance.DEFAULT_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Stop after this many batches.',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Keep running, pruning again every INTERVAL seconds.',
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        while True:
+            reclaimed = maintenance.prune_orphaned_choices(
+                batch_size=options['batch_size'],
+                max_batches=options['max_batches'],
+                dry_run=options['dry_run'],
+                pause=options['pause'],
+            )
+            verb = 'Would delete' if options['dry_run'] else 'Deleted'
+            self.stdout.write(self.style.SUCCESS(
+                f'{verb} {reclaimed} orphaned choices.'
+            ))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
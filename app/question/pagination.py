@@ -0,0 +1,41 @@
+"""
+Pagination for the Question API
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+from question.search import get_search_term
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the newest-first `-id` ordering.
+
+    Each page is fetched with `WHERE id < <cursor>` against the primary
+    key index, so deep pages cost the same as the first one.
+    """
+    ordering = '-id'
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class QuestionCursorPagination(IdCursorPagination):
+    """
+    Cursor pagination that returns ranked search results as one page.
+
+    Search results are ordered by relevance rather than id, so only the
+    best `page_size` matches are returned, without cursors.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if get_search_term(request) is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.has_next = False
+        self.has_previous = False
+        self.page = list(queryset[:self.page_size])
+
+        return self.page
@@ -0,0 +1,62 @@
+"""
+Uniform random sampling of questions
+"""
+import random
+
+from django.db.models import (
+    Max,
+    Min,
+)
+
+from core.models import Question
+
+
+MAX_ROUNDS = 8
+MAX_DRAWS = 10000
+MIN_HIT_RATE = 1 / 64
+
+
+def sample_question_ids(count, seed=None):
+    """
+    Return up to `count` distinct question ids drawn uniformly at random.
+
+    Ids are drawn uniformly between the smallest and largest id and kept
+    if the question exists, which is uniform over the existing rows and
+    costs a few primary key lookups whatever the size of the bank. If
+    the id range is too sparse for that to converge, the ids are listed
+    and sampled directly. The same seed gives the same sample for an
+    unchanged bank.
+    """
+    rng = random.Random(seed)
+    bounds = Question.objects.aggregate(low=Min('id'), high=Max('id'))
+    low, high = bounds['low'], bounds['high']
+    if low is None:
+        return []
+
+    chosen = []
+    chosen_set = set()
+    missing = set()
+    hit_rate = 0.5
+    for _ in range(MAX_ROUNDS):
+        needed = count - len(chosen)
+        draws = min(int(needed / max(hit_rate, MIN_HIT_RATE)) + 1, MAX_DRAWS)
+        drawn = [rng.randint(low, high) for _ in range(draws)]
+        candidates = set(drawn) - chosen_set - missing
+        found = set(
+            Question.objects.filter(id__in=candidates).values_list(
+                'id',
+                flat=True,
+            )
+        )
+        missing.update(candidates - found)
+        hit_rate = len(found) / len(drawn)
+
+        for question_id in drawn:
+            if question_id in found and question_id not in chosen_set:
+                chosen.append(question_id)
+                chosen_set.add(question_id)
+                if len(chosen) == count:
+                    return chosen
+
+    ids = list(Question.objects.order_by('id').values_list('id', flat=True))
+    return rng.sample(ids, min(count, len(ids)))
@@ -0,0 +1,65 @@
+"""
+Ranked search over questions
+"""
+from django.db import connection
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+
+SEARCH_PARAM = 'search'
+SEARCH_CONFIG = 'english'
+
+
+def get_search_term(request):
+    """Return the search term of a request, or None"""
+    term = request.query_params.get(SEARCH_PARAM, '').strip()
+    return term[:255] or None
+
+
+def _search_postgresql(queryset, term):
+    """
+    Match full-text or trigram similarity, best matches first.
+
+    Both conditions are served by the GIN indexes created in
+    core.0021_question_search_indexes.
+    """
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+        TrigramSimilarity,
+    )
+
+    vector = SearchVector('question', config=SEARCH_CONFIG)
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.alias(
+        search=vector,
+        rank=SearchRank(vector, query),
+        similarity=TrigramSimilarity('question', term),
+    ).filter(
+        Q(search=query) | Q(question__trigram_similar=term)
+    ).order_by('-rank', '-similarity', '-id')
+
+
+def _search_fallback(queryset, term):
+    """Match every word of the term anywhere in the question"""
+    for word in term.split():
+        queryset = queryset.filter(question__icontains=word)
+    return queryset.order_by('-id')
+
+
+def search_questions(queryset, term):
+    """Return the questions matching `term`, best matches first"""
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(queryset, term)
+    return _search_fallback(queryset, term)
+
+
+class QuestionSearchFilter(BaseFilterBackend):
+    """Filter questions with the `search` query parameter"""
+
+    def filter_queryset(self, request, queryset, view):
+        term = get_search_term(request)
+        if term is None:
+            return queryset
+        return search_questions(queryset, term)
@@ -1,3 +1,7 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from core.models import (
     Question,
@@ -5,6 +9,10 @@ from core.models import (
     )
 
 
+QUESTION_FIELDS = ('id', 'question', 'answer_id', 'answer__choice')
+CHOICE_FIELDS = ('id', 'choice')
+
+
 class ChoiceSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -12,30 +20,53 @@ class ChoiceSerializer(serializers.ModelSerializer):
         fields = ('id', 'choice')
         read_only_fields = ['id']
 
+    def validate_choice(self, value):
+        """Reject text that normalizes to an existing choice"""
+        existing = Choice.objects.filter(key=Choice.normalize(value))
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
+            raise serializers.ValidationError(
+                'A choice with this text already exists.'
+            )
+
+        return value
+
+
+class QuestionChoiceSerializer(ChoiceSerializer):
+    """Serializer for choices referenced by text from a question"""
+
+    def validate_choice(self, value):
+        """Existing choices are shared between questions"""
+        return value
+
 
 class QuestionSerializer(serializers.ModelSerializer):
-    choices = ChoiceSerializer(many=True, required=False)
-    answer = ChoiceSerializer(required=True)
+    choices = QuestionChoiceSerializer(many=True, required=False)
+    answer = QuestionChoiceSerializer(required=True)
 
     class Meta:
         model = Question
         fields = ['id', 'question', 'answer', 'choices']
         read_only_fields = ['id']
 
-    def _get_or_create_choices(self, choices, question):
-        """Handle getting or creating choices as needed"""
-        choice_objects = []
+    def _resolve_choices(self, answer_data, choices_data):
+        """Get or create the answer and choices in one batch"""
+        texts = [choice['choice'] for choice in choices_data]
+        if answer_data is not None:
+            texts.insert(0, answer_data['choice'])
+        resolved = Choice.objects.resolve(texts)
 
-        # Clear existing choices
-        question.choices.clear()
+        answer = None
+        if answer_data is not None:
+            answer = resolved[answer_data['choice']]
 
-        for choice in choices:
-            choice_obj, created = Choice.objects.get_or_create(
-                choice=choice['choice'],
-            )
-            choice_objects.append(choice_obj)
+        return answer, [
+            resolved[choice['choice']] for choice in choices_data
+        ]
 
-        # Set the choices for the question
+    def _set_choices(self, choice_objects, question):
+        """Add and remove only the choices that changed"""
         question.choices.set(choice_objects)
 
         return choice_objects
@@ -44,49 +75,123 @@ class QuestionSerializer(serializers.ModelSerializer):
         choices_data = validated_data.pop('choices', [])
         answer_data = validated_data.pop('answer')
 
-        # Create question with answer
-        answer_instance, _ = Choice.objects.get_or_create(**answer_data)
-        question = Question.objects.create(
-            answer=answer_instance,
-            **validated_data
+        # Resolve and link in one transaction so pruning cannot race it
+        with transaction.atomic(savepoint=False):
+            # Create question with answer
+            answer_instance, choice_objects = self._resolve_choices(
+                answer_data,
+                choices_data,
             )
+            question = Question.objects.create(
+                answer=answer_instance,
+                **validated_data
+                )
 
-        # Associate choices with the question
-        self._get_or_create_choices(choices_data, question)
+            # Associate choices with the question
+            self._set_choices(choice_objects, question)
 
         return question
 
     def update(self, instance, validated_data):
         instance.question = validated_data.get('question', instance.question)
 
-        # Check if 'answer' is present in the validated data
-        if 'answer' in validated_data:
-            answer_data = validated_data.pop('answer')
-            existing_answer_instance = instance.answer
-            new_choice = answer_data.get('choice')
-
-            # Check if there is an existing answer with the same choice
-            if (
-                existing_answer_instance
-                and
-                existing_answer_instance.choice == new_choice
-            ):
-                # Use the existing answer
-                answer_instance = existing_answer_instance
-            else:
-                # Create a new answer
-                answer_instance, _ = Choice.objects.get_or_create(
-                    choice=new_choice
-                    )
+        answer_data = validated_data.pop('answer', None)
+        choices_data = validated_data.get('choices')
+        with transaction.atomic(savepoint=False):
+            answer_instance, choice_objects = self._resolve_choices(
+                answer_data,
+                choices_data or [],
+            )
+
+            # Check if 'answer' is present in the validated data
+            if answer_instance is not None:
                 instance.answer = answer_instance
 
-        # Check if 'choices' is present in the validated data
-        choices_data = validated_data.get('choices', [])
-        if choices_data:
-            self._get_or_create_choices(choices_data, instance)
-        else:
-            # If 'choices' is not present, clear existing choices
-            instance.choices.clear()
+            # Leave the choices untouched when 'choices' is omitted
+            if choices_data is not None:
+                self._set_choices(choice_objects, instance)
+
+            instance.save()
 
-        instance.save()
         return instance
+
+
+def question_data(rows):
+    """
+    Build QuestionSerializer output from `values(*QUESTION_FIELDS)` rows.
+
+    This is the read-only fast path for listing questions: the choices
+    of every row are fetched in one query and the output is assembled
+    from plain dicts, without a serializer per object.
+    """
+    rows = list(rows)
+    choices = defaultdict(list)
+    if rows:
+        for question_id, choice_id, choice in (
+            Question.choices.through.objects.filter(
+                question_id__in=[row['id'] for row in rows]
+            ).order_by('choice_id').values_list(
+                'question_id',
+                'choice_id',
+                'choice__choice',
+            )
+        ):
+            choices[question_id].append({'id': choice_id, 'choice': choice})
+
+    return [
+        {
+            'id': row['id'],
+            'question': row['question'],
+            'answer': {
+                'id': row['answer_id'],
+                'choice': row['answer__choice'],
+            },
+            'choices': choices[row['id']],
+        }
+        for row in rows
+    ]
+
+
+def choice_data(rows):
+    """Build ChoiceSerializer output from `values(*CHOICE_FIELDS)` rows"""
+    return list(rows)
+
+
+class ImportChoiceSerializer(serializers.Serializer):
+    """Serializer for a choice in a question bank import row"""
+    choice = serializers.CharField(max_length=255)
+
+
+class QuestionImportSerializer(serializers.Serializer):
+    """Validate a single row of a question bank import"""
+    question = serializers.CharField(max_length=255)
+    answer = ImportChoiceSerializer()
+    choices = ImportChoiceSerializer(many=True, required=False)
+
+
+class QuestionImportFileSerializer(serializers.Serializer):
+    """Serializer for uploading a question bank file"""
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=['csv', 'jsonl'],
+        required=False,
+    )
+
+
+class QuestionExportSerializer(serializers.Serializer):
+    """Serializer for question bank export options"""
+    file_format = serializers.ChoiceField(
+        choices=['csv', 'jsonl'],
+        default='jsonl',
+    )
+    gzip = serializers.BooleanField(default=False)
+
+
+class QuestionSampleSerializer(serializers.Serializer):
+    """Serializer for random question sampling options"""
+    count = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.API_MAX_PAGE_SIZE,
+        default=10,
+    )
+    seed = serializers.CharField(max_length=64, required=False)
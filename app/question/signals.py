@@ -0,0 +1,31 @@
+"""
+Signal handlers for the Question API
+"""
+from django.db.models.signals import (
+    post_save,
+    post_delete,
+    m2m_changed,
+)
+from django.dispatch import receiver
+
+from core.models import (
+    Question,
+    Choice,
+)
+from question.cache import bump_revision
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=Choice)
+def question_bank_changed(sender, **kwargs):
+    """Invalidate cached responses when a question or choice changes"""
+    bump_revision()
+
+
+@receiver(m2m_changed, sender=Question.choices.through)
+def question_choices_changed(sender, action, **kwargs):
+    """Invalidate cached responses when question choices change"""
+    if action.startswith('post_'):
+        bump_revision()
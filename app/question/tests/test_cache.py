@@ -0,0 +1,152 @@
+"""
+Tests for the Question API response cache
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import (
+    cache,
+    caches,
+)
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+)
+from question.cache import (
+    bump_revision,
+    get_revision,
+)
+
+
+QUESTION_URL = reverse('question:question-list')
+CHOICE_URL = reverse('question:choice-list')
+
+
+def detail_url(question_id):
+    """Create and return a question detail URL"""
+    return reverse('question:question-detail', args=[question_id])
+
+
+def create_question(text='Sample question?', answer='Yes'):
+    """Create and return a sample question"""
+    answer = Choice.objects.create(choice=answer)
+    return Question.objects.create(question=text, answer=answer)
+
+
+class CachedQuestionAPITests(TestCase):
+    """Test cached question and choice responses"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list request does not query the database"""
+        create_question()
+        first = self.client.get(QUESTION_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(QUESTION_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_detail_not_modified(self):
+        """Test a matching If-None-Match returns 304"""
+        question = create_question()
+        res = self.client.get(detail_url(question.id))
+
+        res = self.client.get(
+            detail_url(question.id),
+            HTTP_IF_NONE_MATCH=res['ETag'],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+    def test_write_invalidates_cache(self):
+        """Test creating a question bumps the revision"""
+        self.client.get(QUESTION_URL)
+        revision = get_revision()
+        payload = {
+            'question': 'New question?',
+            'answer': {'choice': 'Yes'},
+            'choices': [{'choice': 'Yes'}, {'choice': 'No'}],
+        }
+
+        self.client.post(QUESTION_URL, payload, format='json')
+        res = self.client.get(QUESTION_URL)
+
+        self.assertGreater(get_revision(), revision)
+        self.assertEqual(len(res.json()['results']), 1)
+
+    def test_choice_delete_invalidates_cache(self):
+        """Test deleting a choice refreshes the choice list"""
+        choice = Choice.objects.create(choice='Yes')
+        etag = self.client.get(CHOICE_URL)['ETag']
+
+        self.client.delete(reverse('question:choice-detail', args=[choice.id]))
+        res = self.client.get(CHOICE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['results'], [])
+
+    def test_local_memory_cache(self):
+        """Test responses can be cached in process memory"""
+        create_question()
+        caches = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        }
+        with override_settings(CACHES=caches):
+            first = self.client.get(QUESTION_URL)
+            with self.assertNumQueries(0):
+                second = self.client.get(QUESTION_URL)
+
+        self.assertEqual(second.content, first.content)
+
+
+class SharedRevisionTests(TestCase):
+    """Test the bank revision is shared with other processes"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_bump_from_separate_cache_instance(self):
+        """Test a bump made through another connection refreshes lists"""
+        question = create_question()
+        self.client.get(QUESTION_URL)
+        # Like an import or job worker: no signals, its own connection
+        Question.objects.filter(id=question.id).update(question='Renamed?')
+        other = caches.create_connection('default')
+
+        with patch('question.cache.cache', other):
+            with self.captureOnCommitCallbacks(execute=True):
+                bump_revision()
+        res = self.client.get(QUESTION_URL)
+
+        self.assertEqual(res.json()['results'][0]['question'], 'Renamed?')
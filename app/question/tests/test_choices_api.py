@@ -86,10 +86,30 @@ class PrivateChoiceAPITests(TestCase):
         # Ensure that the choice is created with the correct data
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
+    def test_create_duplicate_choice(self):
+        """Test creating a choice with existing text fails"""
+        create_choice(choice='Yes')
+
+        res = self.client.post(CHOICE_URL, {'choice': ' Yes '})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Choice.objects.count(), 1)
+
+    def test_update_choice_to_duplicate_text(self):
+        """Test renaming a choice to existing text fails"""
+        create_choice(choice='Yes')
+        choice = create_choice(choice='No')
+
+        res = self.client.patch(detail_url(choice.id), {'choice': 'Yes'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        choice.refresh_from_db()
+        self.assertEqual(choice.choice, 'No')
+
     def test_retrieve_choices(self):
         """Test retrieving a list of choices"""
         create_choice()
-        create_choice()
+        create_choice(choice='choice2')
 
         res = self.client.get(CHOICE_URL)
 
@@ -97,7 +117,28 @@ class PrivateChoiceAPITests(TestCase):
         serializer = ChoiceSerializer(choices, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_retrieve_choices_paginated(self):
+        """Test choices are listed newest first with an opaque cursor"""
+        choices = [create_choice(choice=f'choice {i}') for i in range(3)]
+
+        res = self.client.get(CHOICE_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [c['id'] for c in res.data['results']],
+            [choices[2].id, choices[1].id],
+        )
+        self.assertIn('cursor=', res.data['next'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [c['id'] for c in res.data['results']],
+            [choices[0].id],
+        )
+        self.assertIsNone(res.data['next'])
 
     def test_get_choice_detail(self):
         """Test retrieving a choice detail"""
@@ -0,0 +1,178 @@
+"""
+Tests for the question bank export
+"""
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+)
+from question import (
+    exporter,
+    importer,
+)
+
+
+EXPORT_URL = reverse('question:question-export-bank')
+
+
+def create_bank(size):
+    """Create and return `size` sample questions with shared choices"""
+    none_of_them = Choice.objects.create(choice='None of the above')
+    questions = []
+    for i in range(size):
+        answer = Choice.objects.create(choice=f'Answer {i}')
+        question = Question.objects.create(
+            question=f'Question {i}?',
+            answer=answer,
+        )
+        question.choices.add(answer, none_of_them)
+        questions.append(question)
+    return questions
+
+
+class ExporterTests(TestCase):
+    """Test exporting question banks"""
+
+    def test_iter_questions_in_chunks(self):
+        """Test every question is exported across chunks"""
+        questions = create_bank(5)
+
+        # Two queries per chunk and one to find the end of the bank
+        with self.assertNumQueries(7):
+            exported = list(exporter.iter_questions(chunk_size=2))
+
+        self.assertEqual(
+            [q['id'] for q in exported],
+            [q.id for q in questions],
+        )
+        self.assertEqual(exported[1]['question'], 'Question 1?')
+        self.assertEqual(exported[1]['answer']['choice'], 'Answer 1')
+        self.assertEqual(
+            [choice['choice'] for choice in exported[1]['choices']],
+            ['None of the above', 'Answer 1'],
+        )
+
+    def test_csv_export_round_trips(self):
+        """Test a CSV export can be imported again"""
+        create_bank(3)
+        data = b''.join(exporter.export_questions('csv')).decode()
+        Question.objects.all().delete()
+
+        result = importer.import_questions(
+            importer.read_rows(io.StringIO(data), 'csv')
+        )
+
+        self.assertEqual(result.created, 3)
+        question = Question.objects.get(question='Question 2?')
+        self.assertEqual(question.answer.choice, 'Answer 2')
+        self.assertEqual(question.choices.count(), 2)
+
+    def test_csv_export_round_trips_separator_in_choices(self):
+        """Test choices containing the `|` separator survive a round trip"""
+        question = Question.objects.create(
+            question='Which is a pipe?',
+            answer=Choice.objects.create(choice='a | b'),
+        )
+        question.choices.set([
+            question.answer,
+            Choice.objects.create(choice='"quoted", comma'),
+        ])
+        data = b''.join(exporter.export_questions('csv')).decode()
+        Question.objects.all().delete()
+
+        result = importer.import_questions(
+            importer.read_rows(io.StringIO(data), 'csv')
+        )
+
+        self.assertEqual(result.created, 1)
+        question = Question.objects.get()
+        self.assertEqual(question.answer.choice, 'a | b')
+        self.assertEqual(
+            set(question.choices.values_list('choice', flat=True)),
+            {'a | b', '"quoted", comma'},
+        )
+
+    def test_gzip_export(self):
+        """Test the export is compressed on the fly"""
+        create_bank(3)
+
+        data = b''.join(exporter.export_questions('jsonl', compress=True))
+
+        lines = gzip.decompress(data).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])['question'], 'Question 0?')
+
+    def test_export_command(self):
+        """Test the export_questions management command"""
+        create_bank(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bank.csv')
+
+            call_command(
+                'export_questions',
+                '--format=csv',
+                f'--output={path}',
+                stderr=io.StringIO(),
+            )
+
+            with open(path) as output:
+                lines = output.read().splitlines()
+
+        self.assertEqual(lines[0], 'question,answer,choices')
+        self.assertEqual(len(lines), 3)
+
+
+class ExportAPITests(TestCase):
+    """Test the question bank export endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_export_jsonl(self):
+        """Test streaming the bank as JSON lines"""
+        create_bank(3)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[2])['answer']['choice'], 'Answer 2')
+
+    def test_export_csv_gzip(self):
+        """Test streaming the bank as gzipped CSV"""
+        create_bank(2)
+
+        res = self.client.get(EXPORT_URL, {'file_format': 'csv', 'gzip': 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('questions.csv.gz', res['Content-Disposition'])
+        data = gzip.decompress(b''.join(res.streaming_content)).decode()
+        self.assertEqual(len(data.splitlines()), 3)
+
+    def test_export_invalid_format(self):
+        """Test an unknown export format is rejected"""
+        res = self.client.get(EXPORT_URL, {'file_format': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,289 @@
+"""
+Tests for the question bank import
+"""
+import io
+import json
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Question,
+    Choice,
+)
+from question import importer
+
+
+IMPORT_URL = reverse('question:question-import-bank')
+
+
+def jsonl(*rows):
+    """Return rows encoded as JSON lines"""
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def sample_row(number):
+    """Return a sample import row"""
+    return {
+        'question': f'Question {number}?',
+        'answer': {'choice': f'Answer {number}'},
+        'choices': [
+            {'choice': f'Answer {number}'},
+            {'choice': 'None of the above'},
+        ],
+    }
+
+
+class ImporterTests(TestCase):
+    """Test importing question banks"""
+
+    def test_import_jsonl(self):
+        """Test importing questions from JSON lines"""
+        stream = io.StringIO(jsonl(*[sample_row(i) for i in range(5)]))
+
+        result = importer.import_questions(
+            importer.read_rows(stream, 'jsonl'),
+            chunk_size=2,
+        )
+
+        self.assertEqual(result.created, 5)
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(Question.objects.count(), 5)
+        # The shared distractor is stored once
+        self.assertEqual(Choice.objects.count(), 6)
+        question = Question.objects.get(question='Question 3?')
+        self.assertEqual(question.answer.choice, 'Answer 3')
+        self.assertEqual(
+            set(question.choices.values_list('choice', flat=True)),
+            {'Answer 3', 'None of the above'},
+        )
+
+    def test_import_csv(self):
+        """Test importing questions from CSV"""
+        stream = io.StringIO(
+            'question,answer,choices\r\n'
+            'Is the sky blue?,Yes,Yes|No\r\n'
+            'Is grass red?,No,Yes|No\r\n'
+        )
+
+        result = importer.import_questions(importer.read_rows(stream, 'csv'))
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(Choice.objects.count(), 2)
+        question = Question.objects.get(question='Is grass red?')
+        self.assertEqual(question.answer.choice, 'No')
+        self.assertEqual(question.choices.count(), 2)
+
+    def test_import_choices_differing_in_whitespace(self):
+        """Test choices with the same normalized key are linked once"""
+        stream = io.StringIO(
+            'question,answer,choices\r\n'
+            'Spaced?,x y,x  y|x y|z\r\n'
+        )
+
+        result = importer.import_questions(importer.read_rows(stream, 'csv'))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.failed, 0)
+        question = Question.objects.get()
+        self.assertEqual(question.choices.count(), 2)
+        self.assertIn(question.answer, question.choices.all())
+
+    def test_import_reuses_existing_choices(self):
+        """Test existing choices are linked instead of duplicated"""
+        existing = Choice.objects.create(choice='None of the above')
+        stream = io.StringIO(jsonl(sample_row(1)))
+
+        importer.import_questions(importer.read_rows(stream, 'jsonl'))
+
+        question = Question.objects.get()
+        self.assertIn(existing, question.choices.all())
+        self.assertEqual(
+            Choice.objects.filter(choice='None of the above').count(),
+            1,
+        )
+
+    def test_import_reports_row_errors(self):
+        """Test invalid rows are reported without aborting the import"""
+        stream = io.StringIO(
+            jsonl(sample_row(1)) +
+            'not json\n' +
+            jsonl({'question': 'Missing answer?'}, sample_row(2))
+        )
+
+        result = importer.import_questions(
+            importer.read_rows(stream, 'jsonl'),
+            chunk_size=2,
+        )
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.failed, 2)
+        self.assertEqual([e['row'] for e in result.errors], [2, 3])
+        self.assertIn('answer', result.errors[1]['errors'])
+
+    def test_import_isolates_rows_rejected_by_the_database(self):
+        """Test a row the database rejects does not fail its whole chunk"""
+        create_questions = importer._create_questions
+
+        def reject_broken(rows):
+            if any(row['question'] == 'Broken?' for row in rows):
+                raise DatabaseError('value too long')
+            return create_questions(rows)
+
+        broken = dict(sample_row(2), question='Broken?')
+        stream = io.StringIO(jsonl(sample_row(1), broken, sample_row(3)))
+
+        with patch.object(importer, '_create_questions', reject_broken):
+            result = importer.import_questions(
+                importer.read_rows(stream, 'jsonl'),
+            )
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.failed, 1)
+        self.assertEqual(
+            result.errors,
+            [{'row': 2, 'errors': {'non_field_errors': ['value too long']}}],
+        )
+        self.assertEqual(
+            set(Question.objects.values_list('question', flat=True)),
+            {'Question 1?', 'Question 3?'},
+        )
+
+    def test_import_command(self):
+        """Test the import_questions management command"""
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.jsonl', delete=False
+        ) as bank:
+            bank.write(jsonl(sample_row(1), sample_row(2)))
+
+        out = io.StringIO()
+        call_command('import_questions', bank.name, stdout=out)
+
+        self.assertEqual(Question.objects.count(), 2)
+        self.assertIn('Imported 2 questions', out.getvalue())
+
+    def test_import_command_non_utf8_file(self):
+        """Test the import command reports a file that is not UTF-8"""
+        with tempfile.NamedTemporaryFile(
+            'wb', suffix='.csv', delete=False
+        ) as bank:
+            bank.write('question,answer\nCaf\xe9?,Oui\n'.encode('latin-1'))
+
+        out = io.StringIO()
+        err = io.StringIO()
+        call_command('import_questions', bank.name, stdout=out, stderr=err)
+
+        self.assertIn('not UTF-8', err.getvalue())
+        self.assertIn('0 questions, 1 failed', out.getvalue())
+
+
+class ImportAPITests(TestCase):
+    """Test the question bank import endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_import_upload(self):
+        """Test uploading a question bank file"""
+        upload = SimpleUploadedFile(
+            'bank.jsonl',
+            jsonl(sample_row(1), {'question': ''}).encode(),
+        )
+
+        res = self.client.post(
+            IMPORT_URL,
+            {'file': upload},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['failed'], 1)
+        self.assertEqual(res.data['errors'][0]['row'], 2)
+        self.assertTrue(Question.objects.filter(question='Question 1?'))
+
+    def test_import_non_utf8_upload(self):
+        """Test a file that is not UTF-8 is reported as a row error"""
+        upload = SimpleUploadedFile(
+            'bank.csv',
+            'question,answer,choices\nCaf\xe9?,Oui,Oui|Non\n'.encode(
+                'latin-1'
+            ),
+        )
+
+        res = self.client.post(
+            IMPORT_URL,
+            {'file': upload},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 0)
+        self.assertEqual(res.data['failed'], 1)
+        self.assertIn('UTF-8', str(res.data['errors'][0]['errors']))
+
+    def test_import_malformed_csv_upload(self):
+        """Test CSV parser errors are reported as row errors"""
+        content = 'question,answer,choices\nQ?,A,A|B\n"' + 'x' * 200000
+        upload = SimpleUploadedFile('bank.csv', content.encode())
+
+        res = self.client.post(
+            IMPORT_URL,
+            {'file': upload},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['errors'][0]['row'], 3)
+        self.assertIn('Malformed CSV', str(res.data['errors'][0]['errors']))
+
+    def test_import_unknown_format(self):
+        """Test uploading a file of unknown format fails"""
+        upload = SimpleUploadedFile('bank.txt', b'question')
+
+        res = self.client.post(
+            IMPORT_URL,
+            {'file': upload},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Question.objects.count(), 0)
+
+    def test_examinee_cannot_import(self):
+        """Test examinees cannot import questions"""
+        examinee = get_user_model().objects.create_user(
+            email='examinee@example.com',
+            password='testpass123',
+            role='examinee',
+        )
+        self.client.force_authenticate(examinee)
+        upload = SimpleUploadedFile(
+            'bank.jsonl',
+            jsonl(sample_row(1)).encode(),
+        )
+
+        res = self.client.post(
+            IMPORT_URL,
+            {'file': upload},
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Question.objects.count(), 0)
@@ -0,0 +1,156 @@
+"""
+Tests for question bank maintenance
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+)
+
+from core.models import (
+    Question,
+    Choice,
+    ExamPack,
+    ItemStatistic,
+    ChoiceStatistic,
+)
+from question import maintenance
+from question.serializers import QuestionSerializer
+
+
+class PruneChoicesTests(TestCase):
+    """Test garbage collection of orphaned choices"""
+
+    def setUp(self):
+        self.answer = Choice.objects.create(choice='Answer')
+        self.linked = Choice.objects.create(choice='Linked')
+        question = Question.objects.create(
+            question='Question?',
+            answer=self.answer,
+        )
+        question.choices.add(self.linked)
+        self.orphans = [
+            Choice.objects.create(choice=f'Orphan {i}') for i in range(5)
+        ]
+
+    def test_orphaned_choices(self):
+        """Test only unreferenced choices are orphaned"""
+        self.assertEqual(
+            set(maintenance.orphaned_choices()),
+            set(self.orphans),
+        )
+
+    def test_prune_in_batches(self):
+        """Test orphaned choices are deleted in bounded batches"""
+        reclaimed = maintenance.prune_orphaned_choices(
+            batch_size=2,
+            max_batches=2,
+        )
+
+        self.assertEqual(reclaimed, 4)
+        self.assertEqual(maintenance.orphaned_choices().count(), 1)
+
+        reclaimed = maintenance.prune_orphaned_choices(batch_size=2)
+
+        self.assertEqual(reclaimed, 1)
+        self.assertEqual(
+            set(Choice.objects.all()),
+            {self.answer, self.linked},
+        )
+        self.assertTrue(Question.objects.exists())
+
+    def test_prune_batch_cost_does_not_grow(self):
+        """Test a batch is deleted in one statement with one bump"""
+        Choice.objects.bulk_create([
+            Choice(choice=f'More {i}', key=f'More {i}') for i in range(20)
+        ])
+
+        with patch.object(maintenance, 'bump_revision') as bump:
+            # Find, lock and delete one batch, then find no more
+            with self.assertNumQueries(6):
+                reclaimed = maintenance.prune_orphaned_choices()
+
+        self.assertEqual(reclaimed, 25)
+        bump.assert_called_once_with()
+
+    def test_prune_keeps_choices_in_statistics(self):
+        """Test choices counted in item statistics are not orphaned"""
+        question = Question.objects.get()
+        item = ItemStatistic.objects.create(
+            exam_pack=ExamPack.objects.create(name='Pack', content=b'{}'),
+            question=question,
+        )
+        ChoiceStatistic.objects.create(item=item, choice=self.orphans[0])
+
+        reclaimed = maintenance.prune_orphaned_choices()
+
+        self.assertEqual(reclaimed, 4)
+        self.assertTrue(Choice.objects.filter(id=self.orphans[0].id).exists())
+
+    def test_prune_command_dry_run(self):
+        """Test a dry run reports without deleting"""
+        out = StringIO()
+
+        call_command('prune_choices', '--dry-run', stdout=out)
+
+        self.assertIn('Would delete 5 orphaned choices', out.getvalue())
+        self.assertEqual(Choice.objects.count(), 7)
+
+    def test_prune_command(self):
+        """Test the prune_choices command deletes orphans"""
+        out = StringIO()
+
+        call_command('prune_choices', '--batch-size=3', stdout=out)
+
+        self.assertIn('Deleted 5 orphaned choices', out.getvalue())
+        self.assertEqual(Choice.objects.count(), 2)
+
+
+class PruneRaceTests(TestCase):
+    """Test question writes racing the choice pruner"""
+
+    def test_resolve_recreates_pruned_choice(self):
+        """Test a choice pruned between insert and read is created again"""
+        Choice.objects.create(choice='Orphan')
+        share_keys = Choice.objects._share_keys
+        calls = []
+
+        def prune_then_share(keys):
+            if not calls:
+                maintenance.prune_orphaned_choices()
+            calls.append(keys)
+            return share_keys(keys)
+
+        with patch.object(Choice.objects, '_share_keys', prune_then_share):
+            resolved = Choice.objects.resolve(['Orphan', 'New'])
+
+        self.assertEqual(calls[1], {'Orphan': 'Orphan', 'New': 'New'})
+        self.assertTrue(Choice.objects.filter(id=resolved['Orphan'].id))
+        self.assertTrue(Choice.objects.filter(id=resolved['New'].id))
+
+
+class QuestionWriteTransactionTests(TransactionTestCase):
+    """Test question writes commit choices and links together"""
+
+    def test_failed_create_leaves_no_choices(self):
+        """Test choices resolved for a failed create are rolled back"""
+        serializer = QuestionSerializer(data={
+            'question': 'Question?',
+            'answer': {'choice': 'Yes'},
+            'choices': [{'choice': 'Yes'}, {'choice': 'No'}],
+        })
+        serializer.is_valid(raise_exception=True)
+
+        with patch.object(
+            Question.objects,
+            'create',
+            side_effect=IntegrityError,
+        ):
+            with self.assertRaises(IntegrityError):
+                serializer.save()
+
+        self.assertFalse(Choice.objects.exists())
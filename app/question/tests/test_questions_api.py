@@ -1,7 +1,12 @@
 """
 Test for Question APIs
 """
+import json
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -17,6 +22,7 @@ from question.serializers import QuestionSerializer
 
 
 QUESTION_URL = reverse('question:question-list')
+SAMPLE_URL = reverse('question:question-sample')
 CHOICE_URL = reverse('question:choice-list')
 
 
@@ -83,6 +89,7 @@ class PrivateQuestionAPIAPITests(TestCase):
     """Test authenticated API requests"""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = create_user(
             email='user@example.com',
@@ -94,7 +101,7 @@ class PrivateQuestionAPIAPITests(TestCase):
     def test_retrieve_questions(self):
         """Test retrieving a list of questions"""
         choice1 = create_choice()
-        choice2 = create_choice()
+        choice2 = create_choice(choice='choice2')
         create_question(choice1)
         create_question(choice2)
 
@@ -103,7 +110,163 @@ class PrivateQuestionAPIAPITests(TestCase):
         questions = Question.objects.all().order_by('-id')
         serializer = QuestionSerializer(questions, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_list_matches_serializer(self):
+        """Test the read fast path matches QuestionSerializer output"""
+        for i in range(3):
+            answer = create_choice(choice=f'answer {i}')
+            question = create_question(answer, question=f'question {i}?')
+            question.choices.add(
+                create_choice(choice=f'distractor {i}'),
+                answer,
+            )
+
+        res = self.client.get(QUESTION_URL)
+
+        questions = Question.objects.order_by('-id').prefetch_related(
+            Prefetch('choices', queryset=Choice.objects.order_by('id'))
+        )
+        serializer = QuestionSerializer(questions, many=True)
+        results = json.loads(res.content)['results']
+        self.assertEqual(results, json.loads(json.dumps(serializer.data)))
+        self.assertEqual(list(results[0]), list(serializer.data[0]))
+
+        url = detail_url(questions[0].id)
+        res = self.client.get(url)
+
+        self.assertEqual(res.data, serializer.data[0])
+
+    def test_list_questions_paginated(self):
+        """Test listing questions walks the bank page by page"""
+        answer = create_choice()
+        questions = [
+            create_question(answer, question=f'question {i}?')
+            for i in range(5)
+        ]
+
+        res = self.client.get(QUESTION_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data['previous'])
+        self.assertEqual(
+            [q['id'] for q in res.data['results']],
+            [questions[4].id, questions[3].id],
+        )
+
+        seen = []
+        next_url = res.data['next']
+        seen.extend(q['id'] for q in res.data['results'])
+        while next_url:
+            res = self.client.get(next_url)
+            seen.extend(q['id'] for q in res.data['results'])
+            next_url = res.data['next']
+
+        self.assertEqual(seen, [q.id for q in reversed(questions)])
+
+    def test_list_questions_page_query_count(self):
+        """Test a deep page costs the same number of queries"""
+        answer = create_choice()
+        for i in range(6):
+            create_question(answer, question=f'question {i}?')
+        res = self.client.get(QUESTION_URL, {'page_size': 2})
+        res = self.client.get(res.data['next'])
+
+        with self.assertNumQueries(2):
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIsNone(res.data['next'])
+
+    def test_search_questions(self):
+        """Test searching questions by text"""
+        answer = create_choice()
+        create_question(answer, question='What is the capital of France?')
+        match = create_question(
+            answer,
+            question='What is the capital city of Peru?',
+        )
+        create_question(answer, question='How many legs does a spider have?')
+
+        res = self.client.get(QUESTION_URL, {'search': 'capital peru'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([q['id'] for q in res.data['results']], [match.id])
+        self.assertIsNone(res.data['next'])
+
+    def test_search_returns_one_page(self):
+        """Test search results are capped at the page size"""
+        answer = create_choice()
+        for i in range(3):
+            create_question(answer, question=f'Capital question {i}?')
+
+        res = self.client.get(
+            QUESTION_URL,
+            {'search': 'capital', 'page_size': 2},
+        )
+
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIsNone(res.data['next'])
+        self.assertIsNone(res.data['previous'])
+
+    def test_sample_questions(self):
+        """Test sampling distinct random questions"""
+        answer = create_choice()
+        for i in range(20):
+            question = create_question(answer, question=f'question {i}?')
+            question.choices.add(answer)
+
+        with self.assertNumQueries(4):
+            res = self.client.get(SAMPLE_URL, {'count': 5, 'seed': 'abc'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [q['id'] for q in res.data['results']]
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(res.data['results'][0]['choices'][0]['id'], answer.id)
+
+        res = self.client.get(SAMPLE_URL, {'count': 5, 'seed': 'abc'})
+
+        self.assertEqual([q['id'] for q in res.data['results']], ids)
+
+    def test_sample_more_than_bank(self):
+        """Test sampling more questions than exist returns them all"""
+        answer = create_choice()
+        questions = [create_question(answer) for _ in range(3)]
+        Question.objects.filter(id=questions[1].id).delete()
+
+        res = self.client.get(SAMPLE_URL, {'count': 10})
+
+        self.assertEqual(
+            sorted(q['id'] for q in res.data['results']),
+            [questions[0].id, questions[2].id],
+        )
+        self.assertTrue(res.data['seed'])
+
+    def test_sample_skips_questions_deleted_meanwhile(self):
+        """Test a question deleted after sampling is left out"""
+        answer = create_choice()
+        questions = [create_question(answer) for _ in range(3)]
+        ids = [question.id for question in questions]
+        Question.objects.filter(id=ids[1]).delete()
+
+        with patch(
+            'question.sampling.sample_question_ids',
+            return_value=ids,
+        ):
+            res = self.client.get(SAMPLE_URL, {'count': 3})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [q['id'] for q in res.data['results']],
+            [ids[0], ids[2]],
+        )
+
+    def test_sample_empty_bank(self):
+        """Test sampling an empty bank returns no questions"""
+        res = self.client.get(SAMPLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
 
     def test_get_question_detail(self):
         """Test get question"""
@@ -116,6 +279,43 @@ class PrivateQuestionAPIAPITests(TestCase):
         serializer = QuestionSerializer(question)
         self.assertEqual(res.data, serializer.data)
 
+    def test_list_questions_query_count(self):
+        """Test listing questions uses a constant number of queries"""
+        for i in range(5):
+            answer = create_choice(choice=f'answer {i}')
+            question = create_question(answer, question=f'question {i}?')
+            question.choices.add(
+                answer,
+                create_choice(choice=f'distractor {i}'),
+            )
+
+        # One query for questions and answers, one for the choices
+        with self.assertNumQueries(2):
+            res = self.client.get(QUESTION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
+        for question in res.data['results']:
+            self.assertEqual(len(question['choices']), 2)
+
+    def test_get_question_detail_query_count(self):
+        """Test retrieving a question uses a constant number of queries"""
+        answer = create_choice(choice='answer')
+        question = create_question(answer)
+        question.choices.add(
+            answer,
+            create_choice(choice='distractor 1'),
+            create_choice(choice='distractor 2'),
+        )
+
+        url = detail_url(question.id)
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['answer']['choice'], 'answer')
+        self.assertEqual(len(res.data['choices']), 3)
+
     def test_partial_update_question(self):
         """Test partial update of a question"""
         question_sample = 'sample question'
@@ -225,6 +425,10 @@ class PrivateQuestionAPIAPITests(TestCase):
 
     def test_create_question_with_existing_choices(self):
         """Test creating a question with existing choice"""
+        existing = [
+            create_choice(choice='Answer A'),
+            create_choice(choice='sample answer'),
+        ]
         payload = {
             'question': 'Sample question',
             'answer': {'choice': 'sample answer'},
@@ -237,16 +441,9 @@ class PrivateQuestionAPIAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         question = Question.objects.get(id=res.data['id'])
 
-        # Create Choice instances and associate them with the question
-        choice_data = [
-            {'choice': 'Answer A'},
-            {'choice': 'sample answer'}
-        ]
-
-        for choice in choice_data:
-            Choice.objects.create(question=question, **choice)
-
         self.assertEqual(question.choices.count(), 2)
+        self.assertEqual(question.answer, existing[1])
+        self.assertEqual(Choice.objects.count(), 2)
 
         for choice in payload['choices']:
             exists = question.choices.filter(
@@ -254,6 +451,27 @@ class PrivateQuestionAPIAPITests(TestCase):
             ).exists()
             self.assertTrue(exists)
 
+    def test_create_question_normalizes_choice_text(self):
+        """Test choices differing only in spacing are shared"""
+        existing = create_choice(choice='Answer A')
+        payload = {
+            'question': 'Sample question',
+            'answer': {'choice': ' Answer  A'},
+            'choices': [
+                {'choice': 'Answer A '},
+                {'choice': 'Answer B'},
+            ]
+        }
+
+        with self.assertNumQueries(7):
+            res = self.client.post(QUESTION_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        question = Question.objects.get(id=res.data['id'])
+        self.assertEqual(question.answer, existing)
+        self.assertEqual(question.choices.count(), 2)
+        self.assertEqual(Choice.objects.count(), 2)
+
     def test_create_choice_on_update(self):
         """Test creating choice when updating a question"""
         answer = create_choice()
@@ -290,6 +508,41 @@ class PrivateQuestionAPIAPITests(TestCase):
         self.assertTrue(question.choices.filter(choice="Choice 2").exists())
         self.assertFalse(question.choices.filter(choice="Choice 1").exists())
 
+    def test_partial_update_keeps_choices(self):
+        """Test updating a question without choices leaves them as is"""
+        answer = create_choice(choice='Yes')
+        question = create_question(answer)
+        question.choices.add(answer, create_choice(choice='No'))
+
+        payload = {'question': 'Updated question?'}
+        url = detail_url(question.id)
+        res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(question.choices.values_list('choice', flat=True)),
+            {'Yes', 'No'},
+        )
+
+    def test_update_choices_only_writes_changes(self):
+        """Test updating choices keeps the links that did not change"""
+        answer = create_choice(choice='Yes')
+        question = create_question(answer)
+        question.choices.add(answer, create_choice(choice='No'))
+        Through = Question.choices.through
+        kept = Through.objects.get(question=question, choice=answer)
+
+        payload = {'choices': [{'choice': 'Yes'}, {'choice': 'Maybe'}]}
+        url = detail_url(question.id)
+        res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(question.choices.values_list('choice', flat=True)),
+            {'Yes', 'Maybe'},
+        )
+        self.assertTrue(Through.objects.filter(id=kept.id).exists())
+
     def test_clear_question_choices(self):
         """Test clearing question choices"""
         choice = create_choice()
@@ -1,37 +1,213 @@
 """
 Views for Question API
 """
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+import io
+import secrets
+
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from rest_framework import (
+    viewsets,
+    status,
+)
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from user.authentication import CachedTokenAuthentication
 from user.permissions import IsAdminUser
 
+from core.idempotency import idempotent
 from core.models import (
     Question,
     Choice,
     )
-from question import serializers
+from question import (
+    serializers,
+    importer,
+    exporter,
+    sampling,
+)
+from question.cache import CachedResponseMixin
+from question.pagination import (
+    IdCursorPagination,
+    QuestionCursorPagination,
+)
+from question.search import QuestionSearchFilter
+
+
+class FastReadMixin:
+    """
+    Serve list and detail reads from `values()` rows.
+
+    Reads skip model instances and serializers: the queryset is reduced
+    to `read_fields` and `read_data` turns the rows into the same output
+    as the serializer.
+    """
+    read_fields = None
+    read_data = None
+
+    def is_fast_read(self):
+        return self.action in ('list', 'retrieve')
+
+    def get_read_queryset(self, queryset):
+        return queryset.prefetch_related(None).values(*self.read_fields)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.read_data(page))
 
-class QuestionViewSet(viewsets.ModelViewSet):
+        return Response(self.read_data(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.read_data([self.get_object()])[0])
+
+
+class QuestionViewSet(
+    CachedResponseMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """View for managing question APIs"""
     serializer_class = serializers.QuestionSerializer
     queryset = Question.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = QuestionCursorPagination
+    filter_backends = [QuestionSearchFilter]
+    read_fields = serializers.QUESTION_FIELDS
+    read_data = staticmethod(serializers.question_data)
 
     def get_queryset(self):
-        """Retrieve choices"""
-        return self.queryset.order_by('-id')
+        """Retrieve questions with their answer and choices"""
+        queryset = self.queryset.order_by('-id')
+        if self.is_fast_read():
+            return self.get_read_queryset(queryset)
+
+        return queryset.select_related(
+            'answer'
+        ).prefetch_related(
+            Prefetch('choices', queryset=Choice.objects.order_by('id'))
+        )
+
+    def get_serializer_class(self):
+        """Return the serializer class for request"""
+        if self.action == 'import_bank':
+            return serializers.QuestionImportFileSerializer
+        elif self.action == 'export_bank':
+            return serializers.QuestionExportSerializer
+        elif self.action == 'sample':
+            return serializers.QuestionSampleSerializer
+
+        return self.serializer_class
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create once per Idempotency-Key"""
+        return super().create(request, *args, **kwargs)
 
-class ChoiceViewSet(viewsets.ModelViewSet):
+    @action(
+        methods=['POST'],
+        detail=False,
+        url_path='import',
+        parser_classes=[MultiPartParser],
+    )
+    def import_bank(self, request):
+        """Bulk import questions from a CSV or JSONL file"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data['file']
+        file_format = serializer.validated_data.get(
+            'file_format',
+            importer.guess_format(upload.name),
+        )
+        if file_format is None:
+            return Response(
+                {'file_format': ['Could not detect the file format.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        result = importer.import_questions(
+            importer.read_rows(stream, file_format)
+        )
+
+        return Response(result.to_dict(), status=status.HTTP_200_OK)
+
+    @action(methods=['GET'], detail=False, url_path='export')
+    def export_bank(self, request):
+        """Stream the whole question bank as JSONL or CSV"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        file_format = serializer.validated_data['file_format']
+        compress = serializer.validated_data['gzip']
+
+        response = StreamingHttpResponse(
+            exporter.export_questions(file_format, compress=compress),
+            content_type=exporter.export_content_type(file_format, compress),
+        )
+        filename = exporter.export_filename(file_format, compress)
+        response['Content-Disposition'] = f'attachment; filename={filename}'
+
+        return response
+
+    @action(methods=['GET'], detail=False)
+    def sample(self, request):
+        """Return uniformly random questions, optionally seeded"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        seed = serializer.validated_data.get('seed') or secrets.token_hex(8)
+
+        ids = sampling.sample_question_ids(
+            serializer.validated_data['count'],
+            seed=seed,
+        )
+        rows = {
+            question['id']: question
+            for question in serializers.question_data(
+                Question.objects.filter(id__in=ids).values(
+                    *serializers.QUESTION_FIELDS
+                )
+            )
+        }
+
+        return Response({
+            'seed': seed,
+            # Questions deleted since they were sampled are skipped
+            'results': [
+                rows[question_id] for question_id in ids
+                if question_id in rows
+            ],
+        })
+
+
+class ChoiceViewSet(
+    CachedResponseMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """View for managing choice APIs"""
     serializer_class = serializers.ChoiceSerializer
     queryset = Choice.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = IdCursorPagination
+    read_fields = serializers.CHOICE_FIELDS
+    read_data = staticmethod(serializers.choice_data)
 
     def get_queryset(self):
         """Retrieve choices"""
-        return self.queryset.order_by('-id')
+        queryset = self.queryset.order_by('-id')
+        if self.is_fast_read():
+            return self.get_read_queryset(queryset)
+
+        return queryset
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create once per Idempotency-Key"""
+        return super().create(request, *args, **kwargs)
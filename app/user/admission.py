@@ -0,0 +1,140 @@
+"""
+Admission control for password logins
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import SimpleRateThrottle
+
+
+LATENCY_WINDOW = 1000
+
+
+class LoginUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many logins in progress, try again shortly.'
+    default_code = 'login_unavailable'
+
+
+class LoginGate:
+    """
+    Bound the password hash verifications running in this process.
+
+    At most `LOGIN_MAX_CONCURRENT` logins hash at once. Up to
+    `LOGIN_MAX_WAITING` more wait at most `LOGIN_QUEUE_TIMEOUT` seconds
+    for a slot; anything beyond that is rejected without hashing.
+    """
+
+    def __init__(self, max_concurrent, max_waiting, timeout):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            settings.LOGIN_MAX_CONCURRENT,
+            settings.LOGIN_MAX_WAITING,
+            settings.LOGIN_QUEUE_TIMEOUT,
+        )
+
+    def _reject(self):
+        self.rejected += 1
+        exc = LoginUnavailable()
+        exc.wait = self.timeout
+        return exc
+
+    @contextmanager
+    def admit(self):
+        """Hold a hashing slot for the duration of the block"""
+        acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if self.waiting >= self.max_waiting:
+                    raise self._reject()
+                self.waiting += 1
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._lock:
+                self.waiting -= 1
+        with self._lock:
+            if not acquired:
+                raise self._reject()
+            self.in_flight += 1
+            self.admitted += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight -= 1
+                self._latencies.append(elapsed)
+            self._slots.release()
+
+    def metrics(self):
+        """Return queue depth, counters and recent hash latency"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            metrics = {
+                'max_concurrent': self.max_concurrent,
+                'max_waiting': self.max_waiting,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+            }
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            index = min(int(len(latencies) * fraction), len(latencies) - 1)
+            return round(latencies[index] * 1000, 3)
+
+        metrics['hash_latency_ms'] = {
+            'samples': len(latencies),
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': percentile(1),
+        }
+        return metrics
+
+
+login_gate = LoginGate.from_settings()
+
+
+class LoginIPThrottle(SimpleRateThrottle):
+    """Limit login attempts per client address"""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class LoginAccountThrottle(SimpleRateThrottle):
+    """Limit login attempts per account, whatever their source"""
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': email.strip().lower(),
+        }
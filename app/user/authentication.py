@@ -0,0 +1,81 @@
+"""
+Token authentication backed by the cache
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import (
+    router,
+    transaction,
+)
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def token_cache_key(key):
+    """Return the cache key for a token without exposing the token"""
+    return 'auth:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget_tokens(keys):
+    """Drop cached lookups for tokens, now and again after commit"""
+    cache_keys = [token_cache_key(key) for key in keys]
+    if cache_keys:
+        cache.delete_many(cache_keys)
+        transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+def cached_user_fields(user):
+    """Return the fields of a user to cache, leaving out the password"""
+    return {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields
+        if field.attname != 'password'
+    }
+
+
+def user_from_cache(fields):
+    """
+    Return a User built from cached fields.
+
+    The password is left deferred, so it is only read from the database
+    if needed, and saving the user never overwrites it.
+    """
+    User = get_user_model()
+    return User.from_db(
+        router.db_for_read(User),
+        list(fields),
+        list(fields.values()),
+    )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that caches token to user lookups.
+
+    Only the user's fields, without the password hash, are cached.
+    Entries live for `AUTH_TOKEN_CACHE_TIMEOUT` seconds and are dropped
+    as soon as the token is deleted or its user is saved. Revocation
+    relies on the default cache being shared by every process, which
+    the core.W001 system check warns about. A cache hit only saves the
+    token query if the cache itself needs no database round trip, as
+    with the default file-based cache or memcached.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        fields = cache.get(cache_key)
+        if fields is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(
+                cache_key,
+                cached_user_fields(user),
+                settings.AUTH_TOKEN_CACHE_TIMEOUT,
+            )
+        else:
+            user = user_from_cache(fields)
+            token = Token(key=key, user=user)
+
+        return user, token
@@ -0,0 +1,51 @@
+"""
+Filters for the user listing
+"""
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import User
+
+
+class UserFilterSerializer(serializers.Serializer):
+    """Serializer for validating user listing filters"""
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    email = serializers.CharField(max_length=255, required=False)
+    name = serializers.CharField(max_length=255, required=False)
+
+
+class UserFilter(BaseFilterBackend):
+    """
+    Filter users by role, creation date range and email or name prefix.
+
+    Prefixes are matched case-insensitively, which PostgreSQL serves
+    from the UPPER() pattern indexes of core.0026_user_listing_indexes.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = UserFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        if 'role' in filters:
+            queryset = queryset.filter(role=filters['role'])
+        if 'created_after' in filters:
+            queryset = queryset.filter(
+                Created_Date__gte=filters['created_after'],
+            )
+        if 'created_before' in filters:
+            queryset = queryset.filter(
+                Created_Date__lt=filters['created_before'],
+            )
+        if 'email' in filters:
+            queryset = queryset.filter(email__istartswith=filters['email'])
+        if 'name' in filters:
+            queryset = queryset.filter(
+                Q(firstname__istartswith=filters['name'])
+                | Q(lastname__istartswith=filters['name'])
+            )
+
+        return queryset
@@ -0,0 +1,55 @@
+"""
+Password hashing across a process pool
+
+This module must stay importable before Django is set up, as spawned
+pool processes import it to find their functions.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+
+
+def _init_process():
+    """Set up Django in a freshly spawned pool process"""
+    django.setup()
+
+
+class PasswordHasher:
+    """
+    Hash batches of passwords, inline or across a spawned process pool.
+
+    Use it as a context manager around a whole run: the pool, and the
+    Django setup in each of its processes, is then paid for once and
+    shared by every batch.
+    """
+
+    def __init__(self, processes=1):
+        self.processes = processes
+        self._pool = None
+
+    def __enter__(self):
+        if self.processes > 1:
+            self._pool = ProcessPoolExecutor(
+                self.processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_process,
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash(self, passwords):
+        """Return the hashes of passwords, in order"""
+        passwords = list(passwords)
+        if self._pool is None or len(passwords) <= 1:
+            return [make_password(password) for password in passwords]
+
+        chunksize = max(1, len(passwords) // (self.processes * 4))
+        return list(
+            self._pool.map(make_password, passwords, chunksize=chunksize)
+        )
@@ -0,0 +1,57 @@
+"""
+Django command to create users in bulk from a CSV file
+"""
+import sys
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from user import provisioning
+
+
+class Command(BaseCommand):
+    """Django command to provision users from a CSV file."""
+
+    help = 'Create users from a CSV file ("-" for stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=provisioning.DEFAULT_CHUNK_SIZE,
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.PROVISION_HASH_PROCESSES,
+            help='Processes hashing passwords.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        path = options['path']
+        if path == '-':
+            result = self._provision(sys.stdin, options)
+        else:
+            try:
+                with open(path, encoding='utf-8', newline='') as stream:
+                    result = self._provision(stream, options)
+            except OSError as exc:
+                raise CommandError(exc)
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result.created} users, {result.failed} failed.'
+        ))
+
+    def _provision(self, stream, options):
+        return provisioning.provision_users(
+            provisioning.read_csv(stream),
+            chunk_size=options['chunk_size'],
+            processes=options['processes'],
+        )
@@ -0,0 +1,18 @@
+"""
+Pagination for the user API
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination over users, newest first.
+
+    Pages are fetched with `WHERE id < <cursor>`, which the role and
+    primary key indexes serve without scanning earlier pages.
+    """
+    ordering = '-id'
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
@@ -0,0 +1,171 @@
+"""
+Bulk provisioning of users from CSV
+"""
+import csv
+from itertools import islice
+
+from django.conf import settings
+from django.db import (
+    IntegrityError,
+    transaction,
+)
+
+from core.models import User
+from user.hashing import PasswordHasher
+from user.serializers import ProvisionUserSerializer
+
+
+DEFAULT_CHUNK_SIZE = 1000
+CSV_FIELDS = ('email', 'password', 'firstname', 'lastname', 'role')
+
+
+class ProvisionResult:
+    """Outcome of a bulk user provisioning"""
+
+    def __init__(self, max_errors=1000):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, row, errors):
+        """Record a row that could not be provisioned"""
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def to_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+
+
+def read_csv(stream):
+    """
+    Yield (row number, row) from a CSV stream.
+
+    Expects `email` and `password` columns, and optionally `firstname`,
+    `lastname` and `role`. A stream that cannot be decoded or parsed
+    ends with an exception in place of the row.
+    """
+    reader = csv.DictReader(stream)
+    number = 1
+    try:
+        for number, record in enumerate(reader, start=2):
+            row = {
+                field: (record.get(field) or '').strip()
+                for field in CSV_FIELDS
+                if field != 'password'
+            }
+            row['password'] = record.get('password') or ''
+            if not row['role']:
+                del row['role']
+            yield number, row
+    except UnicodeDecodeError:
+        # Reported on the next row; rows already read are still created
+        yield number + 1, ValueError('The file is not UTF-8 encoded.')
+    except csv.Error as exc:
+        yield number + 1, ValueError(f'Malformed CSV: {exc}')
+
+
+def _validate_chunk(pairs, seen, result):
+    """Return (row number, data) of valid rows not seen in the file yet"""
+    valid = []
+    for number, row in pairs:
+        if isinstance(row, Exception):
+            result.add_error(number, {'non_field_errors': [str(row)]})
+            continue
+        serializer = ProvisionUserSerializer(data=row)
+        if not serializer.is_valid():
+            result.add_error(number, serializer.errors)
+            continue
+        data = serializer.validated_data
+        data['email'] = User.objects.normalize_email(data['email'])
+        if data['email'] in seen:
+            result.add_error(number, {'email': ['Duplicate email in file.']})
+            continue
+        seen.add(data['email'])
+        valid.append((number, data))
+    return valid
+
+
+def _drop_existing(valid, result):
+    """Report and remove rows whose email is taken, in one query"""
+    existing = {
+        email for email in User.objects.filter(
+            email__in=[data['email'] for _, data in valid],
+        ).values_list('email', flat=True)
+    }
+    kept = []
+    for number, data in valid:
+        if data['email'] in existing:
+            result.add_error(number, {'email': ['User already exists.']})
+        else:
+            kept.append((number, data))
+    return kept
+
+
+def _insert(valid, users, result):
+    """
+    Insert a chunk of users and return the ones created.
+
+    The chunk goes in with one bulk_create. If an email was taken since
+    the pre-check, the rows are inserted one by one instead, each in its
+    own savepoint, and the taken ones are reported.
+    """
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+        return users
+    except IntegrityError:
+        pass
+
+    created = []
+    for (number, _), user in zip(valid, users):
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([user])
+        except IntegrityError:
+            result.add_error(number, {'email': ['User already exists.']})
+        else:
+            created.append(user)
+    return created
+
+
+def provision_users(rows, chunk_size=DEFAULT_CHUNK_SIZE, processes=None,
+                    max_errors=1000):
+    """
+    Create users from (row number, row) pairs in chunks.
+
+    Each chunk is validated, checked for taken emails with a single
+    query, hashed across `processes` processes and inserted with one
+    bulk_create. The hashing pool is started once for the whole run.
+    """
+    if processes is None:
+        processes = settings.PROVISION_HASH_PROCESSES
+    result = ProvisionResult(max_errors)
+    seen = set()
+    rows = iter(rows)
+
+    with PasswordHasher(processes) as hasher:
+        while True:
+            pairs = list(islice(rows, chunk_size))
+            if not pairs:
+                break
+            valid = _drop_existing(
+                _validate_chunk(pairs, seen, result),
+                result,
+            )
+            if not valid:
+                continue
+
+            hashes = hasher.hash(data['password'] for _, data in valid)
+            users = [
+                User(**{**data, 'password': password})
+                for (_, data), password in zip(valid, hashes)
+            ]
+            result.created += len(_insert(valid, users, result))
+
+    return result
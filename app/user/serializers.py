@@ -9,6 +9,9 @@ from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from core.models import User
+from user.admission import login_gate
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for user object"""
@@ -46,14 +49,41 @@ class AuthTokenSerializer(serializers.Serializer):
         """Validate and authenticate the user"""
         email = attrs.get('email')
         password = attrs.get('password')
-        user = authenticate(
-            request=self.context.get('request'),
-            username=email,
-            password=password,
-        )
+        with login_gate.admit():
+            user = authenticate(
+                request=self.context.get('request'),
+                username=email,
+                password=password,
+            )
         if not user:
             msg = _('Unable to authenticate with provided credentials.')
             raise serializers.ValidationError(msg, code='authorization')
 
         attrs['user'] = user
         return attrs
+
+
+class ProvisionUserSerializer(serializers.Serializer):
+    """Serializer for one row of a bulk user provisioning file"""
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(min_length=5, trim_whitespace=False)
+    firstname = serializers.CharField(max_length=255, allow_blank=True)
+    lastname = serializers.CharField(max_length=255, allow_blank=True)
+    role = serializers.ChoiceField(
+        choices=[User.EXAMINEE, User.ADMIN],
+        default=User.EXAMINEE,
+    )
+
+
+class ProvisionFileSerializer(serializers.Serializer):
+    """Serializer for uploading a CSV of users to provision"""
+    file = serializers.FileField()
+
+
+class RosterExportSerializer(serializers.Serializer):
+    """Serializer for roster export options"""
+    file_format = serializers.ChoiceField(
+        choices=['csv', 'jsonl'],
+        default='csv',
+    )
+    gzip = serializers.BooleanField(default=False)
@@ -0,0 +1,27 @@
+"""
+Signal handlers for the user API
+"""
+from django.db.models.signals import (
+    post_save,
+    post_delete,
+)
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core.models import User
+from user.authentication import forget_tokens
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Revoke a cached token as soon as it is deleted"""
+    forget_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Drop cached lookups holding an outdated copy of the user"""
+    forget_tokens(
+        Token.objects.filter(user_id=instance.pk).values_list('key', flat=True)
+    )
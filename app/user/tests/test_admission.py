@@ -0,0 +1,119 @@
+"""
+Tests for login admission control
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user.admission import (
+    LoginAccountThrottle,
+    LoginGate,
+    LoginUnavailable,
+)
+
+
+TOKEN_URL = reverse('user:token')
+METRICS_URL = reverse('user:login-metrics')
+
+
+class LoginGateTests(TestCase):
+    """Test bounding concurrent hash verifications"""
+
+    def test_reject_when_queue_full(self):
+        """Test logins beyond the waiting room are rejected at once"""
+        gate = LoginGate(max_concurrent=1, max_waiting=0, timeout=5)
+
+        with gate.admit():
+            with self.assertRaises(LoginUnavailable):
+                with gate.admit():
+                    pass
+
+        metrics = gate.metrics()
+        self.assertEqual(metrics['admitted'], 1)
+        self.assertEqual(metrics['rejected'], 1)
+        self.assertEqual(metrics['in_flight'], 0)
+        self.assertEqual(metrics['hash_latency_ms']['samples'], 1)
+
+    def test_reject_after_bounded_wait(self):
+        """Test queued logins give up after the timeout"""
+        gate = LoginGate(max_concurrent=1, max_waiting=1, timeout=0.01)
+
+        with gate.admit():
+            with self.assertRaises(LoginUnavailable):
+                with gate.admit():
+                    pass
+
+        self.assertEqual(gate.metrics()['waiting'], 0)
+
+
+class LoginAdmissionApiTests(TestCase):
+    """Test the admission layer in front of token logins"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.payload = {'email': 'test@example.com', 'password': 'pass123'}
+        get_user_model().objects.create_user(**self.payload)
+
+    @patch.object(
+        LoginAccountThrottle,
+        'THROTTLE_RATES',
+        {'login_account': '2/min'},
+    )
+    def test_account_throttled_before_hashing(self):
+        """Test throttled logins never reach the password hasher"""
+        with patch(
+            'user.serializers.authenticate',
+            return_value=None,
+        ) as authenticate:
+            responses = [
+                self.client.post(TOKEN_URL, self.payload) for _ in range(3)
+            ]
+
+        self.assertEqual(
+            [res.status_code for res in responses[:2]],
+            [status.HTTP_400_BAD_REQUEST] * 2,
+        )
+        self.assertEqual(
+            responses[2].status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        self.assertEqual(authenticate.call_count, 2)
+
+    def test_overloaded_login_is_rejected(self):
+        """Test logins are turned away while the gate is full"""
+        gate = LoginGate(max_concurrent=1, max_waiting=0, timeout=3)
+
+        with patch('user.serializers.login_gate', gate), gate.admit():
+            res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res['Retry-After'], '3')
+
+    def test_login_still_works(self):
+        """Test admitted logins get a token"""
+        res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('token', res.data)
+
+    def test_metrics_admin_only(self):
+        """Test admins can read the admission metrics"""
+        user = get_user_model().objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            role='admin',
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('waiting', res.data)
+        self.assertIn('p95', res.data['hash_latency_ms'])
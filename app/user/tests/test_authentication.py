@@ -0,0 +1,143 @@
+"""
+Tests for cached token authentication
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import (
+    cache,
+    caches,
+)
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from user.authentication import (
+    CachedTokenAuthentication,
+    token_cache_key,
+)
+
+
+USER_URL = reverse('user:user')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and revoked"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_lookup_is_cached(self):
+        """Test only the first request queries the token"""
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            cached, _ = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(cached, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_password_hash_not_cached(self):
+        """Test the cached entry leaves out the password hash"""
+        self.auth.authenticate_credentials(self.token.key)
+
+        entry = cache.get(token_cache_key(self.token.key))
+
+        self.assertEqual(entry['email'], self.user.email)
+        self.assertNotIn('password', entry)
+        self.assertNotIn(self.user.password, entry.values())
+
+    def test_saving_cached_user_keeps_password(self):
+        """Test saving a user served from the cache keeps its password"""
+        self.auth.authenticate_credentials(self.token.key)
+        cached, _ = self.auth.authenticate_credentials(self.token.key)
+
+        cached.firstname = 'Renamed'
+        cached.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.firstname, 'Renamed')
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_deleted_token_is_revoked(self):
+        """Test a deleted token stops working at once"""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_user_changes_are_seen(self):
+        """Test role and active changes drop the cached user"""
+        self.auth.authenticate_credentials(self.token.key)
+
+        self.user.role = 'admin'
+        self.user.save()
+        user, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user.role, 'admin')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_api_uses_cached_token(self):
+        """Test API views authenticate with the cached token"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        client.get(USER_URL)
+        with self.assertNumQueries(0):
+            res = client.get(USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+
+class SharedTokenRevocationTests(TestCase):
+    """Test revocations made by other processes"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+        self.auth.authenticate_credentials(self.token.key)
+        # Another worker, with its own connection to the cache
+        self.other = caches.create_connection('default')
+
+    def test_token_deleted_elsewhere(self):
+        """Test a token deleted by another process stops working"""
+        key = self.token.key
+
+        with patch('user.authentication.cache', self.other):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_user_deactivated_elsewhere(self):
+        """Test a user deactivated by another process is rejected"""
+        with patch('user.authentication.cache', self.other):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.is_active = False
+                self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
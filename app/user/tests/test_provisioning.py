@@ -0,0 +1,176 @@
+"""
+Tests for bulk user provisioning
+"""
+import io
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user import provisioning
+from user.hashing import PasswordHasher
+
+
+PROVISION_URL = reverse('user:provision')
+
+CSV = (
+    'email,password,firstname,lastname,role\n'
+    'a@example.com,secret1,Ann,Lee,\n'
+    'b@example.com,secret2,Bob,Ray,admin\n'
+    'taken@example.com,secret3,Tia,Kim,\n'
+    'a@example.com,secret4,Ann,Again,\n'
+    'bad-email,secret5,No,One,\n'
+    'c@example.com,abc,Short,Password,\n'
+    'd@example.com,secret6,Dee,Lo,super admin\n'
+)
+
+
+class ProvisioningTests(TestCase):
+    """Test creating users in bulk"""
+
+    def setUp(self):
+        get_user_model().objects.create_user(
+            email='taken@example.com',
+            password='testpass123',
+        )
+
+    def provision(self, **kwargs):
+        return provisioning.provision_users(
+            provisioning.read_csv(io.StringIO(CSV)),
+            processes=1,
+            **kwargs,
+        )
+
+    def test_provision_users(self):
+        """Test valid rows are created and the rest reported"""
+        with self.assertNumQueries(4):
+            result = self.provision(chunk_size=4)
+
+        self.assertEqual(result.created, 2)
+        errors = {error['row']: error['errors'] for error in result.errors}
+        self.assertEqual(sorted(errors), [4, 5, 6, 7, 8])
+        self.assertIn('already exists', str(errors[4]))
+        self.assertIn('in file', str(errors[5]))
+        user = get_user_model().objects.get(email='b@example.com')
+        self.assertEqual(user.role, 'admin')
+        self.assertEqual(user.firstname, 'Bob')
+        self.assertTrue(user.check_password('secret2'))
+        self.assertEqual(
+            get_user_model().objects.get(email='a@example.com').role,
+            'examinee',
+        )
+
+    def test_hash_in_process_pool(self):
+        """Test passwords hashed in worker processes are usable"""
+        with PasswordHasher(processes=2) as hasher:
+            hashes = hasher.hash(['one11', 'two22', 'three'])
+
+        self.assertTrue(check_password('two22', hashes[1]))
+        self.assertFalse(check_password('one11', hashes[2]))
+
+    def test_pool_started_once_per_run(self):
+        """Test every chunk is hashed by the same process pool"""
+        with patch(
+            'user.hashing.ProcessPoolExecutor',
+            wraps=ProcessPoolExecutor,
+        ) as pool:
+            result = provisioning.provision_users(
+                provisioning.read_csv(io.StringIO(CSV)),
+                chunk_size=2,
+                processes=2,
+            )
+
+        self.assertEqual(result.created, 2)
+        pool.assert_called_once()
+
+    def test_emails_taken_during_insert(self):
+        """Test emails taken after the pre-check are reported per row"""
+        drop_existing = provisioning._drop_existing
+
+        def taken_meanwhile(valid, result):
+            kept = drop_existing(valid, result)
+            get_user_model().objects.create_user(
+                email='a@example.com',
+                password='testpass123',
+            )
+            return kept
+
+        with patch.object(provisioning, '_drop_existing', taken_meanwhile):
+            result = self.provision()
+
+        self.assertEqual(result.created, 1)
+        errors = {error['row']: error['errors'] for error in result.errors}
+        self.assertIn('already exists', str(errors[2]))
+        self.assertTrue(
+            get_user_model().objects.filter(email='b@example.com').exists()
+        )
+
+    def test_non_utf8_file_reported(self):
+        """Test a file that is not UTF-8 is reported as a row error"""
+        content = 'email,password\nb\xe9@example.com,secret1\n'
+        stream = io.TextIOWrapper(
+            io.BytesIO(content.encode('latin-1')),
+            encoding='utf-8',
+            newline='',
+        )
+
+        result = provisioning.provision_users(
+            provisioning.read_csv(stream),
+            processes=1,
+        )
+
+        self.assertEqual(result.created, 0)
+        self.assertIn('UTF-8', str(result.errors[0]['errors']))
+
+    def test_provision_command(self):
+        """Test provisioning from the command line"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as handle:
+            handle.write(CSV)
+            handle.flush()
+            out = StringIO()
+            err = StringIO()
+
+            call_command(
+                'provision_users',
+                handle.name,
+                processes=1,
+                stdout=out,
+                stderr=err,
+            )
+
+        self.assertIn('Created 2 users, 5 failed', out.getvalue())
+        self.assertIn('Row 4', err.getvalue())
+
+    def test_provision_endpoint_admin_only(self):
+        """Test admins can upload a CSV of users"""
+        client = APIClient()
+        user = get_user_model().objects.get(email='taken@example.com')
+        client.force_authenticate(user)
+        upload = SimpleUploadedFile('users.csv', CSV.encode())
+
+        res = client.post(PROVISION_URL, {'file': upload}, format='multipart')
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        user.role = 'admin'
+        user.save()
+        upload.seek(0)
+        with self.settings(PROVISION_HASH_PROCESSES=1):
+            res = client.post(
+                PROVISION_URL,
+                {'file': upload},
+                format='multipart',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(res.data['failed'], 5)
@@ -0,0 +1,150 @@
+"""
+Tests for the streaming roster export
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Attempt,
+    ExamPack,
+)
+from user import roster
+
+
+EXPORT_URL = reverse('user:export-roster')
+
+
+def create_user(email, **params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(
+        email=email,
+        password='testpass123',
+        **params,
+    )
+
+
+class RosterExportTests(TestCase):
+    """Test exporting users joined with their exam results"""
+
+    def setUp(self):
+        self.admin = create_user(
+            'admin@example.com',
+            firstname='Ada',
+            lastname='Admin',
+            role='admin',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.ann = create_user(
+            'ann@school.org',
+            firstname='Ann',
+            lastname='Smith',
+        )
+        self.ben = create_user(
+            'ben@school.org',
+            firstname='Ben',
+            lastname='Jones',
+        )
+        self.pack = ExamPack.objects.create(name='Quiz')
+        self.attempts = [
+            Attempt.objects.create(
+                examinee=self.ann,
+                exam_pack=self.pack,
+                issubmitted=True,
+                score=2,
+                total=3,
+            ),
+            Attempt.objects.create(examinee=self.ann, exam_pack=self.pack),
+        ]
+
+    def export(self, **params):
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return b''.join(res.streaming_content)
+
+    def test_export_csv_rows_per_attempt(self):
+        """CSV rows list every attempt and users without one once"""
+        data = self.export()
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+
+        self.assertEqual(
+            [(row['email'], row['attempt']) for row in rows],
+            [
+                ('admin@example.com', ''),
+                ('ann@school.org', str(self.attempts[0].id)),
+                ('ann@school.org', str(self.attempts[1].id)),
+                ('ben@school.org', ''),
+            ],
+        )
+        self.assertEqual(rows[1]['exam'], 'Quiz')
+        self.assertEqual(rows[1]['score'], '2')
+        self.assertEqual(rows[1]['total'], '3')
+        self.assertEqual(rows[1]['issubmitted'], 'True')
+        self.assertTrue(rows[1]['started'])
+
+    def test_export_jsonl_gzip(self):
+        """Roster exports as gzipped JSON lines"""
+        res = self.client.get(
+            EXPORT_URL,
+            {'file_format': 'jsonl', 'gzip': True, 'role': 'examinee'},
+        )
+
+        self.assertEqual(res['Content-Type'], 'application/gzip')
+        self.assertIn('roster.jsonl.gz', res['Content-Disposition'])
+        data = gzip.decompress(b''.join(res.streaming_content))
+        rows = [json.loads(line) for line in data.decode().splitlines()]
+        self.assertEqual(
+            [row['email'] for row in rows],
+            ['ann@school.org', 'ann@school.org', 'ben@school.org'],
+        )
+        self.assertEqual(rows[0]['exam_pack'], self.pack.id)
+        self.assertIsNone(rows[2]['score'])
+
+    def test_export_filters_by_creation_date(self):
+        """Date filters restrict the exported users"""
+        get_user_model().objects.filter(id=self.ben.id).update(
+            Created_Date=timezone.now() - timedelta(days=10),
+        )
+        since = timezone.now() - timedelta(days=1)
+
+        data = self.export(
+            file_format='jsonl',
+            created_after=since.isoformat(),
+        )
+
+        emails = {json.loads(line)['email'] for line in data.splitlines()}
+        self.assertEqual(emails, {'admin@example.com', 'ann@school.org'})
+
+    def test_export_reads_in_a_single_query(self):
+        """The roster is read through one joined query"""
+        users = get_user_model().objects.all()
+
+        with self.assertNumQueries(1):
+            rows = list(roster.iter_roster(users, chunk_size=1))
+
+        self.assertEqual(len(rows), 4)
+
+    def test_export_invalid_format(self):
+        """Unsupported formats are rejected"""
+        res = self.client.get(EXPORT_URL, {'file_format': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_admin(self):
+        """Examinees cannot export the roster"""
+        self.client.force_authenticate(self.ben)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,109 @@
+"""
+Tests for the paginated user listing
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+USERS_URL = reverse('user:all-users')
+
+
+def create_user(email, **params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(
+        email=email,
+        password='testpass123',
+        **params,
+    )
+
+
+class UserListingTests(TestCase):
+    """Test listing and filtering users"""
+
+    def setUp(self):
+        self.admin = create_user(
+            'admin@example.com',
+            firstname='Ada',
+            lastname='Admin',
+            role='admin',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.examinees = [
+            create_user(
+                f'student{i}@school.org',
+                firstname=name,
+                lastname='Smith' if i % 2 else 'Jones',
+            )
+            for i, name in enumerate(['Ann', 'Ben', 'Cal', 'Dee', 'Eve'])
+        ]
+
+    def emails(self, res):
+        return [user['email'] for user in res.data['results']]
+
+    def test_keyset_pages(self):
+        """Test users are listed newest first in cursor pages"""
+        with self.assertNumQueries(1):
+            res = self.client.get(USERS_URL, {'page_size': 4})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.emails(res),
+            [user.email for user in reversed(self.examinees)][:4],
+        )
+        res = self.client.get(res.data['next'])
+        self.assertEqual(
+            self.emails(res),
+            ['student0@school.org', 'admin@example.com'],
+        )
+        self.assertIsNone(res.data['next'])
+
+    def test_filter_role(self):
+        """Test filtering by role"""
+        res = self.client.get(USERS_URL, {'role': 'admin'})
+
+        self.assertEqual(self.emails(res), ['admin@example.com'])
+
+    def test_filter_prefixes(self):
+        """Test email and name prefixes match case-insensitively"""
+        res = self.client.get(USERS_URL, {'email': 'STUDENT3'})
+        self.assertEqual(self.emails(res), ['student3@school.org'])
+
+        res = self.client.get(USERS_URL, {'name': 'smi'})
+        self.assertEqual(
+            self.emails(res),
+            ['student3@school.org', 'student1@school.org'],
+        )
+
+        res = self.client.get(USERS_URL, {'name': 'ev'})
+        self.assertEqual(self.emails(res), ['student4@school.org'])
+
+    def test_filter_created_range(self):
+        """Test filtering by creation date range"""
+        old = self.examinees[0]
+        get_user_model().objects.filter(id=old.id).update(
+            Created_Date=timezone.now() - timedelta(days=10),
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        res = self.client.get(USERS_URL, {'created_before': since})
+        self.assertEqual(self.emails(res), [old.email])
+
+        res = self.client.get(
+            USERS_URL,
+            {'created_after': since, 'role': 'examinee'},
+        )
+        self.assertEqual(len(res.data['results']), 4)
+
+    def test_invalid_filter(self):
+        """Test invalid filter values are rejected"""
+        res = self.client.get(USERS_URL, {'created_after': 'yesterday'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
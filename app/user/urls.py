@@ -10,7 +10,17 @@ app_name = 'user'
 
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
+    path(
+        'provision/',
+        views.ProvisionUsersView.as_view(),
+        name='provision'
+    ),
     path('token/', views.CreateTokenView.as_view(), name='token'),
+    path(
+        'login-metrics/',
+        views.LoginMetricsView.as_view(),
+        name='login-metrics'
+    ),
     path('edit/', views.ManageUserView.as_view(), name='edit'),
     path('user/', views.RetrieveUserView.as_view(), name='user'),
     path(
@@ -18,6 +28,11 @@ urlpatterns = [
         views.RetrieveAllUsersView.as_view(),
         name='all-users'
     ),
+    path(
+        'users/export/',
+        views.ExportRosterView.as_view(),
+        name='export-roster'
+    ),
     path(
         'edit/<int:pk>/',
         views.EditUserDetailsView.as_view(),
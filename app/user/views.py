@@ -1,15 +1,35 @@
 """
 Views for the user api
 """
-from rest_framework import generics, authentication, permissions
+import io
+
+from django.http import StreamingHttpResponse
+from rest_framework import generics, permissions, status
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.settings import api_settings
 
+from user import (
+    provisioning,
+    roster,
+)
 from user.serializers import (
     UserSerializer,
-    AuthTokenSerializer
+    AuthTokenSerializer,
+    ProvisionFileSerializer,
+    RosterExportSerializer,
 )
 from core.models import User
+from user.admission import (
+    LoginAccountThrottle,
+    LoginIPThrottle,
+    login_gate,
+)
+from user.authentication import CachedTokenAuthentication
+from user.filters import UserFilter
+from user.pagination import UserCursorPagination
 from user.permissions import IsAdminUser
 
 
@@ -18,16 +38,44 @@ class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
+class ProvisionUsersView(generics.GenericAPIView):
+    """Create users in bulk from a CSV file - Admin only"""
+    serializer_class = ProvisionFileSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data['file']
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        result = provisioning.provision_users(provisioning.read_csv(stream))
+
+        return Response(result.to_dict(), status=status.HTTP_200_OK)
+
+
 class CreateTokenView(ObtainAuthToken):
     """Create a new auth token for user"""
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [LoginIPThrottle, LoginAccountThrottle]
+
+
+class LoginMetricsView(APIView):
+    """Report login admission metrics of this process - Admin only"""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(login_gate.metrics())
 
 
 class ManageUserView(generics.UpdateAPIView):
     """Manage the authenticated user"""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -38,7 +86,7 @@ class ManageUserView(generics.UpdateAPIView):
 class RetrieveUserView(generics.RetrieveAPIView):
     """Retrieve and return the authenticated user"""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -47,16 +95,52 @@ class RetrieveUserView(generics.RetrieveAPIView):
 
 
 class RetrieveAllUsersView(generics.ListAPIView):
-    """Retrieve a list of all users - Super Admin only"""
+    """Retrieve a page of users, newest first - Super Admin only"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAdminUser]
+    pagination_class = UserCursorPagination
+    filter_backends = [UserFilter]
+
+    def get_queryset(self):
+        """Retrieve users with only the listed columns"""
+        return self.queryset.only(
+            'id', 'email', 'firstname', 'lastname', 'role',
+        )
+
+
+class ExportRosterView(generics.GenericAPIView):
+    """Stream users and their exam results as CSV or JSONL - Admin only"""
+    queryset = User.objects.all()
+    serializer_class = RosterExportSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    filter_backends = [UserFilter]
+
+    def get(self, request):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        file_format = serializer.validated_data['file_format']
+        compress = serializer.validated_data['gzip']
+
+        response = StreamingHttpResponse(
+            roster.export_roster(
+                self.filter_queryset(self.get_queryset()),
+                file_format,
+                compress=compress,
+            ),
+            content_type=roster.export_content_type(file_format, compress),
+        )
+        filename = roster.export_filename(file_format, compress)
+        response['Content-Disposition'] = f'attachment; filename={filename}'
+
+        return response
 
 
 class EditUserDetailsView(generics.UpdateAPIView):
     """Edit user details including roles - Super Admin only"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAdminUser]